@@ -0,0 +1,85 @@
+'''
+Builds the closure graph of a synthetic ~50k-node assembly tree with shared sub-assemblies, and compares it with
+naively fetching the closure of every sub-assembly occurrence one at a time:
+python benchmarks/bench_closure.py --latency 0.002
+'''
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bild_closure import ClosureGraph, is_assembly
+
+
+def synthetic_tree(tops: int = 50, shared: int = 200, uses: int = 20, parts: int = 250, seed: int = 7):
+    '''
+    root -> tops sub-assemblies -> each uses `uses` of `shared` sub-assemblies -> each holds `parts` parts.
+    Returns the closure of every assembly, keyed by file ID.
+    '''
+    rng = random.Random(seed)
+    children = {'root': [f'top{i}.sldasm' for i in range(tops)]}
+    for i in range(tops):
+        children[f'top{i}.sldasm'] = [f'sub{j}.sldasm' for j in rng.sample(range(shared), uses)]
+    for j in range(shared):
+        children[f'sub{j}.sldasm'] = [f'part{j}_{k}.sldprt' for k in range(parts)]
+
+    closures = {}
+
+    def closure(name):
+        if name not in closures:
+            members = set()
+            for child in children.get(name, []):
+                members.add(child)
+                members |= closure(child)
+            closures[name] = members
+        return closures[name]
+
+    closure('root')
+    return {name: [{"fileID": member, "name": member} for member in sorted(members)] for name, members in closures.items()}
+
+
+class StubClient:
+    def __init__(self, closures: dict, latency: float):
+        self.closures = closures
+        self.latency = latency
+        self.project = self.branch = 'bench'
+        self.calls = 0
+
+    def raw(self):
+        return self
+
+    def get_all_part_files_and_sub_assemblies(self, project_id, branch_id, file_id, params=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        return {"data": self.closures[file_id]}
+
+
+def naive(client, file_id):
+    for item in client.get_all_part_files_and_sub_assemblies('bench', 'bench', file_id)['data']:
+        if is_assembly(item) and item['fileID'] in client.closures:
+            naive(client, item['fileID'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.002, help='simulated seconds per closure request')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    closures = synthetic_tree()
+    client = StubClient(closures, args.latency)
+    start = time.perf_counter()
+    naive(client, 'root')
+    naive_seconds, naive_calls = time.perf_counter() - start, client.calls
+
+    client = StubClient(closures, args.latency)
+    start = time.perf_counter()
+    graph = ClosureGraph(client, workers=args.workers).expand(['root'])
+    graph.where_used('part0_0.sldprt')
+    graph_seconds = time.perf_counter() - start
+
+    print(f'nodes: {len(graph)}')
+    print(f'naive per-occurrence fetch: {naive_calls:6d} requests {naive_seconds:7.2f}s')
+    print(f'memoized closure graph:     {client.calls:6d} requests {graph_seconds:7.2f}s (incl. where-used index)')
@@ -0,0 +1,103 @@
+'''
+Cold-start cost of the client: importing bild, constructing Bild() and sending the first request, each measured in a
+fresh interpreter so nothing is already imported or connected:
+python benchmarks/bench_import.py --runs 20 --budget 150 \n
+The first request goes to the local mock API (bild_mock.py), once cold and once after warm_up(). The modules taking the
+longest to import (python -X importtime) are listed so a new eager import shows up at once. With --budget the run exits
+with status 1 when the median cold start (import, Bild() and the first request, what a CLI command pays) goes over that
+many milliseconds, or when one of --forbid (the heavy dependencies the client imports lazily) is imported by
+"import bild".
+'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from bild_mock import MockServer
+
+HEAVY = ['requests', 'urllib3', 'sqlite3', 'http.server', 'concurrent.futures', 'email.utils', 'dotenv', 'selenium', 'bs4',
+         'openai']
+
+# Runs in the fresh interpreter, times in milliseconds
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import bild
+imported = time.perf_counter()
+loaded = [name for name in {heavy!r} if name in sys.modules]
+client = bild.Bild(token='bench', baseurl={baseurl!r})
+constructed = time.perf_counter()
+if {warm!r}:
+    client.warm_up()
+warmed = time.perf_counter()
+client.get_all_users()
+done = time.perf_counter()
+print(json.dumps({{'import': (imported - start) * 1000, 'construct': (constructed - imported) * 1000,
+                  'warm_up': (warmed - constructed) * 1000, 'first_request': (done - warmed) * 1000, 'loaded': loaded}}))
+'''
+
+
+def probe(baseurl: str, warm: bool):
+    code = PROBE.format(heavy=HEAVY, baseurl=baseurl, warm=warm)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    return json.loads(output)
+
+
+def slowest_imports(count: int):
+    '''
+    The count modules with the longest cumulative import time under "import bild", as (milliseconds, name).
+    '''
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import bild'], capture_output=True, text=True,
+                            check=True, cwd=ROOT).stderr
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times.append((int(cumulative) / 1000, name.strip()))
+    return sorted(times, reverse=True)[:count]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per measurement, the median is reported')
+    parser.add_argument('--top', type=int, default=10, help='slowest imports listed')
+    parser.add_argument('--budget', type=float, help='max median milliseconds for import bild + Bild() + first request')
+    parser.add_argument('--forbid', nargs='*', default=HEAVY, help='modules "import bild" must not import')
+    args = parser.parse_args()
+
+    with MockServer() as server:
+        cold = [probe(server.url, False) for _ in range(args.runs)]
+        warm = [probe(server.url, True) for _ in range(args.runs)]
+
+    def median(runs, key):
+        return statistics.median(run[key] for run in runs)
+
+    for run in cold:
+        run['cold_start'] = run['import'] + run['construct'] + run['first_request']
+
+    print(f"import bild:            {median(cold, 'import'):8.1f} ms")
+    print(f"Bild():                 {median(cold, 'construct'):8.1f} ms")
+    print(f"first request, cold:    {median(cold, 'first_request'):8.1f} ms")
+    print(f"warm_up():              {median(warm, 'warm_up'):8.1f} ms")
+    print(f"first request, warm:    {median(warm, 'first_request'):8.1f} ms")
+    print(f"cold start, total:      {median(cold, 'cold_start'):8.1f} ms")
+    print('\nSlowest imports (cumulative):')
+    for milliseconds, name in slowest_imports(args.top):
+        print(f'{milliseconds:8.1f} ms  {name}')
+
+    failures = []
+    loaded = sorted({name for run in cold for name in run['loaded']} & set(args.forbid))
+    if loaded:
+        failures.append(f"import bild imports {', '.join(loaded)}")
+    if args.budget is not None and median(cold, 'cold_start') > args.budget:
+        failures.append(f"import, Bild() and the first request take {median(cold, 'cold_start'):.1f} ms, over the {args.budget:g} ms budget")
+    if failures:
+        print('\n' + '\n'.join(failures))
+        sys.exit(1)
+    if args.budget is not None:
+        print(f'\nWithin the {args.budget:g} ms budget')
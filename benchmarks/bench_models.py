@@ -0,0 +1,90 @@
+'''
+Compares the memory held and the construction time of a synthetic 100k-file listing kept as raw dicts, as eagerly
+parsed dataclasses and as the lazy slotted bild_models:
+python benchmarks/bench_models.py --files 100000
+'''
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bild_models import File, ModelList
+
+
+def synthetic_listing(files: int):
+    return json.dumps({"data": [{
+        "fileID": f"file-{i:06d}",
+        "name": f"part-{i}.sldprt",
+        "type": "file",
+        "path": f"/assemblies/a{i % 100}/part-{i}.sldprt",
+        "partNumber": f"PN-{i:06d}",
+        "revision": "B",
+        "fileVersionID": f"version-{i:06d}",
+        "projectID": "project-1",
+        "branchID": "branch-1",
+        "status": "Released",
+        "updatedAt": 1700000000000 + i,
+    } for i in range(files)], "message": "Success"})
+
+
+@dataclass(slots=True)
+class EagerFile:
+    fileID: str = None
+    name: str = None
+    type: str = None
+    path: str = None
+    partNumber: str = None
+    revision: str = None
+    fileVersionID: str = None
+    projectID: str = None
+    branchID: str = None
+    status: str = None
+    updatedAt: datetime = None
+    children: list = field(default_factory=list)
+
+    @classmethod
+    def parse(cls, item: dict):
+        return cls(item.get('fileID'), item.get('name'), item.get('type'), item.get('path'), item.get('partNumber'),
+                   item.get('revision'), item.get('fileVersionID'), item.get('projectID'), item.get('branchID'),
+                   item.get('status'), datetime.fromtimestamp(item['updatedAt'] / 1000, timezone.utc),
+                   [cls.parse(child) for child in item.get('children', [])])
+
+
+def measure(body: str, build):
+    '''
+    Returns the bytes held by the built listing and the seconds taken to parse and build it (timed without tracemalloc).
+    '''
+    gc.collect()
+    start = time.perf_counter()
+    data = build(json.loads(body)['data'])
+    seconds = time.perf_counter() - start
+    del data
+    gc.collect()
+    tracemalloc.start()
+    data = build(json.loads(body)['data'])
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return held, seconds
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=100000)
+    args = parser.parse_args()
+
+    body = synthetic_listing(args.files)
+    results = {
+        'raw dicts': measure(body, lambda data: data),
+        'eager dataclasses': measure(body, lambda data: [EagerFile.parse(item) for item in data]),
+        'lazy slotted models': measure(body, lambda data: ModelList(File(item) for item in data)),
+    }
+    baseline = results['raw dicts'][0]
+    for name, (held, seconds) in results.items():
+        print(f'{name:20s} {held / 2 ** 20:8.1f} MiB held ({held / baseline:4.0%} of dicts) {seconds:6.2f}s to build')
@@ -0,0 +1,69 @@
+'''
+Compares one-connection-per-call requests against the pooled Bild session.
+
+Runs a tiny keep-alive stub of the Bild API on localhost so the numbers only measure the client:
+python benchmarks/bench_pool.py --calls 2000
+'''
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bild import Bild
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = json.dumps({"data": [], "message": "Success"}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def bench_unpooled(baseurl, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        requests.get(f'{baseurl}/users', headers={"Authorization": "Bearer bench"}).json()
+    return time.perf_counter() - start
+
+
+def bench_pooled(baseurl, calls):
+    with Bild(token='bench', baseurl=baseurl) as bild:
+        start = time.perf_counter()
+        for _ in range(calls):
+            bild.get_all_users()
+        return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=1000)
+    args = parser.parse_args()
+
+    server, baseurl = start_stub()
+    unpooled = bench_unpooled(baseurl, args.calls)
+    pooled = bench_pooled(baseurl, args.calls)
+    server.shutdown()
+
+    print(f'requests.get per call: {args.calls / unpooled:8.0f} req/s')
+    print(f'pooled Bild session:   {args.calls / pooled:8.0f} req/s ({unpooled / pooled:.1f}x)')
@@ -0,0 +1,245 @@
+'''
+Throughput, latency and memory of the client on the main workloads, against the local mock API (bild_mock.py):
+python benchmarks/bench_suite.py --output results.json \n
+Each scenario runs --repeat times, each time in a fresh process so its peak RSS is its own, and the median run is kept.
+The mock server runs in this process. Reported per scenario: requests/sec, p50/p95/p99 request latency, peak RSS and the
+peak of Python allocations (a second run under tracemalloc, skip it with --no-allocations). \n
+Save a baseline on a machine with --save-baseline, then later runs with --baseline flag every metric worse than it by
+more than --tolerance and exit with status 1:
+python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --scenarios crawl commits
+'''
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bild import Bild
+from bild_async import AsyncBild
+from bild_bulk import flatten_files
+from bild_mock import MockDataset, MockServer
+
+
+def crawl(client: Bild, settings: dict):
+    '''
+    Every list endpoint of the account: users, projects, and for every project its users, branches, ECOs, approvals,
+    feedback items and packages, and for every branch its file tree, shared links and full commit history.
+    '''
+    items = len(client.get_all_users()['data'])
+    projects = client.get_all_projects()['data']
+    items += len(projects)
+    for project in projects:
+        project_id = project['id']
+        for suffix in ('users', 'ecos', 'approvals', 'feedbackItems', 'packages'):
+            items += len(client.request('GET', f'/projects/{project_id}/{suffix}')['data'])
+        branches = client.request('GET', f'/projects/{project_id}/branches')['data']
+        items += len(branches)
+        for branch in branches:
+            items += sum(1 for _ in flatten_files(client.get_all_files_for_branch(project_id, branch['id'])['data']))
+            items += len(client.request('GET', f"/projects/{project_id}/branches/{branch['id']}/sharedLinks")['data'])
+            items += sum(1 for _ in client.iter_commits_of_branch(project_id, branch['id'], page_size=settings['page_size']))
+    return items
+
+
+def commits(client: Bild, settings: dict):
+    '''
+    The whole commit history of a project, page by page, prefetching the next page.
+    '''
+    return sum(1 for _ in client.iter_commits_of_project('p0', page_size=settings['page_size'], prefetch=True))
+
+
+def metadata(client: Bild, settings: dict):
+    '''
+    The metadata of every file of a branch through the bulk exporter.
+    '''
+    export = client.bulk_file_metadata('p0', 'p0-b0', workers=settings['workers'])
+    for _ in export:
+        pass
+    return export.report['succeeded']
+
+
+def stl(client: Bild, settings: dict):
+    '''
+    STL conversion and download of the first export_files files of a branch through the batch exporter.
+    '''
+    jobs = [('p0', 'p0-b0', f'p0-b0-f{number}', f'p0-b0-f{number}-v0', 'stl') for number in range(settings['export_files'])]
+    with tempfile.TemporaryDirectory() as folder:
+        report = client.batch_export(jobs, folder, workers=settings['workers'], rate=0, poll_interval=0.01).run()
+    return report['done']
+
+
+def async_metadata(client: Bild, settings: dict):
+    '''
+    The metadata of every file of a branch through AsyncBild, all requested at once with asyncio.gather.
+    '''
+    async def run():
+        async with AsyncBild(token='bench', baseurl=client.baseurl, concurrency=settings['workers']) as bild:
+            bild.session.request = client.session.request  # Reuse the timed request
+            files = list(flatten_files((await bild.get_all_files_for_branch('p0', 'p0-b0'))['data']))
+            results = await asyncio.gather(*[bild.get_metadata_from_file('p0', 'p0-b0', file['fileID']) for file in files])
+        return len(results)
+    return asyncio.run(run())
+
+
+SCENARIOS = {'crawl': crawl, 'commits': commits, 'metadata': metadata, 'stl': stl, 'async_metadata': async_metadata}
+# Metrics where more is better, the others are better lower
+HIGHER_IS_BETTER = {'requests_per_second', 'items_per_second'}
+COMPARED = ('requests_per_second', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_rss_mib', 'peak_allocations_mib')
+
+
+def peak_rss_mib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def timed_client(baseurl: str, settings: dict):
+    '''
+    A client whose every HTTP request appends its duration to client.latencies.
+    '''
+    client = Bild(token='bench', baseurl=baseurl, pool_maxsize=settings['workers'])
+    client.latencies = []
+    send = client.session.request
+
+    def request(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return send(*args, **kwargs)
+        finally:
+            client.latencies.append(time.perf_counter() - start)
+    client.session.request = request
+    return client
+
+
+def percentile(ordered: list, share: float):
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] * 1000 if ordered else None
+
+
+def run_scenario(name: str, baseurl: str, settings: dict):
+    '''
+    Runs one scenario and returns its metrics. Meant to run in a fresh process.
+    '''
+    with timed_client(baseurl, settings) as client:
+        start = time.perf_counter()
+        items = SCENARIOS[name](client, settings)
+        seconds = time.perf_counter() - start
+        latencies = sorted(client.latencies)
+    result = {
+        'items': items,
+        'requests': len(latencies),
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(len(latencies) / seconds, 1),
+        'items_per_second': round(items / seconds, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'peak_rss_mib': peak_rss_mib(),
+        'peak_allocations_mib': None,
+    }
+    if settings['allocations']:
+        with timed_client(baseurl, settings) as client:
+            tracemalloc.start()
+            SCENARIOS[name](client, settings)
+            result['peak_allocations_mib'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(names: list, settings: dict):
+    '''
+    Starts the mock server, runs every scenario in its own process and returns the machine-readable results.
+    '''
+    dataset = MockDataset(projects=settings['projects'], branches=settings['branches'], files=settings['files'],
+                          versions=1, commits=settings['commits'], users=settings['users'])
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'settings': settings, 'scenarios': {}}
+    context = multiprocessing.get_context('spawn')
+    with MockServer(dataset, latency=settings['latency'], download_size=settings['download_size']) as server:
+        for name in names:
+            runs = []
+            for _ in range(settings['repeat']):
+                with context.Pool(1) as pool:
+                    runs.append(pool.apply(run_scenario, (name, server.url, settings)))
+            # The median run by throughput, so one noisy run doesn't read as a regression
+            results['scenarios'][name] = sorted(runs, key=lambda run: run['requests_per_second'])[len(runs) // 2]
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    '''
+    Returns a line for every metric worse than the baseline by more than tolerance (a share, 0.1 = 10%).
+    '''
+    regressions = []
+    for name, metrics in results['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if before is None:
+            continue
+        for metric in COMPARED:
+            old, new = before.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if metric in HIGHER_IS_BETTER else (change > tolerance):
+                regressions.append(f'{name}.{metric}: {old} -> {new} ({change:+.0%})')
+    return regressions
+
+
+def table(results: dict):
+    lines = [f"{'scenario':<16}{'requests':>9}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'RSS MiB':>9}{'alloc MiB':>11}"]
+    for name, metrics in results['scenarios'].items():
+        lines.append(f"{name:<16}{metrics['requests']:>9}{metrics['requests_per_second']:>10}{metrics['p50_ms']:>9}"
+                     f"{metrics['p95_ms']:>9}{metrics['p99_ms']:>9}{str(metrics['peak_rss_mib']):>9}{str(metrics['peak_allocations_mib']):>11}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--projects', type=int, default=2)
+    parser.add_argument('--branches', type=int, default=2, help='branches per project')
+    parser.add_argument('--files', type=int, default=1000, help='files per branch')
+    parser.add_argument('--commits', type=int, default=5000, help='commits per branch')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--export-files', type=int, default=200, help='files converted by the stl scenario')
+    parser.add_argument('--download-size', type=int, default=256 * 1024, help='bytes of every converted file')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=16, help='requests in flight in the bulk and async scenarios')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the mock server adds to every request')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of every scenario, the median one is reported')
+    parser.add_argument('--no-allocations', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--save-baseline', help='write the results as the new baseline to this file')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed change before a metric is a regression')
+    args = parser.parse_args()
+
+    settings = {'projects': args.projects, 'branches': args.branches, 'files': args.files, 'commits': args.commits,
+                'users': args.users, 'export_files': args.export_files, 'download_size': args.download_size,
+                'page_size': args.page_size, 'workers': args.workers, 'latency': args.latency,
+                'repeat': args.repeat, 'allocations': not args.no_allocations}
+    results = run_suite(args.scenarios, settings)
+    print(table(results))
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f'{len(regressions)} regressions against {args.baseline}:\n' + '\n'.join(regressions))
+            sys.exit(1)
+        print(f'No regressions against {args.baseline}')
@@ -1,7 +1,38 @@
+import copy
 import os
-import requests
+import hashlib
+import threading
+import time
 import json
-from requests import exceptions
+from fnmatch import fnmatchcase
+from urllib.parse import urlencode
+from bild_cache import DEFAULT_TTLS, SingleFlight
+from bild_lazy import lazy
+from bild_retry import RetryPolicy
+
+# Imported on first use: requests alone is most of the client's import time. The optional helpers (bulk export,
+# downloads, metrics, models, ...) are imported by the methods using them.
+requests = lazy('requests')
+
+
+class SharedSession:
+    '''
+    Holds a client's pooled requests.Session, created on first use so constructing Bild doesn't import requests.
+    Copies of the client (raw(), AsyncBild.blocking()) hold the same SharedSession, so they share the one session.
+    '''
+    def __init__(self, create):
+        self.create = create
+        self.session = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        session = self.session
+        if session is None:
+            with self.lock:
+                if self.session is None:
+                    self.session = self.create()
+                session = self.session
+        return session
 
 
 class Bild:
@@ -10,8 +41,40 @@ class Bild:
 
     Either set 'BILD_API_KEY' in environment variables or pass a token to the constructor: 
     token = <your_token>
+
+    Every request goes through one pooled, keep-alive session owned by the client, created by the first request: \n
+    pool_connections = number of per-host connection pools to keep \n
+    pool_maxsize = max connections kept open per host \n
+    pool_block = block instead of opening extra connections once a host's pool is full \n
+    keep_alive = reuse connections between requests (set False to close after every call) \n
+    timeout = seconds to wait for the server, None waits forever \n\n
+    Close the session with close() or use the client as a context manager:
+    with Bild() as bild:
+        bild.get_all_users()
+
+    GET responses can be cached by passing a cache (bild_cache.MemoryCache or bild_cache.SQLiteCache): \n
+    cache_ttls = seconds to cache each endpoint, keyed by a path pattern where * matches any part of the path,
+    merged over bild_cache.DEFAULT_TTLS. Endpoints matching no pattern are never cached. \n
+    Expired entries are revalidated with If-None-Match/If-Modified-Since when the server sent an ETag/Last-Modified. \n\n
+    Throttling and transient failures are handled on every request: \n
+    retry = bild_retry.RetryPolicy deciding what is retried and the backoff (RetryPolicy(max_retries=0) disables it) \n
+    rate_limiter = bild_retry.TokenBucket capping requests per second \n
+    adaptive = bild_retry.AdaptiveLimiter capping requests in flight, lowered automatically when the server throttles \n\n
+    coalesce = let concurrent identical GETs share one request and its parsed result (the same object is returned to
+    every caller, copy it before mutating). Calls saved are counted in single_flight.stats. \n\n
+    models = return the data of GET responses as typed, slotted bild_models objects (User, Project, File, Commit, ...)
+    instead of dicts. They take a fraction of the memory on large listings and still answer .get(key) and [key]. \n\n
+    Instrumentation, off (and free) by default: \n
+    hooks = bild_metrics.Hooks, callbacks run before and after every attempt, on retries and on errors \n
+    metrics = bild_metrics.Metrics collecting connect/TTFB/download/decode histograms per endpoint, exportable to Prometheus \n\n
+    prewarm = open a connection to baseurl (DNS lookup, TCP and TLS handshakes) in the background while the caller
+    gets ready, so the first request reuses it instead of paying for the handshakes. See warm_up().
     '''
-    def __init__(self, token: str = 'env'):
+    def __init__(self, token: str = 'env', pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 keep_alive: bool = True, timeout: float = None, baseurl: str = 'https://api.getbild.com',
+                 cache = None, cache_ttls: dict = None, retry: RetryPolicy = None, rate_limiter = None, adaptive = None,
+                 coalesce: bool = True, models: bool = False, hooks: 'bild_metrics.Hooks' = None,
+                 metrics: 'bild_metrics.Metrics' = None, prewarm: bool = False):
 
         # Error messages
         self.auth_error = 'Authentication failed. Ensure you have a valid API key, that you have the correct permissions, and that you have passed it to the constructor.'
@@ -28,12 +91,131 @@ class Bild:
         else:   
             self.headers = {"Authorization": f"Bearer {self.token}"}
         
-        self.baseurl = 'https://api.getbild.com'
+        self.baseurl = baseurl
         self.content_type = 'application/json;charset=UTF-8'
+        self.timeout = timeout
         self.branch = ''
         self.project = ''
         self.fileVersion = ''
         self.file = ''
+        self.commit = ''
+        self.eco = ''
+        self.approval = ''
+        self.feedbackItem = ''
+        self.package = ''
+
+        # Pooled transport shared by every method, created by the first request (or warm_up)
+        def create_session():
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            if not keep_alive:
+                session.headers['Connection'] = 'close'
+            if self.metrics is not None:
+                self.metrics.instrument(session)
+            return session
+        self.shared_session = SharedSession(create_session)
+
+        # Opt-in response cache, namespaced by token so a shared on-disk cache never mixes accounts
+        self.cache = cache
+        self.cache_ttls = dict(DEFAULT_TTLS, **(cache_ttls or {}))
+        self.cache_namespace = hashlib.sha256(self.token.encode()).hexdigest()[:16]
+
+        # Throttling and retries
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.adaptive = adaptive
+
+        # Concurrent identical GETs share one request
+        self.single_flight = SingleFlight() if coalesce else None
+
+        # Typed response models
+        self.models = models
+
+        # Instrumentation
+        self.hooks = hooks
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.attach(self)
+
+        if prewarm:
+            threading.Thread(target=Bild.warm_up, args=(self,), kwargs={'quiet': True}, daemon=True).start()
+
+    @property
+    def session(self):
+        '''
+        The pooled requests.Session, created on first use.
+        '''
+        return self.shared_session.get()
+
+    def warm_up(self, quiet: bool = False):
+        '''
+        Opens a connection to baseurl through the pooled session (DNS lookup, TCP and TLS handshakes) and leaves it in
+        the pool for the next request, without sending anything. Returns the seconds it took. \n
+        quiet = return None instead of raising when the host can't be reached (the first request will report it)
+        '''
+        start = time.perf_counter()
+        try:
+            try:
+                self.open_connection()
+            except (AttributeError, TypeError):
+                # The pool internals open_connection() relies on changed: a HEAD request opens the connection through
+                # the public API instead, at the cost of one round trip
+                self.session.head(self.baseurl, timeout=self.timeout).close()
+        except Exception:
+            if quiet:
+                return None
+            raise
+        return time.perf_counter() - start
+
+    def open_connection(self):
+        '''
+        Connects one of the urllib3 pool's connections to baseurl and puts it back in the pool, through the pool's
+        private _get_conn/_put_conn. Raises AttributeError when the installed requests/urllib3 lack them.
+        '''
+        adapter = self.session.get_adapter(self.baseurl)
+        # Same verify/cert/proxy settings as session.request() resolves, or the connection would land in another pool
+        settings = self.session.merge_environment_settings(self.baseurl, {}, None, None, None)
+        if hasattr(adapter, 'get_connection_with_tls_context'):
+            prepared = requests.Request('GET', self.baseurl).prepare()
+            pool = adapter.get_connection_with_tls_context(prepared, settings['verify'], settings['proxies'], settings['cert'])
+        else:
+            pool = adapter.get_connection(self.baseurl, settings['proxies'])
+        if not (hasattr(pool, '_get_conn') and hasattr(pool, '_put_conn')):
+            raise AttributeError(f'{type(pool).__name__} has no _get_conn/_put_conn')
+        connection = pool._get_conn(timeout=self.timeout)
+        try:
+            connection.connect()
+        except Exception:
+            connection.close()
+            raise
+        finally:
+            pool._put_conn(connection)
+
+    def raw(self):
+        '''
+        This client with models turned off, for helpers that store or serialize what they fetch as plain dicts. It
+        shares the session, cache, limiters and hooks, and returns the client itself when models are already off.
+        '''
+        if not self.models:
+            return self
+        raw = copy.copy(self)
+        raw.models = False
+        return raw
+
+    def close(self):
+        '''
+        Closes the pooled session and every connection it holds open.
+        '''
+        if self.shared_session.session is not None:
+            self.shared_session.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def set_branch(self, branch_id: str):
         self.branch = branch_id
@@ -47,15 +229,225 @@ class Bild:
     def set_file(self, file_id: str):
         self.file = file_id
 
+    def set_commit(self, commit_id: str):
+        self.commit = commit_id
+
+    def set_eco(self, eco_id: str):
+        self.eco = eco_id
+
+    def set_approval(self, approval_id: str):
+        self.approval = approval_id
+
+    def set_feedback_item(self, feedback_item_id: str):
+        self.feedbackItem = feedback_item_id
+
+    def set_package(self, package_id: str):
+        self.package = package_id
+
     def check_response(self, response):
         '''
         Checks to see if the response has en error or is valid. Raises specific errors based on the response.
         '''
+        self.check_status(response)
+        return response.json()
+
+    def check_status(self, response):
+        '''
+        Raises the matching error if the response has an error status.
+        '''
         if type(response) == str:
             raise Exception(response)
+        if not response.ok:
+            if response.status_code in (401, 403):
+                raise Exception(self.auth_error)
+            if response.status_code == 404:
+                raise Exception(self.path_error)
+            raise Exception(f'Bild API error {response.status_code}: {response.text}')
+
+    def request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Sends a request to the Bild API and returns the checked response. Identical GETs already in flight are joined
+        instead of sent again. \n
+        params = query parameters, data = JSON request body
+        '''
+        if self.single_flight is not None and method == 'GET':
+            return self.single_flight.do(self.flight_key(suffix, params), lambda: self.fetch(method, suffix, params, data))
+        return self.fetch(method, suffix, params, data)
+
+    def stream(self, suffix: str, params: dict = None, chunk_size: int = 65536):
+        '''
+        GETs an endpoint and yields the items of its data array as they are parsed off the socket, so peak memory stays
+        flat however large the response is. Streams bypass the cache and request coalescing. \n
+        The generator returns a bild_stream.JSONArrayStream whose extras hold the other top-level fields (message, ...).
+        '''
+        from bild_models import endpoint_model
+        from bild_stream import JSONArrayStream
+        model = endpoint_model(suffix) if self.models else None
+        response = self.send('GET', suffix, params, stream=True)
+        with response:
+            self.check_status(response)
+            items = JSONArrayStream(response.iter_content(chunk_size))
+            if model is None:
+                yield from items
+            else:
+                for item in items:
+                    yield model(item) if isinstance(item, dict) else item
+        return items
+
+    def flight_key(self, suffix: str, params: dict = None):
+        # Parsed models and raw dicts are never shared between a client and its raw() copy
+        return f"{'models ' if self.models else ''}{suffix}?{urlencode(sorted((params or {}).items()))}"
+
+    def fetch(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Sends a request and returns the checked response, served from the cache when possible.
+        '''
+        if self.cache is not None and method == 'GET':
+            ttl = self.cache_ttl(suffix)
+            if ttl is not None:
+                return self.parse(method, suffix, self.cached_request(suffix, params, ttl))
+        response = self.send(method, suffix, params, data)
+        if self.hooks is None:
+            return self.parse(method, suffix, self.check_response(response))
+        start = time.perf_counter()
+        body = self.check_response(response)
+        self.hooks.emit('decode', method=method, suffix=suffix, seconds=time.perf_counter() - start)
+        return self.parse(method, suffix, body)
+
+    def parse(self, method: str, suffix: str, body):
+        '''
+        Turns the data of a GET response into bild_models objects when models are enabled.
+        '''
+        if self.models and method == 'GET':
+            from bild_models import parse_response
+            return parse_response(suffix, body)
+        return body
+
+    def send(self, method: str, suffix: str, params: dict = None, data: dict = None, headers: dict = None, stream: bool = False):
+        '''
+        Sends a request through the pooled session and returns the raw response. \n
+        headers = extra headers merged over the authorization header \n
+        stream = don't download the body yet, read it with response.iter_content()
+        '''
+        if headers:
+            headers = dict(self.headers, **headers)
         else:
-            return response.json()
+            headers = self.headers
+        options = {'stream': True} if stream else {}
+        hooks = self.hooks
+        attempt = 0
+        while True:
+            response, error = None, None
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.adaptive is not None:
+                self.adaptive.acquire()
+            if hooks is not None:
+                hooks.emit('before_request', method=method, suffix=suffix, params=params, attempt=attempt)
+                start = time.perf_counter()
+            try:
+                response = self.session.request(method, f"{self.baseurl}{suffix}", headers=headers, params=params, json=data, timeout=self.timeout, **options)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            finally:
+                if self.adaptive is not None:
+                    self.adaptive.release(throttled=response is not None and response.status_code == 429)
+            if hooks is not None:
+                hooks.emit('after_request', method=method, suffix=suffix, attempt=attempt, response=response, error=error,
+                           seconds=time.perf_counter() - start, stream=stream)
+            if not self.retry.should_retry(method, attempt, response, error):
+                break
+            delay = self.retry.delay(attempt, response)
+            if hooks is not None:
+                hooks.emit('retry', method=method, suffix=suffix, attempt=attempt, response=response, error=error, delay=delay)
+            # A streamed response holds its pooled connection until closed
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+        if hooks is not None and (error is not None or not response.ok):
+            hooks.emit('error', method=method, suffix=suffix, response=response, error=error)
+        if error is not None:
+            raise error
+        return response
+
+    def cache_ttl(self, suffix: str):
+        '''
+        Returns the TTL of the first cache pattern matching the suffix, or None if the endpoint isn't cached.
+        '''
+        for pattern, ttl in self.cache_ttls.items():
+            if fnmatchcase(suffix, pattern):
+                return ttl
+        return None
 
+    def cached_request(self, suffix: str, params: dict, ttl: float):
+        '''
+        GETs an endpoint through the cache: fresh entries are returned without a request, expired ones are revalidated
+        with If-None-Match/If-Modified-Since, and 200 responses are stored for ttl seconds.
+        '''
+        key = f"{self.cache_namespace} GET {suffix}?{urlencode(sorted((params or {}).items()))}"
+        entry = self.cache.get(key)
+        now = time.time()
+        if entry is not None and entry['expires'] > now:
+            self.cache.record('hits')
+            return json.loads(entry['body'])
+
+        conditions = {}
+        if entry is not None and entry['etag']:
+            conditions['If-None-Match'] = entry['etag']
+        if entry is not None and entry['last_modified']:
+            conditions['If-Modified-Since'] = entry['last_modified']
+        response = self.send('GET', suffix, params, headers=conditions)
+        if conditions and response.status_code == 304:
+            self.cache.record('revalidated')
+            self.cache.set(key, dict(entry, expires=now + ttl))
+            return json.loads(entry['body'])
+
+        self.cache.record('misses')
+        body = self.check_response(response)
+        if response.status_code == 200:
+            self.cache.set(key, {
+                'body': response.text,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'expires': now + ttl,
+            })
+        return body
+
+    def page_items(self, page: dict):
+        '''
+        Splits a page of a paginated endpoint into its items and the lastEvaluatedKey of the next page (None on the last page).
+        '''
+        key = page.get('lastEvaluatedKey')
+        if isinstance(key, dict):
+            key = json.dumps(key)
+        return page.get('data') or [], key or None
+
+    def paginate(self, suffix: str, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Lazily streams the items of a pageSize/lastEvaluatedKey endpoint, one page at a time. \n
+        page_size = items requested per page \n
+        prefetch = fetch the next page in the background while the caller works through the current one \n
+        params = extra query parameters sent with every page (filters, status, ...) \n
+        At most one page (two with prefetch) is held in memory, whatever the size of the history.
+        '''
+        from concurrent.futures import ThreadPoolExecutor
+        params = dict(params or {}, pageSize=page_size)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = self.request('GET', suffix, params=params)
+            while True:
+                items, key = self.page_items(page)
+                if key is not None:
+                    next_params = dict(params, lastEvaluatedKey=key)
+                    upcoming = executor.submit(self.request, 'GET', suffix, next_params) if executor else None
+                yield from items
+                if key is None:
+                    return
+                page = upcoming.result() if upcoming else self.request('GET', suffix, params=next_params)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 
     def get_all_users(self):
         '''
@@ -80,8 +472,7 @@ class Bild:
         }
         '''
         suffix = '/users'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        return self.request('GET', suffix)
     
     def add_users_to_bild(self, emails: list[str] = [], role: str = 'Member', projects: list[dict] = []):
         '''
@@ -123,8 +514,26 @@ class Bild:
             "role": role,
             "projects": projects
         }
-        response = requests.put(f"{self.baseurl}{suffix}", headers=self.headers, json=data)
-        return response.json()
+        return self.request('PUT', suffix, data=data)
+
+    def provision_users(self, users: list, workers: int = 4, chunk_size: int = 100, skip_existing: bool = True, **kwargs):
+        '''
+        Add many users with their own roles and project grants in as few requests as possible. Returns a
+        bild_users.UserProvisioning, call .run() to send them and get a per-user report. \n
+        users = list of {"email", "role", "projects"} dicts or (email, role, projects) tuples, projects being
+        {project_id: access} or [{"id", "projectAccess"}] \n
+        workers = requests sent at once, chunk_size = max emails per request \n
+        skip_existing = skip users who already have every grant, according to get_all_users
+        '''
+        from bild_users import UserProvisioning
+        return UserProvisioning(self, users, workers, chunk_size, skip_existing=skip_existing, **kwargs)
+
+    def stream_all_users(self, chunk_size: int = 65536):
+        '''
+        Stream every user of the Bild account one at a time, without loading the whole response. See stream().
+        '''
+        suffix = '/users'
+        return self.stream(suffix, chunk_size=chunk_size)
 
     def get_all_projects(self):
         '''
@@ -148,9 +557,15 @@ class Bild:
         }
         '''
         suffix = '/projects'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        return self.request('GET', suffix)
     
+    def stream_all_projects(self, chunk_size: int = 65536):
+        '''
+        Stream every project one at a time, without loading the whole response. See stream().
+        '''
+        suffix = '/projects'
+        return self.stream(suffix, chunk_size=chunk_size)
+
     def get_all_files(self, project_id = None):
         '''
         Get all files for a project as a JSON object:
@@ -158,22 +573,23 @@ class Bild:
         if project_id is None:
             project_id = self.project
         suffix = f'/projects/{project_id}/files'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        return self.request('GET', suffix)
 
-    def get_all_users_in_project(self, project_id = None):
+    def get_all_files_for_branch(self, project_id = None, branch_id = None, params: dict = None):
         '''
-        Get all users in a project as a JSON object:
+        Get the latest version of every file in a branch as a JSON object (a file-folder tree by default):
         '''
         if project_id is None:
             project_id = self.project
-        suffix = f'/projects/{project_id}/users'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        if branch_id is None:
+            branch_id = self.branch
+        suffix = f'/projects/{project_id}/branches/{branch_id}/files'
+        return self.request('GET', suffix, params=params)
 
-    def generate_stl(self, project_id = None, branch_id = None, file_id = None, file_version = None):
+    def get_all_part_files_and_sub_assemblies(self, project_id = None, branch_id = None, file_id = None, params: dict = None):
         '''
-        Generate an STL file for a file.
+        Get the full closure of an assembly file (every part file and sub-assembly in it) as a JSON object. \n
+        Closures are configuration-specific, pass the file version and configuration through params.
         '''
         if project_id is None:
             project_id = self.project
@@ -181,19 +597,47 @@ class Bild:
             branch_id = self.branch
         if file_id is None:
             file_id = self.file
-        if file_version is None:
-            file_version = self.fileVersion
-        suffix = f'/projects/{project_id}/branches/{branch_id}/files/{file_id}/universalFormat'
-        data = {
-            "fileVersion": file_version,
-            "universalFileFormat": "stl"
-        }
-        response = requests.post(f"{self.baseurl}{suffix}", headers=self.headers, json=data, content_type=f'{self.content_type}: {data}')
-        return response.json()
+        suffix = f'/projects/{project_id}/branches/{branch_id}/files/{file_id}/closure'
+        return self.request('GET', suffix, params=params)
 
-    def generate_step(self, project_id = None, branch_id = None, file_id = None, file_version = None):
+    def closure_graph(self, project_id = None, branch_id = None, workers: int = 8):
         '''
-        Generate a STEP file for a file.
+        Build a deduplicated graph of assemblies and parts in a branch. Returns a bild_closure.ClosureGraph, call
+        .expand(file_ids) or .expand_branch() to fetch it, then query .children(), .parts() or .where_used().
+        '''
+        from bild_closure import ClosureGraph
+        return ClosureGraph(self, project_id, branch_id, workers)
+
+    def bulk_file_metadata(self, project_id = None, branch_id = None, workers: int = 8, files: list = None):
+        '''
+        Export the metadata of every file in a branch, fetched in parallel. Returns a bild_bulk.MetadataExport: \n
+        iterate over it to stream {"file", "metadata", "error"} results as they arrive, or call .write('bom.jsonl' / '.csv' / '.parquet'). \n
+        Throughput and per-file failures are reported in its .report, failed files don't stop the batch.
+        '''
+        from bild_bulk import MetadataExport
+        return MetadataExport(self, project_id, branch_id, workers, files)
+
+    def get_all_users_in_project(self, project_id = None):
+        '''
+        Get all users in a project as a JSON object:
+        '''
+        if project_id is None:
+            project_id = self.project
+        suffix = f'/projects/{project_id}/users'
+        return self.request('GET', suffix)
+
+    def permissions_matrix(self, workers: int = 8, verify: bool = False):
+        '''
+        Build the user x project x access type matrix of the whole account as a bild_permissions.PermissionsMatrix. \n
+        Reuses the access embedded in get_all_users and get_all_projects, so usually two requests are enough. Projects
+        listed without their users are fetched in parallel, workers at a time (all of them with verify=True).
+        '''
+        from bild_permissions import sweep
+        return sweep(self, workers, verify)
+
+    def generate_universal_format(self, project_id = None, branch_id = None, file_id = None, file_version = None, file_format: str = 'stl'):
+        '''
+        Request a conversion of a file version to a universal format (stl, step).
         '''
         if project_id is None:
             project_id = self.project
@@ -206,18 +650,59 @@ class Bild:
         suffix = f'/projects/{project_id}/branches/{branch_id}/files/{file_id}/universalFormat'
         data = {
             "fileVersion": file_version,
-            "universalFileFormat": "step"
+            "universalFileFormat": file_format
         }
-        response = requests.post(f"{self.baseurl}{suffix}", headers=self.headers, json=data, content_type=f'{self.content_type}: {data}')
-        return response.json()
+        return self.request('POST', suffix, data=data)
+
+    def generate_stl(self, project_id = None, branch_id = None, file_id = None, file_version = None):
+        '''
+        Generate an STL file for a file.
+        '''
+        return self.generate_universal_format(project_id, branch_id, file_id, file_version, 'stl')
+
+    def generate_step(self, project_id = None, branch_id = None, file_id = None, file_version = None):
+        '''
+        Generate a STEP file for a file.
+        '''
+        return self.generate_universal_format(project_id, branch_id, file_id, file_version, 'step')
+
+    def batch_export(self, jobs: list, output_dir: str, journal: str = None, workers: int = 4, rate: float = 2.0, **kwargs):
+        '''
+        Convert and download many files at once. Returns a bild_export.BatchExport, call .run() to start it. \n
+        jobs = list of (project_id, branch_id, file_id, file_version, file_format) tuples \n
+        journal = JSON Lines file recording finished jobs, so an interrupted batch resumes where it stopped \n
+        workers = jobs processed at once, rate = max conversions submitted per second
+        '''
+        from bild_export import BatchExport
+        return BatchExport(self, jobs, output_dir, journal, workers, rate, **kwargs)
+
+    def download_file(self, url: str, path: str, checksum: str = None, algorithm: str = 'sha256', segments: int = 1,
+                      chunk_size: int = 1024 * 1024):
+        '''
+        Download a converted file (the url of a finished generate_stl/generate_step) to path in chunk_size pieces, so
+        memory stays flat however large the file. Returns its size in bytes. \n
+        An interrupted download resumes from the bytes already on disk, calling it again after a crash resumes too. \n
+        checksum = expected hex digest of the file, verified on the fly with algorithm \n
+        segments = ranged requests downloading a large file in parallel
+        '''
+        from bild_download import download_file
+        return download_file(self.session, url, path, chunk_size, checksum, algorithm, segments, timeout=self.timeout, retry=self.retry)
+
+    def scheduler(self, workers: int = 8):
+        '''
+        Run calls in the background by priority. Returns a bild_scheduler.Scheduler: submit("method_name", *args,
+        priority=URGENT, deadline=seconds, tag=...) queues a call and returns a future, urgent calls jumping ahead of a
+        queued backfill. Close it, or use it as a context manager, when done.
+        '''
+        from bild_scheduler import Scheduler
+        return Scheduler(self, workers)
     
     def get_all_metadata_fields(self):
         '''
         Get all metadata fields as a JSON object:
         '''
         suffix = '/metadataFields'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        return self.request('GET', suffix)
     
     def get_metadata_from_file(self, project_id = None, branch_id = None, file_id = None):
         '''
@@ -230,8 +715,7 @@ class Bild:
         if file_id is None:
             file_id = self.file
         suffix = f'/projects/{project_id}/branches/{branch_id}/files/{file_id}/metadata'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        return self.request('GET', suffix)
     
     def get_latest_file_version(self, project_id = None, branch_id = None, file_id = None):
         '''
@@ -244,6 +728,118 @@ class Bild:
         if file_id is None:
             file_id = self.file
         suffix = f'/projects/{project_id}/branches/{branch_id}/files/{file_id}/latestFileVersion'
-        response = requests.get(f"{self.baseurl}{suffix}", headers=self.headers)
-        return response.json()
+        return self.request('GET', suffix)
 
+    def get_commits_of_project(self, project_id = None, params: dict = None):
+        '''
+        Get one page of commits across all branches of a project as a JSON object. \n
+        Pass pageSize in params for the first page and the returned lastEvaluatedKey for the next ones, or use iter_commits_of_project.
+        '''
+        if project_id is None:
+            project_id = self.project
+        suffix = f'/projects/{project_id}/commits'
+        return self.request('GET', suffix, params=params)
+
+    def iter_commits_of_project(self, project_id = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Stream every commit of a project, page by page. See paginate().
+        '''
+        if project_id is None:
+            project_id = self.project
+        suffix = f'/projects/{project_id}/commits'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    def get_commits_of_branch(self, project_id = None, branch_id = None, params: dict = None):
+        '''
+        Get one page of commits of a branch as a JSON object. \n
+        Pass pageSize in params for the first page and the returned lastEvaluatedKey for the next ones, or use iter_commits_of_branch.
+        '''
+        if project_id is None:
+            project_id = self.project
+        if branch_id is None:
+            branch_id = self.branch
+        suffix = f'/projects/{project_id}/branches/{branch_id}/commits'
+        return self.request('GET', suffix, params=params)
+
+    def iter_commits_of_branch(self, project_id = None, branch_id = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Stream every commit of a branch, page by page. See paginate().
+        '''
+        if project_id is None:
+            project_id = self.project
+        if branch_id is None:
+            branch_id = self.branch
+        suffix = f'/projects/{project_id}/branches/{branch_id}/commits'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    def get_commit_details(self, project_id = None, branch_id = None, commit_id = None):
+        '''
+        Get a commit and every file involved in it (ID, name, part number and revision at the time of the commit) as a JSON object:
+        '''
+        if project_id is None:
+            project_id = self.project
+        if branch_id is None:
+            branch_id = self.branch
+        if commit_id is None:
+            commit_id = self.commit
+        suffix = f'/projects/{project_id}/branches/{branch_id}/commits/{commit_id}'
+        return self.request('GET', suffix)
+
+    def get_released_files_after_time(self, after: int = 0, params: dict = None):
+        '''
+        Get every file released after a Unix timestamp in milliseconds as a JSON object. \n
+        A file released several times only appears with its latest release.
+        '''
+        suffix = '/files/released'
+        params = dict(params or {}, time=after)
+        return self.request('GET', suffix, params=params)
+
+    def stream_released_files_after_time(self, after: int = 0, params: dict = None, chunk_size: int = 65536):
+        '''
+        Stream every file released after a Unix timestamp in milliseconds, without loading the whole response. See stream().
+        '''
+        suffix = '/files/released'
+        params = dict(params or {}, time=after)
+        return self.stream(suffix, params, chunk_size)
+
+    def stream_shared_links(self, params: dict = None, chunk_size: int = 65536):
+        '''
+        Stream the public shared file links of the Bild account (one page, pass pageSize/lastEvaluatedKey in params),
+        without loading the whole response. See stream().
+        '''
+        suffix = '/sharedLinks'
+        return self.stream(suffix, params, chunk_size)
+
+    def get_approval_requests_bild_account(self, params: dict = None):
+        '''
+        Get one page of approval requests in the Bild account as a JSON object (PENDING ones by default). \n
+        Pass pageSize in params for the first page and the returned lastEvaluatedKey for the next ones, or use iter_approval_requests_bild_account.
+        '''
+        suffix = '/approvals'
+        return self.request('GET', suffix, params=params)
+
+    def iter_approval_requests_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Stream every approval request in the Bild account, page by page. See paginate().
+        '''
+        suffix = '/approvals'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    def get_approval_requests_in_project(self, project_id = None, params: dict = None):
+        '''
+        Get one page of approval requests in a project as a JSON object (PENDING ones by default). \n
+        Pass pageSize in params for the first page and the returned lastEvaluatedKey for the next ones, or use iter_approval_requests_in_project.
+        '''
+        if project_id is None:
+            project_id = self.project
+        suffix = f'/projects/{project_id}/approvals'
+        return self.request('GET', suffix, params=params)
+
+    def iter_approval_requests_in_project(self, project_id = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Stream every approval request in a project, page by page. See paginate().
+        '''
+        if project_id is None:
+            project_id = self.project
+        suffix = f'/projects/{project_id}/approvals'
+        return self.paginate(suffix, page_size, prefetch, params)
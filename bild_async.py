@@ -0,0 +1,155 @@
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from functools import partial
+
+from bild import Bild
+from compiler.bild_async import AsyncBild as GeneratedAsyncBild
+
+
+# Items pulled off a blocking stream per trip to a worker thread
+STREAM_BATCH = 256
+
+
+def blocking_helper(name: str):
+    '''
+    Stands in on AsyncBild for a Bild helper that sends its requests itself, which would block the event loop.
+    '''
+    def helper(self, *args, **kwargs):
+        raise Exception(f'{name}() sends blocking requests and is not available on AsyncBild. Run it on the blocking '
+                        f'client in a worker thread: await asyncio.to_thread(lambda: bild.blocking().{name}(...))')
+    helper.__name__ = name
+    return helper
+
+
+class AsyncBild(Bild, GeneratedAsyncBild):
+    '''
+    ## Async Bild API client
+
+    Exposes every endpoint of Bild and of the generated client in compiler/bild_async.py as a coroutine,
+    with the same token handling and defaults (set_project, set_branch, ...):
+    projects = await bild.get_all_projects() \n
+    concurrency = max requests in flight across the whole client \n
+    endpoint_limits = max requests in flight per endpoint, keyed by a path pattern where * matches any part of the path:
+    {'/projects/*/metadata': 4, '/users': 1} \n
+    Any other keyword argument (pool size, timeout, ...) is passed to Bild. Requests run on the client's pooled session
+    in a bounded worker pool, so close it with aclose() or use it as an async context manager:
+    async with AsyncBild() as bild:
+        await bild.get_all_users()
+
+    stream() and the stream_* methods are async generators, permissions_matrix(), download_file() and warm_up() are
+    coroutines. The helpers driving many requests themselves (bulk_file_metadata, closure_graph, provision_users,
+    batch_export, scheduler) raise instead of blocking the event loop: run them on blocking() in a worker thread.
+    '''
+    def __init__(self, token: str = 'env', concurrency: int = 16, endpoint_limits: dict = None, **kwargs):
+        kwargs.setdefault('pool_maxsize', concurrency)
+        Bild.__init__(self, token, **kwargs)
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.endpoint_limits = {pattern: asyncio.Semaphore(limit) for pattern, limit in (endpoint_limits or {}).items()}
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='bild')
+        self.in_flight = {}
+
+    def endpoint_limit(self, suffix: str):
+        '''
+        Returns the semaphore of the first endpoint pattern matching the suffix, or None if it isn't limited.
+        '''
+        for pattern, semaphore in self.endpoint_limits.items():
+            if fnmatchcase(suffix, pattern):
+                return semaphore
+        return None
+
+    async def request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Waits for a free endpoint and global slot, then sends the request on the pooled session.
+        Identical GETs already in flight are awaited instead of sent again.
+        '''
+        if self.single_flight is None or method != 'GET':
+            return await self.limited_request(method, suffix, params, data)
+        key = self.flight_key(suffix, params)
+        task = self.in_flight.get(key)
+        if task is None:
+            task = self.in_flight[key] = asyncio.ensure_future(self.limited_request(method, suffix, params, data))
+            task.add_done_callback(lambda done: self.in_flight.pop(key, None))
+            self.single_flight.record('calls')
+        else:
+            self.single_flight.record('shared')
+        # Shielded so one caller giving up doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def limited_request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        limit = self.endpoint_limit(suffix)
+        if limit is None:
+            return await self._send(method, suffix, params, data)
+        async with limit:
+            return await self._send(method, suffix, params, data)
+
+    async def _send(self, method, suffix, params, data):
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(Bild.fetch, self, method, suffix, params, data))
+
+    # Bild.paginate comes first in the MRO, use the generated async generator instead
+    paginate = GeneratedAsyncBild.paginate
+
+    def blocking(self):
+        '''
+        A blocking Bild sharing this client's session, cache, limiters and hooks, for the helpers that send their
+        requests themselves, and run their blocking methods in a worker thread: \n
+        graph = bild.blocking().closure_graph(project_id, branch_id) \n
+        await asyncio.to_thread(graph.expand_branch)
+        '''
+        client = copy.copy(self)
+        client.__class__ = Bild
+        return client
+
+    async def stream(self, suffix: str, params: dict = None, chunk_size: int = 65536):
+        '''
+        Async counterpart of Bild.stream: the items of the endpoint's data array, parsed off the socket in a worker
+        thread and handed over STREAM_BATCH at a time.
+        '''
+        loop = asyncio.get_running_loop()
+        items = Bild.stream(self.blocking(), suffix, params, chunk_size)
+
+        def batch():
+            return [item for _, item in zip(range(STREAM_BATCH), items)]
+        try:
+            while True:
+                async with self.semaphore:
+                    chunk = await loop.run_in_executor(self.executor, batch)
+                for item in chunk:
+                    yield item
+                if len(chunk) < STREAM_BATCH:
+                    return
+        finally:
+            # Closes the response, returning its connection to the pool
+            items.close()
+
+    async def permissions_matrix(self, workers: int = 8, verify: bool = False):
+        return await asyncio.to_thread(Bild.permissions_matrix, self.blocking(), workers, verify)
+
+    async def download_file(self, *args, **kwargs):
+        return await asyncio.to_thread(Bild.download_file, self.blocking(), *args, **kwargs)
+
+    async def warm_up(self, quiet: bool = False):
+        return await asyncio.to_thread(Bild.warm_up, self, quiet)
+
+    bulk_file_metadata = blocking_helper('bulk_file_metadata')
+    closure_graph = blocking_helper('closure_graph')
+    provision_users = blocking_helper('provision_users')
+    batch_export = blocking_helper('batch_export')
+    scheduler = blocking_helper('scheduler')
+
+    async def aclose(self):
+        '''
+        Waits for in-flight requests, then closes the worker pool and the pooled session.
+        '''
+        await asyncio.get_running_loop().run_in_executor(None, partial(self.executor.shutdown, wait=True))
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -0,0 +1,136 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def flatten_files(nodes: list):
+    '''
+    Yields every file of a files response, whether it is a flat list or a file-folder tree (folders hold a "children" list).
+    '''
+    for node in nodes:
+        children = node.get('children')
+        if children:
+            yield from flatten_files(children)
+        elif node.get('type') != 'folder':
+            yield node
+
+
+def file_id(file: dict):
+    return file.get('fileID') or file.get('id')
+
+
+class MetadataExport:
+    '''
+    Exports the complete metadata of every file of a branch, fetching files in parallel with a worker pool. \n
+    Iterate over it to stream results as they arrive, each one a dict:
+    {"file": {...}, "metadata": {...}, "error": None}
+    or call write(path) to stream them straight to a .jsonl, .csv or .parquet file. \n
+    A file that fails is reported in report["failures"] and doesn't stop the batch.
+    Files listed more than once are only fetched once. \n
+    workers = number of requests in flight \n
+    files = files to export instead of listing the whole branch
+    '''
+    def __init__(self, client, project_id: str = None, branch_id: str = None, workers: int = 8, files: list = None):
+        self.client = client.raw()
+        self.project_id = project_id or client.project
+        self.branch_id = branch_id or client.branch
+        self.workers = workers
+        self.files = files
+        self.report = {'files': 0, 'succeeded': 0, 'failed': 0, 'duplicates': 0, 'seconds': 0.0, 'files_per_second': 0.0, 'failures': {}}
+
+    def unique_files(self):
+        files = self.files
+        if files is None:
+            files = self.client.get_all_files_for_branch(self.project_id, self.branch_id)['data']
+        seen = set()
+        for file in flatten_files(files):
+            if file_id(file) in seen:
+                self.report['duplicates'] += 1
+                continue
+            seen.add(file_id(file))
+            yield file
+
+    def fetch(self, file: dict):
+        return self.client.get_metadata_from_file(self.project_id, self.branch_id, file_id(file))
+
+    def __iter__(self):
+        start = time.perf_counter()
+        files = self.unique_files()
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Keep a bounded window of requests in flight so huge branches aren't all queued at once
+            for file in files:
+                pending[executor.submit(self.fetch, file)] = file
+                if len(pending) >= self.workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self.collect(done, pending, start)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self.collect(done, pending, start)
+
+    def collect(self, done, pending: dict, start: float):
+        for future in done:
+            file = pending.pop(future)
+            self.report['files'] += 1
+            try:
+                result = {'file': file, 'metadata': future.result(), 'error': None}
+                self.report['succeeded'] += 1
+            except Exception as e:
+                result = {'file': file, 'metadata': None, 'error': str(e)}
+                self.report['failed'] += 1
+                self.report['failures'][file_id(file)] = str(e)
+            self.report['seconds'] = time.perf_counter() - start
+            self.report['files_per_second'] = self.report['files'] / self.report['seconds'] if self.report['seconds'] else 0.0
+            yield result
+
+    def write(self, path: str, format: str = None):
+        '''
+        Streams every result to path as JSON Lines, CSV or Parquet (picked from the extension unless format is given)
+        and returns the report. CSV and Parquet rows hold the file ID, name, path, metadata as JSON and the error.
+        Parquet needs pyarrow installed.
+        '''
+        format = format or os.path.splitext(path)[1].lstrip('.')
+        if format == 'jsonl':
+            with open(path, 'w', encoding='utf-8') as file:
+                for result in self:
+                    file.write(json.dumps(result) + '\n')
+        elif format == 'csv':
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=['file_id', 'name', 'path', 'metadata', 'error'])
+                writer.writeheader()
+                for result in self:
+                    writer.writerow(self.row(result))
+        elif format == 'parquet':
+            self.write_parquet(path)
+        else:
+            raise Exception(f'Unknown export format: {format}. Use jsonl, csv or parquet.')
+        return self.report
+
+    def write_parquet(self, path: str, batch_size: int = 1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception('Parquet export needs pyarrow: pip install pyarrow')
+        schema = pyarrow.schema([(name, pyarrow.string()) for name in ['file_id', 'name', 'path', 'metadata', 'error']])
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            rows = []
+            for result in self:
+                rows.append(self.row(result))
+                if len(rows) >= batch_size:
+                    writer.write_table(pyarrow.Table.from_pylist(rows, schema=schema))
+                    rows = []
+            if rows:
+                writer.write_table(pyarrow.Table.from_pylist(rows, schema=schema))
+
+    def row(self, result: dict):
+        file = result['file']
+        return {
+            'file_id': file_id(file),
+            'name': file.get('name'),
+            'path': file.get('path'),
+            'metadata': json.dumps(result['metadata']) if result['metadata'] is not None else None,
+            'error': result['error'],
+        }
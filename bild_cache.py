@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# Reference data that rarely changes, cached by default when a cache is passed to Bild (seconds)
+DEFAULT_TTLS = {
+    '/metadataFields': 3600,
+    '/users': 300,
+    '/projects': 300,
+    '/projects/*/branches': 300,
+    '/projects/*/users': 300,
+}
+
+
+class SingleFlight:
+    '''
+    Coalesces concurrent identical calls: while a call for a key is running, other callers for the same key wait for it
+    and share its result (or its error) instead of making their own. \n
+    stats = {"calls": calls actually made, "shared": calls saved by joining one in flight}
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {'calls': 0, 'shared': 0}
+
+    def record(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def do(self, key: str, call):
+        with self.lock:
+            flight = self.in_flight.get(key)
+            if flight is None:
+                flight = self.in_flight[key] = {'done': threading.Event(), 'result': None, 'error': None}
+                self.stats['calls'] += 1
+                leader = True
+            else:
+                self.stats['shared'] += 1
+                leader = False
+        if not leader:
+            flight['done'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['result']
+        try:
+            flight['result'] = call()
+            return flight['result']
+        except BaseException as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight['done'].set()
+
+
+class MemoryCache:
+    '''
+    In-memory LRU response cache for Bild. \n
+    maxsize = max number of responses kept, the least recently used one is evicted first \n
+    Entries are dicts: {"body": str, "etag": str, "last_modified": str, "expires": float}
+    '''
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+
+    def record(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: dict):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.stats['stores'] += 1
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SQLiteCache:
+    '''
+    On-disk response cache for Bild, kept in a SQLite database so it survives between runs. \n
+    path = database file \n
+    maxsize = max number of responses kept, the least recently used ones are evicted first
+    '''
+    def __init__(self, path: str = 'bild_cache.sqlite', maxsize: int = 100000):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        import sqlite3
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('''CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, body TEXT, etag TEXT, last_modified TEXT, expires REAL, accessed REAL)''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self.db.commit()
+
+    def record(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get(self, key: str):
+        with self.lock:
+            row = self.db.execute('SELECT body, etag, last_modified, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+            self.db.commit()
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'expires': row[3]}
+
+    def set(self, key: str, entry: dict):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                            (key, entry['body'], entry['etag'], entry['last_modified'], entry['expires'], time.time()))
+            self.stats['stores'] += 1
+            (count,) = self.db.execute('SELECT COUNT(*) FROM responses').fetchone()
+            if count > self.maxsize:
+                self.db.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)',
+                                (count - self.maxsize,))
+                self.stats['evictions'] += count - self.maxsize
+            self.db.commit()
+
+    def clear(self):
+        with self.lock:
+            self.db.execute('DELETE FROM responses')
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import exceptions
+
+from bild_retry import RetryPolicy
+
+
+# Errors after which a download picks up from the bytes already on disk
+INTERRUPTIONS = (exceptions.ConnectionError, exceptions.Timeout, exceptions.ChunkedEncodingError)
+
+
+def with_retries(retry: RetryPolicy, call):
+    '''
+    Runs call until it returns None, retrying it on interruptions and when it returns a response with a retryable
+    status, as the retry policy decides.
+    '''
+    attempt = 0
+    while True:
+        response, error = None, None
+        try:
+            response = call()
+            if response is None:
+                return
+        except INTERRUPTIONS as e:
+            error = e
+        if not retry.should_retry('GET', attempt, response, error):
+            if error is not None:
+                raise error
+            response.raise_for_status()
+        time.sleep(retry.delay(attempt, response))
+        attempt += 1
+
+
+def hash_file(path: str, hasher, chunk_size: int):
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher
+
+
+def remote_size(session, url: str, headers: dict = None, timeout: float = None):
+    '''
+    Asks for the first byte of url and returns the size of the file if the server answers ranges, else None.
+    A GET rather than a HEAD, as signed download URLs are often only valid for GET.
+    '''
+    with session.get(url, stream=True, timeout=timeout, headers=dict(headers or {}, Range='bytes=0-0')) as response:
+        response.raise_for_status()
+        found = re.match(r'bytes \d+-\d+/(\d+)', response.headers.get('Content-Range') or '')
+        if response.status_code != 206 or found is None:
+            return None
+        return int(found[1])
+
+
+def fetch_range(session, url: str, part: str, start: int = 0, end: int = None, algorithm: str = None,
+                chunk_size: int = 1024 * 1024, headers: dict = None, timeout: float = None, retry: RetryPolicy = None):
+    '''
+    Streams bytes start to end (inclusive, the rest of the file when end is None) of url into part, chunk by chunk,
+    resuming with a Range request from the bytes part already holds after every interruption. \n
+    Returns the hash of part when an algorithm (sha256, md5, ...) is given, computed as the chunks arrive.
+    '''
+    retry = retry or RetryPolicy()
+    state = {'hasher': None}
+
+    def attempt():
+        have = os.path.getsize(part) if os.path.exists(part) else 0
+        if end is not None and start + have > end:
+            return None
+        request_headers = dict(headers or {})
+        if start + have or end is not None:
+            request_headers['Range'] = f"bytes={start + have}-{'' if end is None else end}"
+        with session.get(url, stream=True, timeout=timeout, headers=request_headers or None) as response:
+            if response.status_code == 416 and end is None and have:
+                return None  # Everything was already on disk
+            if response.status_code in retry.statuses:
+                return response
+            response.raise_for_status()
+            resumed = have > 0 and response.status_code == 206
+            if response.status_code != 206 and (start or end is not None):
+                raise Exception(f'The server ignored the Range header of {url}')
+            hasher = state['hasher'] = hashlib.new(algorithm) if algorithm else None
+            if resumed and hasher is not None:
+                hash_file(part, hasher, chunk_size)
+            with open(part, 'ab' if resumed else 'wb') as file:
+                for chunk in response.iter_content(chunk_size):
+                    file.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+        return None
+
+    with_retries(retry, attempt)
+    if algorithm is None:
+        return None
+    # Nothing was streamed when the file was already complete on disk
+    return state['hasher'] or hash_file(part, hashlib.new(algorithm), chunk_size)
+
+
+def download_file(session, url: str, path: str, chunk_size: int = 1024 * 1024, checksum: str = None,
+                  algorithm: str = 'sha256', segments: int = 1, min_segment_size: int = 16 * 1024 * 1024,
+                  headers: dict = None, timeout: float = None, retry: RetryPolicy = None):
+    '''
+    Streams url to path without ever holding more than one chunk per segment in memory, and returns its size in bytes. \n
+    The file is written to path.part and renamed once complete (and verified), so path is never half written. An
+    interrupted download resumes from the bytes already on disk, within this call after a dropped connection, and
+    in the next call after a crash. \n
+    checksum = expected hex digest of the file (algorithm: sha256, md5, ...), checked as the chunks arrive \n
+    segments = ranged requests downloading the file in parallel, for files of at least two min_segment_size
+    (a server without Range support falls back to one stream)
+    '''
+    part = f'{path}.part'
+    size = remote_size(session, url, headers, timeout) if segments > 1 else None
+    count = min(segments, size // min_segment_size) if size else 1
+    algorithm = algorithm if checksum else None
+    if count > 1:
+        digest = fetch_segments(session, url, part, size, count, algorithm, chunk_size, headers, timeout, retry)
+    else:
+        digest = fetch_range(session, url, part, algorithm=algorithm, chunk_size=chunk_size, headers=headers,
+                             timeout=timeout, retry=retry)
+    if checksum and digest.hexdigest() != checksum.lower():
+        os.remove(part)
+        raise Exception(f'Checksum mismatch for {url}: expected {checksum}, got {digest.hexdigest()}')
+    size = os.path.getsize(part)
+    os.replace(part, path)
+    return size
+
+
+def fetch_segments(session, url: str, part: str, size: int, count: int, algorithm: str = None,
+                   chunk_size: int = 1024 * 1024, headers: dict = None, timeout: float = None, retry: RetryPolicy = None):
+    '''
+    Downloads size bytes of url as count ranged segments in parallel, each into its own resumable file named after
+    the size and the split, then joins them into part in order, hashing them on the way.
+    '''
+    bounds = [size * index // count for index in range(count + 1)]
+    pieces = [f'{part}.{size}.{index}of{count}' for index in range(count)]
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(fetch_range, session, url, piece, bounds[index], bounds[index + 1] - 1, None,
+                                   chunk_size, headers, timeout, retry) for index, piece in enumerate(pieces)]
+        for future in futures:
+            future.result()
+    hasher = hashlib.new(algorithm) if algorithm else None
+    with open(part, 'wb') as output:
+        for piece in pieces:
+            with open(piece, 'rb') as file:
+                for chunk in iter(lambda: file.read(chunk_size), b''):
+                    output.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+    if os.path.getsize(part) != size:
+        raise Exception(f'Downloaded {os.path.getsize(part)} bytes of {url} instead of {size}')
+    for piece in pieces:
+        os.remove(piece)
+    return hasher
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bild_download import download_file
+from bild_retry import TokenBucket
+
+
+# Conversion states that mean the file isn't ready yet
+PENDING_STATES = {'PENDING', 'IN_PROGRESS', 'PROCESSING', 'QUEUED', 'STARTED'}
+FAILED_STATES = {'FAILED', 'ERROR', 'CANCELLED'}
+
+
+def conversion_result(response: dict):
+    '''
+    Reads a universalFormat response and returns (state, download url), state being "done", "pending" or "failed".
+    '''
+    data = response.get('data') if isinstance(response.get('data'), dict) else response
+    status = str(data.get('status') or '').upper()
+    url = data.get('url') or data.get('downloadUrl') or data.get('signedUrl')
+    if status in FAILED_STATES:
+        return 'failed', None
+    if url and status not in PENDING_STATES:
+        return 'done', url
+    return 'pending', None
+
+
+class BatchExport:
+    '''
+    Converts many files to STL/STEP concurrently and downloads the results to output_dir. \n
+    jobs = list of (project_id, branch_id, file_id, file_version, file_format) tuples \n
+    journal = JSON Lines file where every finished job is recorded; jobs already in it whose file is still on disk are
+    skipped, so an interrupted batch picks up where it stopped (defaults to output_dir/export_journal.jsonl) \n
+    workers = jobs processed at once \n
+    rate = max new conversions submitted per second, spaced out evenly (a bild_retry.TokenBucket without burst), None
+    for no cap. Status polls aren't counted. Every request also goes through the client's own rate_limiter, so exports
+    share its budget \n
+    poll_interval, timeout = seconds between checks of a pending conversion, and before giving up on it \n
+    chunk_size = bytes written to disk at a time while downloading \n
+    segments = ranged requests downloading each large converted file in parallel (see bild_download.download_file)
+    '''
+    def __init__(self, client, jobs: list, output_dir: str, journal: str = None, workers: int = 4, rate: float = 2.0,
+                 poll_interval: float = 5.0, timeout: float = 600.0, chunk_size: int = 1024 * 1024,
+                 segments: int = 1):
+        self.client = client.raw()
+        self.jobs = [tuple(job) for job in jobs]
+        self.output_dir = output_dir
+        self.journal = journal or os.path.join(output_dir, 'export_journal.jsonl')
+        self.workers = workers
+        self.rate_cap = TokenBucket(rate, burst=1) if rate else None
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.segments = segments
+        self.journal_lock = threading.Lock()
+        self.report = {'done': 0, 'skipped': 0, 'failed': {}, 'bytes': 0}
+
+    @staticmethod
+    def job_key(job: tuple):
+        return '/'.join(str(part) for part in job)
+
+    def job_path(self, job: tuple):
+        project_id, branch_id, file_id, file_version, file_format = job
+        return os.path.join(self.output_dir, f'{file_id}_{file_version}.{file_format}')
+
+    def finished_jobs(self):
+        '''
+        Returns the keys of the jobs recorded as done in the journal whose file is still on disk.
+        '''
+        finished = set()
+        if not os.path.exists(self.journal):
+            return finished
+        with open(self.journal, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of an interrupted run
+                if entry.get('state') == 'done' and os.path.exists(entry['path']):
+                    finished.add(entry['job'])
+        return finished
+
+    def record(self, entry: dict):
+        with self.journal_lock:
+            with open(self.journal, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry) + '\n')
+
+    def run(self):
+        '''
+        Runs every job not finished yet and returns the report: {"done": n, "skipped": n, "failed": {job: error}, "bytes": n}
+        '''
+        os.makedirs(self.output_dir, exist_ok=True)
+        finished = self.finished_jobs()
+        todo = []
+        for job in dict.fromkeys(self.jobs):
+            if self.job_key(job) in finished:
+                self.report['skipped'] += 1
+            else:
+                todo.append(job)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for job, error in zip(todo, executor.map(self.run_job, todo)):
+                if error:
+                    self.report['failed'][self.job_key(job)] = error
+        return self.report
+
+    def run_job(self, job: tuple):
+        try:
+            url = self.convert(job)
+            path = self.job_path(job)
+            size = self.download(url, path)
+        except Exception as e:
+            self.record({'job': self.job_key(job), 'state': 'failed', 'error': str(e)})
+            return str(e)
+        self.record({'job': self.job_key(job), 'state': 'done', 'path': path, 'bytes': size})
+        with self.journal_lock:
+            self.report['done'] += 1
+            self.report['bytes'] += size
+        return None
+
+    def convert(self, job: tuple):
+        '''
+        Submits the conversion and polls it until the download URL is ready. Only the submission takes from the rate cap.
+        '''
+        project_id, branch_id, file_id, file_version, file_format = job
+        deadline = time.monotonic() + self.timeout
+        if self.rate_cap is not None:
+            self.rate_cap.acquire()
+        while True:
+            # The API has no conversion status endpoint: POSTing universalFormat again for the same file version reports
+            # the state of the conversion already running, so polls repeat it outside the rate cap (the client's own
+            # rate_limiter still applies to them)
+            response = self.client.generate_universal_format(project_id, branch_id, file_id, file_version, file_format)
+            state, url = conversion_result(response)
+            if state == 'done':
+                return url
+            if state == 'failed':
+                raise Exception(f'Conversion failed: {response}')
+            if time.monotonic() + self.poll_interval > deadline:
+                raise Exception(f'Conversion not ready after {self.timeout} seconds')
+            time.sleep(self.poll_interval)
+
+    def download(self, url: str, path: str):
+        '''
+        Streams the converted file to disk in chunks, through a .part file renamed once complete. A download cut off
+        resumes from the bytes already in the .part file, in this run or the next.
+        '''
+        return download_file(self.client.session, url, path, self.chunk_size, segments=self.segments,
+                             timeout=self.client.timeout, retry=self.client.retry)
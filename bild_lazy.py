@@ -0,0 +1,50 @@
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    '''
+    Stands in for a module that is only imported the first time one of its attributes is read, so importing the client
+    stays cheap for scripts that never send a request. \n
+    requests = LazyModule('requests') \n
+    requests.Session()      # imports requests here
+    '''
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute: str, value):
+        setattr(self._load(), attribute, value)
+
+    def __delattr__(self, attribute: str):
+        delattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        name = self.__dict__['_name']
+        state = 'loaded' if self.__dict__['_module'] is not None or name in sys.modules else 'not loaded'
+        return f'<LazyModule {name} ({state})>'
+
+
+def lazy(name: str):
+    '''
+    The module if it's already imported, else a LazyModule importing it on first use.
+    '''
+    return sys.modules.get(name) or LazyModule(name)
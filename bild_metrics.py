@@ -0,0 +1,297 @@
+import bisect
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Histogram bucket bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments following these are IDs, labelled with the catalog's parameter names so metrics don't get one series per ID
+ID_PARAMETERS = {
+    'projects': 'projectID', 'branches': 'branchID', 'files': 'fileID', 'versions': 'fileVersionID', 'commits': 'commitID',
+    'feedbackItems': 'feedbackItemID', 'packages': 'packageID', 'ecos': 'ecoID', 'approvals': 'approvalID',
+}
+LITERALS = {'released'}
+
+EVENTS = ('before_request', 'after_request', 'retry', 'error', 'decode')
+
+# Seconds spent opening connections (DNS, TCP and TLS) by the current thread's request
+connecting = threading.local()
+
+
+def endpoint(suffix: str):
+    '''
+    The endpoint template of a request path: /projects/p1/branches/b1/files -> /projects/{projectID}/branches/{branchID}/files
+    '''
+    parts = suffix.split('?', 1)[0].strip('/').split('/')
+    for index in range(1, len(parts)):
+        parameter = ID_PARAMETERS.get(parts[index - 1])
+        if parameter and parts[index] not in LITERALS:
+            parts[index] = '{' + parameter + '}'
+    return '/' + '/'.join(parts)
+
+
+class Hooks:
+    '''
+    Callbacks run by the client around every request. Register one with hooks.on(event, callback) (or as a decorator,
+    @hooks.on('retry')), it is called with keyword arguments: \n
+    before_request(method, suffix, params, attempt) before every attempt \n
+    after_request(method, suffix, attempt, response, error, seconds, stream) after every attempt, error being the
+    connection error or timeout if there is no response \n
+    retry(method, suffix, attempt, response, error, delay) before sleeping delay seconds and retrying \n
+    error(method, suffix, response, error) once a request has failed for good: error status or no response \n
+    decode(method, suffix, seconds) after the JSON body of a response is parsed \n
+    Callbacks run on the thread making the request, keep them quick. Exceptions raised by a callback propagate.
+    '''
+    def __init__(self):
+        self.callbacks = {event: [] for event in EVENTS}
+
+    def on(self, event: str, callback=None):
+        if event not in self.callbacks:
+            raise Exception(f'Unknown hook {event}, expected one of {", ".join(EVENTS)}')
+        if callback is None:
+            return lambda callback: self.on(event, callback)
+        self.callbacks[event].append(callback)
+        return callback
+
+    def emit(self, event: str, **info):
+        for callback in self.callbacks[event]:
+            callback(**info)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            connecting.seconds = getattr(connecting, 'seconds', 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            connecting.seconds = getattr(connecting, 'seconds', 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, share: float):
+        '''
+        Estimates a quantile from the buckets, interpolating linearly inside the bucket it falls in.
+        '''
+        if not self.count:
+            return None
+        rank, seen = share * self.count, 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+
+class Metrics:
+    '''
+    Timing histograms of every request per endpoint template and phase, plus request, retry and error counters. \n
+    Pass it to the client, Bild(metrics=Metrics()), and read it with summary() or to_prometheus() (serve() exposes
+    the latter on http://host:port/metrics for Prometheus to scrape). The phases, in seconds: \n
+    connect = opening a new connection, DNS, TCP and TLS included (only observed when a connection was opened) \n
+    ttfb = from sending the request to the response headers, connect excluded \n
+    download = reading the response body (not observed for streams, which are read by the caller) \n
+    decode = parsing the JSON body \n
+    total = the whole attempt \n
+    buckets = upper bounds of the histogram buckets
+    '''
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def attach(self, client):
+        '''
+        Subscribes to the client's hooks (creating them if needed) and times connections opened by its session.
+        '''
+        if client.hooks is None:
+            client.hooks = Hooks()
+        client.hooks.on('before_request', self.before_request)
+        client.hooks.on('after_request', self.after_request)
+        client.hooks.on('retry', lambda method, suffix, **info: self.count('bild_retries_total', (method, endpoint(suffix))))
+        client.hooks.on('error', self.failed)
+        client.hooks.on('decode', lambda method, suffix, seconds: self.observe(method, suffix, 'decode', seconds))
+        # A client creates its session on first use and instruments it then
+        shared = getattr(client, 'shared_session', None)
+        if shared is None or shared.session is not None:
+            self.instrument(client.session)
+
+    def instrument(self, session):
+        '''
+        Times the connections the session opens.
+        '''
+        for adapter in set(session.adapters.values()):
+            adapter.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+            adapter.poolmanager.clear()
+
+    def observe(self, method: str, suffix: str, phase: str, seconds: float):
+        key = (method, endpoint(suffix), phase)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def count(self, name: str, labels: tuple):
+        with self.lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + 1
+
+    def before_request(self, **info):
+        connecting.seconds = 0.0
+
+    def after_request(self, method: str, suffix: str, response, error, seconds: float, stream: bool, **info):
+        connect = getattr(connecting, 'seconds', 0.0)
+        if connect:
+            self.observe(method, suffix, 'connect', connect)
+        self.observe(method, suffix, 'total', seconds)
+        if response is not None:
+            elapsed = response.elapsed.total_seconds()
+            self.observe(method, suffix, 'ttfb', max(0.0, elapsed - connect))
+            if not stream:
+                self.observe(method, suffix, 'download', max(0.0, seconds - elapsed))
+        status = str(response.status_code) if response is not None else type(error).__name__
+        self.count('bild_requests_total', (method, endpoint(suffix), status))
+
+    def failed(self, method: str, suffix: str, response, error):
+        reason = str(response.status_code) if response is not None else type(error).__name__
+        self.count('bild_errors_total', (method, endpoint(suffix), reason))
+
+    def summary(self):
+        '''
+        {"GET /projects/{projectID}/files": {"total": {"count": n, "mean": s, "p50": s, "p95": s, "p99": s}, ...}, ...}
+        with quantiles estimated from the buckets.
+        '''
+        result = {}
+        with self.lock:
+            for (method, template, phase), histogram in sorted(self.histograms.items()):
+                result.setdefault(f'{method} {template}', {})[phase] = {
+                    'count': histogram.count,
+                    'mean': histogram.sum / histogram.count,
+                    'p50': histogram.quantile(0.50),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99),
+                }
+        return result
+
+    def to_prometheus(self):
+        '''
+        The metrics in the Prometheus text exposition format.
+        '''
+        lines = ['# HELP bild_request_seconds Time spent in each phase of Bild API requests.',
+                 '# TYPE bild_request_seconds histogram']
+        with self.lock:
+            for (method, template, phase), histogram in sorted(self.histograms.items()):
+                labels = f'method="{method}",endpoint="{template}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f'bild_request_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'bild_request_seconds_sum{{{labels}}} {histogram.sum}')
+                lines.append(f'bild_request_seconds_count{{{labels}}} {histogram.count}')
+            counters = sorted(self.counters.items())
+        descriptions = {
+            'bild_requests_total': ('Bild API request attempts by response status.', 'status'),
+            'bild_retries_total': ('Bild API request attempts retried.', None),
+            'bild_errors_total': ('Bild API requests that failed for good, by status or error.', 'reason'),
+        }
+        for name, (description, last_label) in descriptions.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            for (counter, labels), value in counters:
+                if counter == name:
+                    names = ('method', 'endpoint', last_label)[:len(labels)]
+                    label_text = ','.join(f'{key}="{value_}"' for key, value_ in zip(names, labels))
+                    lines.append(f'{name}{{{label_text}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int = 9464, host: str = '127.0.0.1'):
+        '''
+        Serves to_prometheus() on http://host:port/metrics from a background thread and returns the server
+        (call shutdown() on it to stop). Only local connections by default, pass host='0.0.0.0' to let other machines
+        scrape it.
+        '''
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def tracing_hooks(tracer, hooks: Hooks = None):
+    '''
+    Records every request attempt as a span of an OpenTelemetry tracer (opentelemetry.trace.get_tracer(...)), or of
+    any tracer with the same start_span/set_attribute/record_exception/end API. Returns the hooks to pass to Bild.
+    '''
+    hooks = hooks or Hooks()
+    spans = threading.local()
+
+    @hooks.on('before_request')
+    def start(method, suffix, params, attempt):
+        spans.current = tracer.start_span(f'{method} {endpoint(suffix)}', attributes={
+            'http.request.method': method, 'url.path': suffix, 'bild.attempt': attempt})
+
+    @hooks.on('after_request')
+    def end(response, error, **info):
+        span = getattr(spans, 'current', None)
+        if span is None:
+            return
+        if response is not None:
+            span.set_attribute('http.response.status_code', response.status_code)
+        if error is not None:
+            span.record_exception(error)
+        span.end()
+        spans.current = None
+
+    return hooks
@@ -0,0 +1,208 @@
+import json
+import sqlite3
+import threading
+
+
+def first(item: dict, *keys):
+    '''
+    Returns the first of keys present in item, Bild names the same field differently across endpoints (id/fileID, ...).
+    '''
+    for key in keys:
+        if item.get(key) is not None:
+            return item[key]
+    return None
+
+
+def default_branch(project: dict):
+    '''
+    Returns the ID of a project's default branch, whether the API sent it as an ID or as a branch object.
+    '''
+    branch = first(project, 'defaultBranch', 'defaultBranchID')
+    if isinstance(branch, dict):
+        branch = first(branch, 'id', 'branchID')
+    return branch
+
+
+class BildMirror:
+    '''
+    Local SQLite mirror of projects, users, access, files, versions and metadata, kept up to date by bild_sync.BildSync. \n
+    path = database file (':memory:' for a throwaway mirror) \n
+    Every row keeps the raw JSON object from the API in its data column. IDs, part numbers, revisions and user emails
+    are indexed, so the query methods (files_by_part_number, project_users, ...) answer offline in milliseconds.
+    '''
+    def __init__(self, path: str = 'bild_mirror.sqlite'):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS projects (
+                id TEXT PRIMARY KEY, name TEXT, default_branch TEXT, data TEXT);
+            CREATE TABLE IF NOT EXISTS files (
+                project_id TEXT, branch_id TEXT, id TEXT, name TEXT, path TEXT, part_number TEXT, revision TEXT,
+                latest_version_id TEXT, data TEXT, PRIMARY KEY (project_id, branch_id, id));
+            CREATE TABLE IF NOT EXISTS versions (
+                id TEXT PRIMARY KEY, project_id TEXT, branch_id TEXT, file_id TEXT, data TEXT);
+            CREATE TABLE IF NOT EXISTS metadata (
+                project_id TEXT, branch_id TEXT, file_id TEXT, data TEXT, PRIMARY KEY (project_id, branch_id, file_id));
+            CREATE TABLE IF NOT EXISTS users (
+                id TEXT PRIMARY KEY, name TEXT, email TEXT, role TEXT, data TEXT);
+            CREATE TABLE IF NOT EXISTS access (
+                project_id TEXT, user_id TEXT, access_type TEXT, PRIMARY KEY (project_id, user_id));
+            CREATE TABLE IF NOT EXISTS sync_state (
+                name TEXT PRIMARY KEY, value TEXT);
+            CREATE INDEX IF NOT EXISTS files_id ON files (id);
+            CREATE INDEX IF NOT EXISTS files_part_number ON files (part_number);
+            CREATE INDEX IF NOT EXISTS files_revision ON files (revision);
+            CREATE INDEX IF NOT EXISTS versions_file ON versions (file_id);
+            CREATE INDEX IF NOT EXISTS users_email ON users (email COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS access_user ON access (user_id);
+        ''')
+        self.db.row_factory = sqlite3.Row
+        self.db.commit()
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.db.commit()
+            else:
+                self.db.rollback()
+        finally:
+            self.lock.release()
+
+    def close(self):
+        self.db.close()
+
+    def get_state(self, name: str, default = None):
+        '''
+        Reads a sync high-water mark (any JSON value).
+        '''
+        with self.lock:
+            row = self.db.execute('SELECT value FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, name: str, value):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?)', (name, json.dumps(value)))
+
+    def upsert_project(self, project: dict):
+        '''
+        Stores a project, and its users' access when the project lists its users.
+        '''
+        project_id = first(project, 'id', 'projectID')
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?)',
+                            (project_id, project.get('name'), default_branch(project), json.dumps(project)))
+            for user in project.get('users', []):
+                self.upsert_access(project_id, first(user, 'id', 'userID'), user.get('accessType'))
+
+    def upsert_file(self, project_id: str, branch_id: str, file: dict):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+                project_id, branch_id, first(file, 'fileID', 'id'), file.get('name'), file.get('path'),
+                first(file, 'partNumber', 'part_number'), first(file, 'revision', 'revisionNumber'),
+                first(file, 'latestVersionID', 'fileVersionID', 'versionID'), json.dumps(file)))
+
+    def upsert_version(self, project_id: str, branch_id: str, file_id: str, version: dict):
+        version_id = first(version, 'fileVersionID', 'versionID', 'id')
+        if version_id is None:
+            return
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?)',
+                            (version_id, project_id, branch_id, file_id, json.dumps(version)))
+
+    def upsert_metadata(self, project_id: str, branch_id: str, file_id: str, metadata):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)',
+                            (project_id, branch_id, file_id, json.dumps(metadata)))
+
+    def upsert_user(self, user: dict):
+        '''
+        Stores a user, and their project access when the user lists its projects.
+        '''
+        user_id = first(user, 'id', 'userID')
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)',
+                            (user_id, user.get('name'), user.get('email'), user.get('role'), json.dumps(user)))
+            if 'projects' in user:
+                self.db.execute('DELETE FROM access WHERE user_id = ?', (user_id,))
+                for project in user['projects']:
+                    self.upsert_access(first(project, 'id', 'projectID'), user_id, project.get('accessType'))
+
+    def upsert_access(self, project_id: str, user_id: str, access_type: str):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO access VALUES (?, ?, ?)', (project_id, user_id, access_type))
+
+    def load_users(self, client):
+        '''
+        Replaces the mirrored users and project access with the account's current ones, in one API call.
+        '''
+        users = client.raw().get_all_users()['data']
+        with self:
+            self.db.execute('DELETE FROM access')
+            for user in users:
+                self.upsert_user(user)
+        return len(users)
+
+    def query(self, sql: str, params: tuple = ()):
+        '''
+        Runs any SQL against the mirror and returns the rows as dicts.
+        '''
+        with self.lock:
+            return [dict(row) for row in self.db.execute(sql, params)]
+
+    def files_by_part_number(self, part_number: str):
+        '''
+        Every file, in any project or branch, with the given part number.
+        '''
+        return self.query('SELECT project_id, branch_id, id, name, path, part_number, revision, latest_version_id '
+                          'FROM files WHERE part_number = ?', (part_number,))
+
+    def files_by_revision(self, revision: str, project_id: str = None):
+        sql = 'SELECT project_id, branch_id, id, name, path, part_number, revision FROM files WHERE revision = ?'
+        if project_id is None:
+            return self.query(sql, (revision,))
+        return self.query(sql + ' AND project_id = ?', (revision, project_id))
+
+    def file(self, file_id: str):
+        '''
+        The mirrored copies of a file, one per branch it is in.
+        '''
+        return self.query('SELECT project_id, branch_id, id, name, path, part_number, revision, latest_version_id '
+                          'FROM files WHERE id = ?', (file_id,))
+
+    def versions_of_file(self, file_id: str):
+        return [json.loads(row['data']) for row in self.query('SELECT data FROM versions WHERE file_id = ?', (file_id,))]
+
+    def metadata_of_file(self, file_id: str, project_id: str = None, branch_id: str = None):
+        sql = 'SELECT data FROM metadata WHERE file_id = ?'
+        params = (file_id,)
+        if project_id is not None and branch_id is not None:
+            sql += ' AND project_id = ? AND branch_id = ?'
+            params += (project_id, branch_id)
+        row = self.query(sql, params)
+        return json.loads(row[0]['data']) if row else None
+
+    def project_users(self, project_id: str, access_type: str = None):
+        '''
+        Users with access to a project (only those with the given access type, e.g. Editor, if one is passed).
+        '''
+        sql = ('SELECT users.id, users.name, users.email, users.role, access.access_type FROM access '
+               'JOIN users ON users.id = access.user_id WHERE access.project_id = ?')
+        if access_type is None:
+            return self.query(sql, (project_id,))
+        return self.query(sql + ' AND access.access_type = ?', (project_id, access_type))
+
+    def user_projects(self, email: str):
+        '''
+        Projects a user can access, with their access type, looked up by email.
+        '''
+        return self.query('SELECT projects.id, projects.name, access.access_type FROM users '
+                          'JOIN access ON access.user_id = users.id JOIN projects ON projects.id = access.project_id '
+                          'WHERE users.email = ? COLLATE NOCASE', (email,))
+
+    def count(self, table: str):
+        with self.lock:
+            return self.db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
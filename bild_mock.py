@@ -0,0 +1,536 @@
+'''
+Local stand-in for the Bild API, to load test and benchmark the client without touching a real account:
+python bild_mock.py --port 8000 --files 1000 --latency 0.02 --error-rate 0.01 --rate-limit 50 \n
+Serves every endpoint of compiler/data.json (plus the conversion and user endpoints the client uses) from a synthetic,
+seeded account, so the same flags always produce the same data. Latency, 5xx errors, dropped connections and 429
+throttling are injected on demand. From Python:
+with MockServer(MockDataset(files=1000), latency=0.01) as server:
+    bild = Bild(token='mock', baseurl=server.url)
+'''
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+EPOCH = 1700000000000
+MATERIALS = ('Aluminum 6061', 'Steel 1018', 'ABS', 'Titanium Ti-6Al-4V', 'Brass')
+STATES = ('PENDING', 'APPROVED', 'REJECTED')
+
+
+class MockDataset:
+    '''
+    Synthetic Bild account, identical for the same sizes and seed. \n
+    projects = projects in the account, branches = branches per project \n
+    files = files per branch (every fifth one an assembly of the next four), versions = versions per file \n
+    commits = commits per branch, users = users in the account \n
+    Each project also gets files // 10 ECOs, approvals, feedback items and shared links, and files // 50 packages.
+    '''
+    def __init__(self, projects: int = 3, branches: int = 2, files: int = 50, versions: int = 3, commits: int = 100,
+                 users: int = 20, seed: int = 0):
+        self.random = random.Random(seed)
+        self.users = []
+        self.projects = []
+        self.branches = {}
+        self.files = {}
+        self.file_index = {}
+        self.versions = {}
+        self.commits = {}
+        self.ecos = {}
+        self.approvals = {}
+        self.feedback_items = {}
+        self.packages = {}
+        self.shared_links = {}
+        self.metadata_fields = [{"id": f"mf{index}", "name": name, "type": "string"}
+                                for index, name in enumerate(('partNumber', 'description', 'material', 'revision'))]
+
+        for index in range(users):
+            self.users.append({"id": f"u{index}", "name": f"User {index}", "email": f"user{index}@example.com",
+                               "role": 'Admin' if index == 0 else 'Member', "projects": []})
+        for index in range(projects):
+            self.add_project(f"p{index}", branches, files, versions, commits)
+
+    def stamp(self, minutes: int):
+        return EPOCH + minutes * 60000
+
+    def add_project(self, project_id: str, branches: int, files: int, versions: int, commits: int):
+        members = self.random.sample(self.users, min(len(self.users), 5))
+        access = ['Editor' if position == 0 else self.random.choice(('Editor', 'Viewer', 'Collaborator')) for position in range(len(members))]
+        project = {"id": project_id, "name": f"Project {project_id}", "accessType": 'Editor',
+                   "defaultBranch": {"id": f"{project_id}-b0", "name": 'main'},
+                   "users": [{"id": user['id'], "name": user['name'], "accessType": kind} for user, kind in zip(members, access)],
+                   "createdAt": self.stamp(len(self.projects))}
+        self.projects.append(project)
+        for user, kind in zip(members, access):
+            user['projects'].append({"id": project_id, "name": project['name'], "accessType": kind})
+
+        self.branches[project_id] = []
+        for number in range(branches):
+            branch_id = f"{project_id}-b{number}"
+            self.branches[project_id].append({"id": branch_id, "name": 'main' if number == 0 else f"feature-{number}",
+                                              "projectID": project_id, "createdAt": self.stamp(number)})
+            self.add_files(project_id, branch_id, files, versions)
+            self.add_commits(project_id, branch_id, commits)
+
+        main = self.files[(project_id, f"{project_id}-b0")]
+        for kind, store, count in (('eco', self.ecos, files // 10), ('approval', self.approvals, files // 10),
+                                   ('feedback', self.feedback_items, files // 10), ('link', self.shared_links, files // 10),
+                                   ('package', self.packages, files // 50)):
+            store[project_id] = [self.project_item(kind, project_id, number, main) for number in range(count)]
+
+    def add_files(self, project_id: str, branch_id: str, count: int, versions: int):
+        files = []
+        for number in range(count):
+            file_id = f"{branch_id}-f{number}"
+            assembly = number % 5 == 0
+            history = [{"fileVersionID": f"{file_id}-v{version}", "fileID": file_id, "versionNumber": version + 1,
+                        "status": 'Released' if version == 0 else 'In Work', "createdAt": self.stamp(number + version)}
+                       for version in range(max(1, versions))]
+            self.versions[(project_id, branch_id, file_id)] = history
+            files.append({"fileID": file_id, "name": f"{'assembly' if assembly else 'part'}-{number}.{'sldasm' if assembly else 'sldprt'}",
+                          "type": 'file', "isAssembly": assembly, "projectID": project_id, "branchID": branch_id,
+                          "path": f"/folder-{number // 10}", "partNumber": f"PN-{number:06d}", "revision": chr(65 + len(history) - 1),
+                          "material": self.random.choice(MATERIALS), "latestVersionID": history[-1]['fileVersionID'],
+                          "createdAt": history[0]['createdAt'], "updatedAt": history[-1]['createdAt']})
+        self.files[(project_id, branch_id)] = files
+        self.file_index.update(((project_id, branch_id, file['fileID']), file) for file in files)
+
+    def add_commits(self, project_id: str, branch_id: str, count: int):
+        files = self.files[(project_id, branch_id)]
+        self.commits[(project_id, branch_id)] = [
+            {"id": f"{branch_id}-c{number}", "projectID": project_id, "branchID": branch_id,
+             "message": f"Commit {number}", "author": self.random.choice(self.users)['id'] if self.users else None,
+             "createdAt": self.stamp(count - number),
+             "files": [{"fileID": file['fileID'], "name": file['name'], "partNumber": file['partNumber'], "revision": file['revision']}
+                       for file in self.random.sample(files, min(len(files), 3))]}
+            for number in range(count)]
+
+    def project_item(self, kind: str, project_id: str, number: int, files: list):
+        file = files[(number * 7) % len(files)] if files else {}
+        item = {"id": f"{project_id}-{kind}{number}", "projectID": project_id, "branchID": file.get('branchID'),
+                "fileID": file.get('fileID'), "name": f"{kind.capitalize()} {number}", "createdAt": self.stamp(number)}
+        if kind in ('eco', 'approval'):
+            item['status'] = STATES[number % len(STATES)]
+        if kind == 'link':
+            item['url'] = f"https://share.example.com/{item['id']}"
+        if kind == 'package':
+            item['files'] = [{"fileID": part['fileID'], "fileVersionID": part['latestVersionID']} for part in files[number:number + 5]]
+        return item
+
+    def file(self, project_id: str, branch_id: str, file_id: str):
+        return self.file_index.get((project_id, branch_id, file_id))
+
+    def tree(self, project_id: str, branch_id: str):
+        '''
+        The branch's files as the API nests them: one folder per path, the files as its children.
+        '''
+        folders = {}
+        for file in self.files.get((project_id, branch_id), ()):
+            folders.setdefault(file['path'], []).append(file)
+        return [{"type": 'folder', "name": path.strip('/'), "path": path, "children": children} for path, children in folders.items()]
+
+    def closure(self, project_id: str, branch_id: str, file_id: str):
+        '''
+        An assembly holds the four parts after it, the first assembly of every 25 files also the next assembly.
+        '''
+        files = self.files.get((project_id, branch_id), [])
+        number = int(file_id.rsplit('-f', 1)[1])
+        if number % 5:
+            return []
+        members = files[number + 1:number + 5]
+        if number % 25 == 0 and number + 5 < len(files):
+            members.append(files[number + 5])
+        return [{"fileID": file['fileID'], "fileVersionID": file['latestVersionID'], "name": file['name'],
+                 "isAssembly": file['isAssembly'], "quantity": 1} for file in members]
+
+    def metadata(self, file: dict, version: str = None):
+        return {"fileID": file['fileID'], "fileVersionID": version or file['latestVersionID'], "partNumber": file['partNumber'],
+                "description": file['name'], "material": file['material'], "revision": file['revision']}
+
+    def released(self, after: int = 0):
+        return [dict(file, releasedAt=self.versions[(file['projectID'], file['branchID'], file['fileID'])][0]['createdAt'])
+                for key, files in self.files.items() for file in files
+                if self.versions[(file['projectID'], file['branchID'], file['fileID'])][0]['createdAt'] > after]
+
+    def add_users(self, emails: list, role: str, projects: list):
+        grants = [{"id": project.get('id'), "accessType": project.get('projectAccess')} for project in projects]
+        added = []
+        for email in emails:
+            user = next((user for user in self.users if user['email'].lower() == email.lower()), None)
+            if user is None:
+                user = {"id": f"u{len(self.users)}", "name": email.split('@')[0], "email": email, "role": role, "projects": []}
+                self.users.append(user)
+            # An existing user keeps their role and gains the grants, replacing their access to the same projects
+            user['projects'] = [grant for grant in user['projects'] if grant['id'] not in {new['id'] for new in grants}] + grants
+            added.append(user)
+        return added
+
+
+def every(rows: dict, project_id: str = None):
+    return [item for key, items in rows.items() if project_id in (None, key if isinstance(key, str) else key[0]) for item in items]
+
+
+def by_id(items: list, item_id: str, key: str = 'id'):
+    return next((item for item in items if item.get(key) == item_id), None)
+
+
+# (method, path template, handler(dataset, path params, query, body)), handlers return the data or None for a 404
+ROUTES = [
+    ('GET', '/users', lambda d, p, q, b: d.users),
+    ('PUT', '/users/add', lambda d, p, q, b: d.add_users(b.get('emails') or [], b.get('role', 'Member'), b.get('projects') or [])),
+    ('GET', '/projects', lambda d, p, q, b: d.projects),
+    ('GET', '/projects/{projectID}/users', lambda d, p, q, b: (by_id(d.projects, p['projectID']) or {}).get('users')),
+    ('GET', '/projects/{projectID}/branches', lambda d, p, q, b: d.branches.get(p['projectID'])),
+    ('GET', '/projects/{projectID}/commits', lambda d, p, q, b: every(d.commits, p['projectID']) if p['projectID'] in d.branches else None),
+    ('GET', '/projects/{projectID}/branches/{branchID}/commits', lambda d, p, q, b: d.commits.get((p['projectID'], p['branchID']))),
+    ('GET', '/projects/{projectID}/branches/{branchID}/commits/{commitID}',
+     lambda d, p, q, b: by_id(d.commits.get((p['projectID'], p['branchID']), []), p['commitID'])),
+    ('GET', '/files/released', lambda d, p, q, b: d.released(int(q.get('time') or 0))),
+    ('GET', '/projects/{projectID}/files', lambda d, p, q, b: d.files.get((p['projectID'], f"{p['projectID']}-b0"))),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files',
+     lambda d, p, q, b: d.tree(p['projectID'], p['branchID']) if (p['projectID'], p['branchID']) in d.files else None),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/versions', lambda d, p, q, b: d.versions.get(tuple(p.values()))),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/latest', lambda d, p, q, b: (d.versions.get(tuple(p.values())) or [None])[-1]),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/latestFileVersion', lambda d, p, q, b: (d.versions.get(tuple(p.values())) or [None])[-1]),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/released', lambda d, p, q, b: (d.versions.get(tuple(p.values())) or [None])[0]),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/versions/{fileVersionID}',
+     lambda d, p, q, b: by_id(d.versions.get((p['projectID'], p['branchID'], p['fileID']), []), p['fileVersionID'], 'fileVersionID')),
+    ('GET', '/sharedLinks', lambda d, p, q, b: every(d.shared_links)),
+    ('GET', '/projects/{projectID}/sharedLinks', lambda d, p, q, b: d.shared_links.get(p['projectID'])),
+    ('GET', '/projects/{projectID}/branches/{branchID}/sharedLinks',
+     lambda d, p, q, b: [link for link in d.shared_links.get(p['projectID'], []) if link['branchID'] == p['branchID']]),
+    ('GET', '/metadataFields', lambda d, p, q, b: d.metadata_fields),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/metadata',
+     lambda d, p, q, b: d.metadata(file) if (file := d.file(*p.values())) else None),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/versions/{fileVersionID}/metadata',
+     lambda d, p, q, b: d.metadata(file, p['fileVersionID']) if (file := d.file(p['projectID'], p['branchID'], p['fileID'])) else None),
+    ('GET', '/projects/{projectID}/feedbackItems', lambda d, p, q, b: d.feedback_items.get(p['projectID'])),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/feedbackItems',
+     lambda d, p, q, b: [item for item in d.feedback_items.get(p['projectID'], []) if item['fileID'] == p['fileID']]),
+    ('GET', '/projects/{projectID}/feedbackItems/{feedbackItemID}', lambda d, p, q, b: by_id(d.feedback_items.get(p['projectID'], []), p['feedbackItemID'])),
+    ('GET', '/packages', lambda d, p, q, b: every(d.packages)),
+    ('GET', '/projects/{projectID}/packages', lambda d, p, q, b: d.packages.get(p['projectID'])),
+    ('GET', '/projects/{projectID}/packages/{packageID}', lambda d, p, q, b: by_id(d.packages.get(p['projectID'], []), p['packageID'])),
+    ('GET', '/ecos', lambda d, p, q, b: every(d.ecos)),
+    ('GET', '/projects/{projectID}/ecos', lambda d, p, q, b: d.ecos.get(p['projectID'])),
+    ('GET', '/projects/{projectID}/branches/{branchID}/ecos',
+     lambda d, p, q, b: [eco for eco in d.ecos.get(p['projectID'], []) if eco['branchID'] == p['branchID']]),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/ecos',
+     lambda d, p, q, b: [eco for eco in d.ecos.get(p['projectID'], []) if eco['fileID'] == p['fileID']]),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/ecos/{ecoID}', lambda d, p, q, b: by_id(d.ecos.get(p['projectID'], []), p['ecoID'])),
+    ('GET', '/projects/{projectID}/branches/{branchID}/files/{fileID}/closure',
+     lambda d, p, q, b: d.closure(p['projectID'], p['branchID'], p['fileID']) if d.file(p['projectID'], p['branchID'], p['fileID']) else None),
+    ('GET', '/approvals', lambda d, p, q, b: every(d.approvals)),
+    ('GET', '/projects/{projectID}/approvals', lambda d, p, q, b: d.approvals.get(p['projectID'])),
+    ('GET', '/projects/{projectID}/approvals/{approvalID}', lambda d, p, q, b: by_id(d.approvals.get(p['projectID'], []), p['approvalID'])),
+]
+
+
+def compile_route(template: str):
+    return re.compile('^' + re.sub(r'\\{(\w+)\\}', r'(?P<\1>[^/]+)', re.escape(template)) + '$')
+
+
+COMPILED_ROUTES = [(method, template, compile_route(template), handler) for method, template, handler in ROUTES]
+CONVERSION = re.compile(r'^/projects/(?P<projectID>[^/]+)/branches/(?P<branchID>[^/]+)/files/(?P<fileID>[^/]+)/universalFormat$')
+DOWNLOAD = re.compile(r'^/downloads/(?P<name>[^/]+)$')
+
+
+def match_route(method: str, path: str):
+    '''
+    Returns (template, handler, path params) of the route serving the request, or (None, None, None).
+    '''
+    for route_method, template, pattern, handler in COMPILED_ROUTES:
+        if route_method == method:
+            found = pattern.match(path)
+            if found:
+                return template, handler, found.groupdict()
+    return None, None, None
+
+
+def page(items: list, query: dict):
+    '''
+    Cuts a pageSize/lastEvaluatedKey page out of a list, the key of the next page being {"id": ..., "position": ...}.
+    '''
+    size = int(query['pageSize'])
+    start = json.loads(query['lastEvaluatedKey'])['position'] + 1 if query.get('lastEvaluatedKey') else 0
+    chunk = items[start:start + size]
+    result = {"data": chunk, "message": 'Success'}
+    if start + size < len(items):
+        result['lastEvaluatedKey'] = {"id": chunk[-1].get('id') or chunk[-1].get('fileID'), "position": start + size - 1}
+    return result
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_PUT(self):
+        self.handle_request('PUT')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def do_PATCH(self):
+        self.handle_request('PATCH')
+
+    def do_DELETE(self):
+        self.handle_request('DELETE')
+
+    def handle_request(self, method: str):
+        server = self.server
+        url = urlsplit(self.path)
+        query = dict(parse_qsl(url.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        conversion = CONVERSION.match(url.path) if method == 'POST' else None
+        download = DOWNLOAD.match(url.path) if method == 'GET' else None
+        template, handler, params = match_route(method, url.path)
+        if conversion:
+            template = '/projects/{projectID}/branches/{branchID}/files/{fileID}/universalFormat'
+        elif download:
+            template = '/downloads/{name}'
+        server.record(f'{method} {template or url.path}')
+        fault = server.fault()
+        if fault == 'drop':
+            self.close_connection = True
+            self.connection.close()
+            return
+        if fault == 'throttle':
+            return self.reply(429, {"message": 'Too Many Requests'}, {'Retry-After': str(server.retry_after)})
+        if fault == 'error':
+            return self.reply(server.random_choice(server.error_statuses), {"message": 'Internal Server Error'})
+
+        if download:
+            return self.send_download(download['name'], int(query.get('size') or server.download_size))
+        if not (self.headers.get('Authorization') or '').startswith('Bearer '):
+            return self.reply(401, {"message": 'Unauthorized'})
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            return self.reply(400, {"message": 'Invalid JSON body'})
+
+        if conversion:
+            return self.reply(*server.convert(conversion.groupdict(), body))
+        if handler is None:
+            return self.reply(404, {"message": 'Not Found'})
+        if method == 'GET':
+            data = handler(server.dataset, params, query, body)
+        else:
+            with server.lock:
+                data = handler(server.dataset, params, query, body)
+        if data is None:
+            return self.reply(404, {"message": 'Not Found'})
+        if isinstance(data, list) and query.get('pageSize'):
+            return self.reply(200, page(data, query))
+        return self.reply(200, {"data": data, "message": 'Success'})
+
+    def reply(self, status: int, payload, headers: dict = None, content_type: str = 'application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"' if status == 200 and self.command == 'GET' else None
+        if etag and self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+        # Counted before answering, so the stats are up to date once the client has the response
+        self.server.record_status(status)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_download(self, name: str, size: int):
+        '''
+        Streams a converted file, or the part of it asked for by a Range header (bytes=start-end or bytes=start-).
+        '''
+        start, end, status = 0, size - 1, 200
+        found = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range') or '')
+        if found:
+            start, end, status = int(found[1]), min(int(found[2] or size - 1), size - 1), 206
+            if start >= size:
+                return self.reply(416, b'', {'Content-Range': f'bytes */{size}'}, content_type='application/octet-stream')
+        self.server.record_status(status)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(end + 1 - start))
+        self.send_header('Accept-Ranges', 'bytes')
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        stop = end + 1
+        if self.server.interrupt():
+            stop, self.close_connection = start + (stop - start) // 2, True
+        for chunk in self.server.download_chunks(name, start, stop):
+            self.wfile.write(chunk)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    '''
+    Threaded, keep-alive HTTP server answering like the Bild API from a MockDataset. \n
+    latency, jitter = seconds added to every request, plus up to jitter more at random \n
+    error_rate = share of requests answered with one of error_statuses \n
+    drop_rate = share of connections closed without any response \n
+    rate_limit = requests per second served before answering 429 with Retry-After: retry_after (None never throttles) \n
+    conversion_polls = universalFormat calls answered IN_PROGRESS before a conversion completes \n
+    download_size = bytes of every converted file (a size query parameter on a download URL overrides it). Downloads
+    answer Range requests \n
+    interrupted_downloads = downloads cut off halfway through (the connection closes), to exercise resuming \n
+    seed = seeds the faults, so a run with the same settings fails the same requests \n
+    stats = {"requests": n, "statuses": {code: n}, "routes": {"GET /users": n, ...}}
+    '''
+    daemon_threads = True
+
+    def __init__(self, dataset: MockDataset = None, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_statuses: tuple = (500, 502, 503), drop_rate: float = 0.0,
+                 rate_limit: float = None, retry_after: float = 1, conversion_polls: int = 1, download_size: int = 65536,
+                 interrupted_downloads: int = 0, seed: int = 0):
+        super().__init__((host, port), MockHandler)
+        self.dataset = dataset or MockDataset()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.drop_rate = drop_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.conversion_polls = conversion_polls
+        self.download_size = download_size
+        self.interrupted_downloads = interrupted_downloads
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = rate_limit or 0
+        self.updated = time.monotonic()
+        self.conversions = {}
+        self.stats = {'requests': 0, 'statuses': {}, 'routes': {}}
+        self.thread = None
+
+    @property
+    def url(self):
+        return f'http://{self.server_address[0]}:{self.server_address[1]}'
+
+    def start(self):
+        '''
+        Serves in a background thread and returns the server.
+        '''
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def random_choice(self, options):
+        with self.lock:
+            return self.random.choice(options)
+
+    def fault(self):
+        '''
+        Waits out the latency and picks the fault injected into this request, if any: "drop", "throttle" or "error".
+        '''
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            roll = self.random.random()
+            throttled = False
+            if self.rate_limit:
+                now = time.monotonic()
+                self.tokens = min(self.rate_limit, self.tokens + (now - self.updated) * self.rate_limit)
+                self.updated = now
+                throttled = self.tokens < 1
+                if not throttled:
+                    self.tokens -= 1
+        if delay:
+            time.sleep(delay)
+        if roll < self.drop_rate:
+            return 'drop'
+        if throttled:
+            return 'throttle'
+        if roll < self.drop_rate + self.error_rate:
+            return 'error'
+        return None
+
+    def record(self, route: str):
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['routes'][route] = self.stats['routes'].get(route, 0) + 1
+
+    def record_status(self, status: int):
+        with self.lock:
+            self.stats['statuses'][status] = self.stats['statuses'].get(status, 0) + 1
+
+    def convert(self, params: dict, body: dict):
+        '''
+        Answers a universalFormat request: IN_PROGRESS for the first conversion_polls calls, then the download URL.
+        '''
+        if self.dataset.file(params['projectID'], params['branchID'], params['fileID']) is None:
+            return 404, {"message": 'Not Found'}
+        name = f"{params['fileID']}_{body.get('fileVersion')}.{body.get('universalFileFormat', 'stl')}"
+        with self.lock:
+            polls = self.conversions[name] = self.conversions.get(name, 0) + 1
+        if polls <= self.conversion_polls:
+            return 200, {"data": {"status": 'IN_PROGRESS'}, "message": 'Success'}
+        return 200, {"data": {"status": 'COMPLETED', "url": f'{self.url}/downloads/{name}'}, "message": 'Success'}
+
+    def interrupt(self):
+        with self.lock:
+            if self.interrupted_downloads <= 0:
+                return False
+            self.interrupted_downloads -= 1
+            return True
+
+    def download_chunks(self, name: str, start: int, stop: int, chunk_size: int = 1024 * 1024):
+        '''
+        Bytes start to stop of the converted file named name, the same for the same name, in chunks of at most chunk_size.
+        '''
+        block = hashlib.sha256(name.encode()).digest() * (chunk_size // 32 + 2)
+        for offset in range(start, stop, chunk_size):
+            length = min(chunk_size, stop - offset)
+            yield block[offset % 32:offset % 32 + length]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--projects', type=int, default=3)
+    parser.add_argument('--branches', type=int, default=2, help='branches per project')
+    parser.add_argument('--files', type=int, default=50, help='files per branch')
+    parser.add_argument('--versions', type=int, default=3, help='versions per file')
+    parser.add_argument('--commits', type=int, default=100, help='commits per branch')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds at random')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with a 5xx')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='share of connections closed without a response')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second before answering 429')
+    parser.add_argument('--retry-after', type=float, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = MockDataset(args.projects, args.branches, args.files, args.versions, args.commits, args.users, args.seed)
+    server = MockServer(dataset, args.host, args.port, args.latency, args.jitter, args.error_rate, drop_rate=args.drop_rate,
+                        rate_limit=args.rate_limit, retry_after=args.retry_after, seed=args.seed)
+    print(f'Mock Bild API on {server.url}: Bild(token="mock", baseurl="{server.url}")')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,283 @@
+import sys
+from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+
+
+registry = {}
+
+
+class ModelList(list):
+    '''
+    List of models, marks a nested list as already converted.
+    '''
+    __slots__ = ()
+
+
+def many(model: str):
+    '''
+    Converter turning a nested list of API objects into a ModelList of the named model.
+    '''
+    def convert(value):
+        if not isinstance(value, list) or isinstance(value, ModelList):
+            return value
+        cls = registry[model]
+        return ModelList(cls(item) if isinstance(item, dict) else item for item in value)
+    return convert
+
+
+def timestamp(value):
+    '''
+    Converts a Unix time (seconds or milliseconds) or an ISO 8601 string to an aware UTC datetime.
+    Values in any other shape are returned unchanged.
+    '''
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, timezone.utc)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return value
+
+
+class lazy:
+    '''
+    Attribute kept as its raw API value until first accessed, then converted. \n
+    store = keep the converted value in the slot (nested models), otherwise convert on every access and keep the raw
+    value so to_dict() returns it untouched (timestamps). Converters return already converted values unchanged.
+    '''
+    def __init__(self, slot: str, convert, store: bool = True):
+        self.slot = slot
+        self.convert = convert
+        self.store = store
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        converted = self.convert(value)
+        if self.store and converted is not value:
+            setattr(instance, self.slot, converted)
+        return converted
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, value)
+
+
+def extras(item: dict, known: frozenset):
+    return {key: value for key, value in item.items() if key not in known}
+
+
+class Model:
+    '''
+    Base of the typed response models. \n
+    Each model keeps the fields of one API object in __slots__ instead of a dict, named exactly as the API names them
+    (file.partNumber, commit.branchID, ...). Fields the object didn't have are None, fields the model doesn't declare are
+    kept in extra. Nested objects and timestamps stay raw until their attribute is first read. \n
+    Models also answer model.get(key), model[key] and key in model, so code written against the raw dicts keeps working:
+    those return timestamps as the API sent them, only the attribute (commit.createdAt) gives a datetime. to_dict() gives
+    the API object back. \n
+    shared = fields whose values repeat across objects (IDs of the parent project, statuses, ...), interned so a
+    100k-item listing holds one copy of each value instead of one per item.
+    '''
+    __slots__ = ('extra',)
+    fields = ()
+    shared = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        slots = [slot for klass in reversed(cls.__mro__) for slot in klass.__dict__.get('__slots__', ()) if slot != 'extra']
+        cls.fields = tuple((slot, slot.lstrip('_')) for slot in slots)
+        cls.known = frozenset(key for _, key in cls.fields)
+        # Keys whose attribute converts on every read (timestamps): get() and [] read the raw slot instead
+        cls.raw_slots = {key: slot for slot, key in cls.fields
+                         if isinstance(getattr(cls, key, None), lazy) and not getattr(cls, key).store}
+        registry[cls.__name__] = cls
+        # Generate a straight-line __init__ (as dataclasses do), a setattr loop would double the construction time
+        lines = []
+        for slot, key in cls.fields:
+            if key in cls.shared:
+                lines.append(f'    value = get({key!r})')
+                lines.append(f'    self.{slot} = intern(value) if type(value) is str else value')
+            else:
+                lines.append(f'    self.{slot} = get({key!r})')
+        source = '\n'.join(['def __init__(self, item):', '    get = item.get', *lines, '    self.extra = None if item.keys() <= known else extras(item, known)'])
+        namespace = {}
+        exec(source, {'known': cls.known, 'extras': extras, 'intern': sys.intern}, namespace)
+        cls.__init__ = namespace['__init__']
+
+    def get(self, key: str, default=None):
+        if key in self.raw_slots:
+            value = getattr(self, self.raw_slots[key])
+        elif key in self.known:
+            value = getattr(self, key)
+        else:
+            value = self.extra.get(key) if self.extra else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str):
+        return self.get(key) is not None
+
+    def keys(self):
+        present = [key for slot, key in self.fields if getattr(self, slot) is not None]
+        return present + list(self.extra or ())
+
+    def to_dict(self):
+        '''
+        Returns the API object as a plain dict, nested models included.
+        '''
+        result = {}
+        for slot, key in self.fields:
+            value = getattr(self, slot)
+            if value is None:
+                continue
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, ModelList):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            result[key] = value
+        result.update(self.extra or {})
+        return result
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class User(Model):
+    __slots__ = ('id', 'name', 'email', 'role', 'accessType', '_projects')
+    shared = ('role', 'accessType')
+    projects = lazy('_projects', many('Project'))
+
+
+class Project(Model):
+    __slots__ = ('id', 'name', 'description', 'defaultBranch', '_users', '_createdAt')
+    users = lazy('_users', many('User'))
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class Branch(Model):
+    __slots__ = ('id', 'name', '_createdAt')
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class File(Model):
+    __slots__ = ('id', 'fileID', 'name', 'type', 'path', 'partNumber', 'revision', 'revisionNumber', 'fileVersionID',
+                 'projectID', 'branchID', 'status', '_children', '_updatedAt')
+    shared = ('type', 'revision', 'projectID', 'branchID', 'status')
+    children = lazy('_children', many('File'))
+    updatedAt = lazy('_updatedAt', timestamp, store=False)
+
+
+class FileVersion(Model):
+    __slots__ = ('id', 'fileVersionID', 'fileID', 'name', 'version', 'partNumber', 'revision', 'status', 'message',
+                 'createdBy', '_createdAt')
+    shared = ('fileID', 'revision', 'status', 'createdBy')
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class Commit(Model):
+    __slots__ = ('id', 'commitID', 'projectID', 'branchID', 'message', 'createdBy', '_files', '_createdAt')
+    shared = ('projectID', 'branchID', 'createdBy')
+    files = lazy('_files', many('File'))
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class ECO(Model):
+    __slots__ = ('id', 'ecoID', 'name', 'title', 'description', 'status', 'createdBy', '_files', '_createdAt')
+    shared = ('status', 'createdBy')
+    files = lazy('_files', many('File'))
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class Approval(Model):
+    __slots__ = ('id', 'approvalID', 'name', 'title', 'status', 'requestedBy', 'approvers', '_files', '_createdAt')
+    shared = ('status', 'requestedBy')
+    files = lazy('_files', many('File'))
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class Package(Model):
+    __slots__ = ('id', 'packageID', 'name', 'description', 'status', 'createdBy', '_files', '_createdAt')
+    shared = ('status', 'createdBy')
+    files = lazy('_files', many('File'))
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+class FeedbackItem(Model):
+    __slots__ = ('id', 'feedbackItemID', 'fileID', 'title', 'message', 'status', 'createdBy', '_createdAt')
+    shared = ('fileID', 'status', 'createdBy')
+    createdAt = lazy('_createdAt', timestamp, store=False)
+
+
+# Model of the data returned by each endpoint, keyed by a path pattern where * matches any part of the path.
+# The first matching pattern wins, None keeps the raw JSON (free-form metadata, closures, links).
+ENDPOINT_MODELS = {
+    '*/metadata': None,
+    '*/closure': None,
+    '*/sharedLinks': None,
+    '/users': User,
+    '/projects/*/users': User,
+    '/projects': Project,
+    '/projects/*/branches': Branch,
+    '*/commits': Commit,
+    '*/commits/*': Commit,
+    '/files/released': File,
+    '*/files/*/versions': FileVersion,
+    '*/files/*/versions/*': FileVersion,
+    '*/files/*/latest': FileVersion,
+    '*/files/*/latestFileVersion': FileVersion,
+    '*/files/*/released': FileVersion,
+    '*/files': File,
+    '*/feedbackItems': FeedbackItem,
+    '*/feedbackItems/*': FeedbackItem,
+    '/packages': Package,
+    '*/packages': Package,
+    '*/packages/*': Package,
+    '/ecos': ECO,
+    '*/ecos': ECO,
+    '*/ecos/*': ECO,
+    '/approvals': Approval,
+    '*/approvals': Approval,
+    '*/approvals/*': Approval,
+}
+
+
+def endpoint_model(suffix: str):
+    '''
+    Returns the model of an endpoint's data, or None if it is returned raw.
+    '''
+    for pattern, model in ENDPOINT_MODELS.items():
+        if fnmatchcase(suffix, pattern):
+            return model
+    return None
+
+
+def parse_response(suffix: str, body):
+    '''
+    Replaces the data of a response with models: a ModelList for a list, a model for a single object.
+    '''
+    model = endpoint_model(suffix)
+    if model is None or not isinstance(body, dict):
+        return body
+    data = body.get('data')
+    if isinstance(data, list):
+        return dict(body, data=ModelList(model(item) if isinstance(item, dict) else item for item in data))
+    if isinstance(data, dict):
+        return dict(body, data=model(data))
+    return body
@@ -0,0 +1,194 @@
+import base64
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+from bild_mirror import first
+
+
+# A cell's key packs the user index in the high 32 bits and the project index in the low ones
+SHIFT = 32
+MASK = (1 << SHIFT) - 1
+
+
+def packed(values: array):
+    '''
+    The array as little-endian base64, the same on every machine.
+    '''
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode()
+
+
+def unpacked(typecode: str, text: str):
+    values = array(typecode, base64.b64decode(text))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class PermissionsMatrix:
+    '''
+    Sparse user x project matrix of access types, integer coded: users, projects and access types are stored once
+    each, and every grant is one 64-bit key (user index, project index) in a sorted array plus a one-byte access code,
+    so a million grants take about 9 MB. \n
+    access(user, project), projects_of(user) and users_of(project) answer lookups, old.diff(new) compares two
+    snapshots and save(path)/load(path) keep snapshots on disk. Build one from the API with Bild.permissions_matrix().
+    '''
+    def __init__(self, users: list = (), projects: list = (), access_types: list = (), keys: array = None,
+                 codes: array = None, emails: dict = None):
+        self.users = list(users)
+        self.projects = list(projects)
+        self.access_types = list(access_types)
+        self.keys = keys if keys is not None else array('Q')
+        self.codes = codes if codes is not None else array('B')
+        self.emails = dict(emails or {})
+        self.user_index = {user: index for index, user in enumerate(self.users)}
+        self.project_index = {project: index for index, project in enumerate(self.projects)}
+
+    @classmethod
+    def from_cells(cls, cells, emails: dict = None):
+        '''
+        Builds the matrix from (user ID, project ID, access type) triples, the last one winning for a repeated cell.
+        '''
+        users, projects, access_types, coded = {}, {}, {}, {}
+        for user, project, access in cells:
+            key = (users.setdefault(user, len(users)) << SHIFT) | projects.setdefault(project, len(projects))
+            coded[key] = access_types.setdefault(access, len(access_types))
+        if len(access_types) > 256:
+            raise Exception(f'{len(access_types)} access types, at most 256 fit a one-byte code')
+        keys = array('Q', sorted(coded))
+        return cls(users, projects, access_types, keys, array('B', (coded[key] for key in keys)), emails)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        '''
+        Yields every grant as (user ID, project ID, access type), grouped by user.
+        '''
+        for key, code in zip(self.keys, self.codes):
+            yield self.users[key >> SHIFT], self.projects[key & MASK], self.access_types[code]
+
+    def __eq__(self, other):
+        return isinstance(other, PermissionsMatrix) and set(self) == set(other)
+
+    __hash__ = None
+
+    def access(self, user: str, project: str):
+        '''
+        The access type of a user to a project, None if they have none.
+        '''
+        if user not in self.user_index or project not in self.project_index:
+            return None
+        key = (self.user_index[user] << SHIFT) | self.project_index[project]
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.access_types[self.codes[position]]
+        return None
+
+    def projects_of(self, user: str):
+        '''
+        {project ID: access type} of every project the user can access.
+        '''
+        if user not in self.user_index:
+            return {}
+        index = self.user_index[user]
+        start, stop = bisect_left(self.keys, index << SHIFT), bisect_left(self.keys, (index + 1) << SHIFT)
+        return {self.projects[self.keys[position] & MASK]: self.access_types[self.codes[position]] for position in range(start, stop)}
+
+    def users_of(self, project: str, access_type: str = None):
+        '''
+        {user ID: access type} of every user with access to the project, only those with access_type if given.
+        '''
+        if project not in self.project_index:
+            return {}
+        index = self.project_index[project]
+        return {self.users[key >> SHIFT]: self.access_types[code] for key, code in zip(self.keys, self.codes)
+                if key & MASK == index and (access_type is None or self.access_types[code] == access_type)}
+
+    def counts(self):
+        '''
+        {access type: number of grants}
+        '''
+        counts = [0] * len(self.access_types)
+        for code in self.codes:
+            counts[code] += 1
+        return dict(zip(self.access_types, counts))
+
+    def diff(self, new: 'PermissionsMatrix'):
+        '''
+        What changed from this snapshot to new:
+        {"added": [(user, project, access)], "removed": [(user, project, access)], "changed": [(user, project, old access, new access)]}
+        The new snapshot's indexes are remapped onto this one's, so the comparison runs on integer keys.
+        '''
+        user_map = [self.user_index.get(user, len(self.users) + index) for index, user in enumerate(new.users)]
+        project_map = [self.project_index.get(project, len(self.projects) + index) for index, project in enumerate(new.projects)]
+        users, projects = self.users + new.users, self.projects + new.projects
+
+        before = dict(zip(self.keys, self.codes))
+        after = {(user_map[key >> SHIFT] << SHIFT) | project_map[key & MASK]: new.access_types[code]
+                 for key, code in zip(new.keys, new.codes)}
+        changes = {'added': [], 'removed': [], 'changed': []}
+        for key, code in before.items():
+            old = self.access_types[code]
+            current = after.get(key)
+            if current is None:
+                changes['removed'].append((users[key >> SHIFT], projects[key & MASK], old))
+            elif current != old:
+                changes['changed'].append((users[key >> SHIFT], projects[key & MASK], old, current))
+        for key, current in after.items():
+            if key not in before:
+                changes['added'].append((users[key >> SHIFT], projects[key & MASK], current))
+        return changes
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'users': self.users, 'projects': self.projects, 'access_types': self.access_types,
+                       'emails': self.emails, 'keys': packed(self.keys), 'codes': packed(self.codes)}, file)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(data['users'], data['projects'], data['access_types'], unpacked('Q', data['keys']),
+                   unpacked('B', data['codes']), data.get('emails'))
+
+
+def sweep(client, workers: int = 8, verify: bool = False):
+    '''
+    Builds the PermissionsMatrix of the account from get_all_users and get_all_projects, whose users and projects
+    embed each other's access. Only projects listed without their users are fetched with get_all_users_in_project,
+    in parallel (every project with verify, for an authoritative sweep). Per-project responses win over the
+    embedded lists, which win over the users' own project lists.
+    '''
+    client = client.raw()
+    users = client.get_all_users()['data']
+    projects = client.get_all_projects()['data']
+    access, emails = {}, {}
+    for user in users:
+        user_id = first(user, 'id', 'userID')
+        emails[user_id] = user.get('email')
+        for project in user.get('projects') or []:
+            access.setdefault(first(project, 'id', 'projectID'), {})[user_id] = project.get('accessType')
+
+    missing = []
+    for project in projects:
+        project_id = first(project, 'id', 'projectID')
+        embedded = project.get('users')
+        if verify or embedded is None:
+            missing.append(project_id)
+            continue
+        grants = access.setdefault(project_id, {})
+        for user in embedded:
+            grants[first(user, 'id', 'userID')] = user.get('accessType')
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for project_id, response in zip(missing, executor.map(client.get_all_users_in_project, missing)):
+            access[project_id] = {first(user, 'id', 'userID'): user.get('accessType') for user in response.get('data') or []}
+
+    cells = ((user_id, project_id, kind) for project_id, grants in access.items() for user_id, kind in grants.items())
+    return PermissionsMatrix.from_cells(cells, emails)
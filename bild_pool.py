@@ -0,0 +1,201 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from bild import Bild
+from bild_retry import AdaptiveLimiter, TokenBucket
+
+
+class BildPool:
+    '''
+    Clients for many Bild accounts, served by one set of worker threads scheduled fairly across the accounts. \n
+    tokens = {tenant: token}, one entry per account (BildPool.from_env() reads them from BILD_API_KEY_<TENANT>) \n
+    workers = worker threads shared by every tenant \n
+    rate, burst = requests per second allowed to each account (bild_retry.TokenBucket), None for no limit \n
+    adaptive = give each account a bild_retry.AdaptiveLimiter, lowering its concurrency when it gets throttled \n
+    max_in_flight = calls of one tenant running at once, None lets a tenant use every idle worker \n
+    weights = {tenant: calls per turn}, 1 for tenants not listed \n
+    Other keyword arguments are passed to every Bild (timeout, retry, baseurl, ...). \n\n
+    Each account has one client, created on first use: its connection pool and its rate budget are shared by every
+    worker and by direct calls through client(tenant). Calls submitted for a tenant run in order, and the tenants with
+    queued calls take turns, weights[tenant] calls at a time, so a tenant with a long backlog can't starve the
+    others: a call submitted for an idle tenant starts as soon as a worker frees up. \n
+    with BildPool({"acme": token_a, "globex": token_b}, workers=8, rate=5) as pool: \n
+        future = pool.submit("acme", "get_all_users") \n
+        futures = pool.map("globex", "get_all_files", project_ids)
+    '''
+    def __init__(self, tokens: dict, workers: int = 8, rate: float = None, burst: float = None, adaptive: bool = False,
+                 max_in_flight: int = None, weights: dict = None, **kwargs):
+        self.tokens = dict(tokens)
+        self.workers = workers
+        self.rate = rate
+        self.burst = burst
+        self.adaptive = adaptive
+        self.max_in_flight = max_in_flight
+        self.weights = dict(weights or {})
+        self.client_kwargs = dict(kwargs, pool_maxsize=max(workers, kwargs.get('pool_maxsize', 10)))
+        self.clients = {}
+        self.queues = {}
+        self.ring = deque()
+        self.credit = {}
+        self.stats = {}
+        self.closed = False
+        self.condition = threading.Condition()
+        self.threads = [threading.Thread(target=self.work, name=f'BildPool-{index}', daemon=True) for index in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    @classmethod
+    def from_env(cls, prefix: str = 'BILD_API_KEY_', **kwargs):
+        '''
+        A pool of every account with a token in a <prefix><TENANT> environment variable, the tenant being the
+        lowercased suffix (BILD_API_KEY_ACME -> "acme").
+        '''
+        tokens = {name[len(prefix):].lower(): value for name, value in os.environ.items() if name.startswith(prefix) and value}
+        if not tokens:
+            raise Exception(f'No tokens found. Set {prefix}<TENANT> in environment variables, one per account.')
+        return cls(tokens, **kwargs)
+
+    def add_tenant(self, tenant: str, token: str):
+        '''
+        Adds an account, or replaces the token of one already in the pool (rotation): its client is closed and the
+        next call creates one with the new token, calls already queued included.
+        '''
+        with self.condition:
+            self.tokens[tenant] = token
+            client = self.clients.pop(tenant, None)
+        if client is not None:
+            client.close()
+
+    def client(self, tenant: str):
+        '''
+        The account's Bild client, shared by every call for that tenant.
+        '''
+        with self.condition:
+            client = self.clients.get(tenant)
+            if client is None:
+                if tenant not in self.tokens:
+                    raise Exception(f'Unknown tenant {tenant!r}, add its token with add_tenant()')
+                rate_limiter = TokenBucket(self.rate, self.burst) if self.rate else None
+                adaptive = AdaptiveLimiter(limit=self.max_in_flight or self.workers) if self.adaptive else None
+                client = Bild(token=self.tokens[tenant], rate_limiter=rate_limiter, adaptive=adaptive, **self.client_kwargs)
+                self.clients[tenant] = client
+            return client
+
+    def submit(self, tenant: str, call, *args, **kwargs):
+        '''
+        Queues a call for a tenant and returns its concurrent.futures.Future. \n
+        call = name of a Bild method ("get_all_users") or a function taking the tenant's client first
+        '''
+        # The client is looked up when the call runs, so a token rotated in between is used
+        self.client(tenant)
+        future = Future()
+        with self.condition:
+            if self.closed:
+                raise Exception('BildPool is closed')
+            queue = self.queues.setdefault(tenant, deque())
+            if not queue and tenant not in self.ring:
+                self.ring.append(tenant)
+            queue.append((future, call, args, kwargs))
+            self.tenant_stats(tenant)['submitted'] += 1
+            self.condition.notify()
+        return future
+
+    def map(self, tenant: str, call, items):
+        '''
+        Submits call(item) for each item of the iterable and returns the futures in the same order.
+        '''
+        return [self.submit(tenant, call, item) for item in items]
+
+    def tenant_stats(self, tenant: str):
+        return self.stats.setdefault(tenant, {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'running': 0})
+
+    def queued(self):
+        '''
+        {tenant: calls waiting for a worker}
+        '''
+        with self.condition:
+            return {tenant: len(queue) for tenant, queue in self.queues.items()}
+
+    def next_call(self):
+        '''
+        Takes the next call to run: the tenant at the head of the ring runs up to its weight of calls, then goes to the
+        back. Tenants at max_in_flight are passed over. Called with the condition held.
+        '''
+        for _ in range(len(self.ring)):
+            tenant = self.ring[0]
+            stats = self.tenant_stats(tenant)
+            if self.max_in_flight is not None and stats['running'] >= self.max_in_flight:
+                self.ring.rotate(-1)
+                continue
+            queue = self.queues[tenant]
+            item = queue.popleft()
+            credit = self.credit.get(tenant, self.weights.get(tenant, 1)) - 1
+            if not queue:
+                self.ring.popleft()
+                self.credit.pop(tenant, None)
+            elif credit <= 0:
+                self.ring.rotate(-1)
+                self.credit.pop(tenant, None)
+            else:
+                self.credit[tenant] = credit
+            stats['running'] += 1
+            return tenant, item
+        return None
+
+    def work(self):
+        while True:
+            with self.condition:
+                while True:
+                    task = self.next_call()
+                    if task is not None:
+                        break
+                    if self.closed and not self.ring:
+                        return
+                    self.condition.wait()
+            tenant, (future, call, args, kwargs) = task
+            outcome = 'cancelled'
+            if future.set_running_or_notify_cancel():
+                try:
+                    client = self.client(tenant)
+                    function = getattr(client, call) if isinstance(call, str) else lambda *a, **k: call(client, *a, **k)
+                    future.set_result(function(*args, **kwargs))
+                    outcome = 'completed'
+                except BaseException as e:
+                    future.set_exception(e)
+                    outcome = 'failed'
+            with self.condition:
+                stats = self.tenant_stats(tenant)
+                stats['running'] -= 1
+                stats[outcome] += 1
+                # A tenant held back by max_in_flight may be runnable again
+                self.condition.notify_all()
+
+    def close(self, wait: bool = True, cancel: bool = False):
+        '''
+        Stops accepting calls and closes every client. \n
+        wait = wait for the queued calls to be done first, without it calls still queued or running fail as their
+        client is closed under them \n
+        cancel = cancel the calls still queued instead of running them
+        '''
+        with self.condition:
+            self.closed = True
+            if cancel:
+                for queue in self.queues.values():
+                    for future, *_ in queue:
+                        future.cancel()
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+        with self.condition:
+            clients = list(self.clients.values())
+        for client in clients:
+            client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,141 @@
+import random
+import threading
+import time
+from bild_lazy import lazy
+
+exceptions = lazy('requests.exceptions')
+urllib3_exceptions = lazy('urllib3.exceptions')
+
+
+class TokenBucket:
+    '''
+    Token-bucket rate limiter shared by every thread using the client. \n
+    rate = requests allowed per second on average \n
+    burst = requests allowed back to back after an idle period (defaults to rate)
+    '''
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.burst = burst or max(rate, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        '''
+        Blocks until a token is available and takes it.
+        '''
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryPolicy:
+    '''
+    Decides when a failed request is retried and how long to wait before trying again. \n
+    max_retries = retries after the first attempt (0 disables retrying) \n
+    backoff, max_backoff = exponential backoff base and cap in seconds, with full jitter when jitter is True \n
+    statuses = response codes worth retrying \n
+    methods = methods retried on any retryable failure. Others (POST, PUT /users/add, ...) may have been applied by the
+    server, so they are only retried when it certainly didn't process them: a 429, or a connection that never opened. \n
+    A Retry-After header always overrides the backoff.
+    '''
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, jitter: bool = True,
+                 statuses: tuple = (429, 500, 502, 503, 504), methods: tuple = ('GET', 'HEAD', 'OPTIONS')):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.methods = methods
+
+    def should_retry(self, method: str, attempt: int, response = None, error: Exception = None):
+        if attempt >= self.max_retries:
+            return False
+        idempotent = method.upper() in self.methods
+        if error is not None:
+            return idempotent or is_connect_error(error)
+        if response.status_code == 429:
+            return True
+        return idempotent and response.status_code in self.statuses
+
+    def delay(self, attempt: int, response = None):
+        '''
+        Seconds to wait before the next attempt: the response's Retry-After if it has one, otherwise the backoff.
+        '''
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def is_connect_error(error: Exception):
+    '''
+    True when the connection failed before the request was sent, so even non-idempotent requests are safe to retry.
+    '''
+    if isinstance(error, exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), urllib3_exceptions.NewConnectionError)
+    return False
+
+
+def retry_after_seconds(response):
+    value = response.headers.get('Retry-After') if response.headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # HTTP-date form, rare enough to keep email.utils off the import path
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    '''
+    Caps the requests in flight and adapts the cap to throttling (additive increase, multiplicative decrease): \n
+    every 429 divides the cap by decrease, and every cap-sized run of successful requests raises it by one,
+    up to max_limit. This finds the highest concurrency the server sustains without being throttled. \n
+    limit = starting cap, min_limit/max_limit = bounds of the cap
+    '''
+    def __init__(self, limit: int = 8, min_limit: int = 1, max_limit: int = 64, decrease: float = 2.0):
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease = decrease
+        self.in_flight = 0
+        self.successes = 0
+        self.throttles = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False):
+        with self.condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttles += 1
+                self.successes = 0
+                self.limit = max(self.min_limit, int(self.limit / self.decrease))
+            else:
+                self.successes += 1
+                if self.successes >= self.limit and self.limit < self.max_limit:
+                    self.successes = 0
+                    self.limit += 1
+            self.condition.notify_all()
@@ -0,0 +1,270 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+from bild_metrics import DEFAULT_BUCKETS, Histogram
+
+
+# Priorities, the lowest number runs first. Any integer works, these are the names used in the metrics.
+URGENT, HIGH, NORMAL, LOW, BACKFILL = 0, 10, 20, 30, 40
+PRIORITY_NAMES = {URGENT: 'urgent', HIGH: 'high', NORMAL: 'normal', LOW: 'low', BACKFILL: 'backfill'}
+
+OUTCOMES = ('completed', 'failed', 'cancelled', 'expired')
+
+
+class Job(Future):
+    '''
+    A call queued on a Scheduler: a concurrent.futures.Future with its priority, deadline and tag. cancel() drops it
+    while it's still queued. A job still queued at its deadline is dropped and fails with TimeoutError.
+    '''
+    def __init__(self, priority: int, deadline: float = None, tag: str = None):
+        super().__init__()
+        self.priority = priority
+        self.deadline = deadline
+        self.tag = tag
+        self.submitted = time.monotonic()
+        self.started = None
+        self.queued = True
+
+
+class Scheduler:
+    '''
+    Runs Bild calls on a pool of worker threads in priority order, so urgent calls jump ahead of a queued backfill. \n
+    client = the Bild client every call goes through (its connection pool, retries and rate limits apply), bild.Bild or
+    the generated compiler.bild.Bild, which has the ECO endpoints \n
+    workers = calls running at once \n
+    buckets = upper bounds in seconds of the wait and run time histograms \n\n
+    submit() queues a call and returns its Job. Queued jobs run lowest priority number first (URGENT, HIGH, NORMAL,
+    LOW, BACKFILL or any integer), earliest deadline first within a priority, then in the order they were submitted.
+    A call already running isn't interrupted, so split long backfills into many small jobs (a page, a file, a project)
+    and urgent work never waits for more than one of them. \n
+    with Scheduler(compiler.bild.Bild(), workers=8) as scheduler: \n
+        history = scheduler.map("get_commits_of_project", project_ids, priority=BACKFILL, tag="history") \n
+        eco = scheduler.submit("get_details_of_eco", project_id, branch_id, file_id, eco_id, priority=URGENT, deadline=5) \n
+        scheduler.cancel(tag="history") \n
+    summary() and to_prometheus() report the queue depth, the time jobs waited in the queue and the time they ran,
+    per priority.
+    '''
+    def __init__(self, client, workers: int = 8, buckets: tuple = DEFAULT_BUCKETS):
+        self.client = client
+        self.workers = workers
+        self.buckets = tuple(sorted(buckets))
+        self.heap = []
+        self.deadlines = []
+        self.order = itertools.count()
+        self.depths = {}
+        self.peaks = {}
+        self.counters = {}
+        self.waits = {}
+        self.runs = {}
+        self.closed = False
+        self.condition = threading.Condition()
+        self.threads = [threading.Thread(target=self.work, name=f'BildScheduler-{index}', daemon=True) for index in range(workers)]
+        self.threads.append(threading.Thread(target=self.expire, name='BildScheduler-deadlines', daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, call, *args, priority: int = NORMAL, deadline: float = None, tag: str = None, **kwargs):
+        '''
+        Queues a call and returns its Job. \n
+        call = name of a Bild method ("get_all_users") or a function taking the client first \n
+        priority = URGENT, HIGH, NORMAL, LOW, BACKFILL or any integer, the lowest runs first \n
+        deadline = seconds from now the job must have started by, None waits as long as it takes \n
+        tag = label to cancel related jobs together with cancel(tag=...)
+        '''
+        function = getattr(self.client, call) if isinstance(call, str) else lambda *a, **k: call(self.client, *a, **k)
+        job = Job(priority, time.monotonic() + deadline if deadline is not None else None, tag)
+        job.add_done_callback(self.dropped)
+        with self.condition:
+            if self.closed:
+                raise Exception('Scheduler is closed')
+            order = next(self.order)
+            heapq.heappush(self.heap, (priority, job.deadline if job.deadline is not None else float('inf'), order, job, function, args, kwargs))
+            if job.deadline is not None:
+                heapq.heappush(self.deadlines, (job.deadline, order, job))
+            self.count(priority, 'submitted')
+            self.depths[priority] = self.depths.get(priority, 0) + 1
+            self.peaks[priority] = max(self.peaks.get(priority, 0), self.depths[priority])
+            self.condition.notify_all()
+        return job
+
+    def map(self, call, items, priority: int = NORMAL, deadline: float = None, tag: str = None):
+        '''
+        Submits call(item) for each item of the iterable and returns the jobs in the same order.
+        '''
+        return [self.submit(call, item, priority=priority, deadline=deadline, tag=tag) for item in items]
+
+    def cancel(self, tag: str = None, priority: int = None):
+        '''
+        Cancels the queued jobs with that tag and/or priority (every queued job when neither is given) and returns how
+        many were cancelled. Running jobs finish.
+        '''
+        with self.condition:
+            jobs = [entry[3] for entry in self.heap if entry[3].queued and (tag is None or entry[3].tag == tag)
+                    and (priority is None or entry[3].priority == priority)]
+        return sum(job.cancel() for job in jobs)
+
+    def dropped(self, job: Job):
+        '''
+        Done callback of every job: takes the ones cancelled while queued off the queue depth.
+        '''
+        if job.cancelled():
+            with self.condition:
+                if job.queued:
+                    job.queued = False
+                    self.depths[job.priority] -= 1
+                    self.count(job.priority, 'cancelled')
+
+    def count(self, priority: int, name: str):
+        self.counters[(priority, name)] = self.counters.get((priority, name), 0) + 1
+
+    def observe(self, histograms: dict, priority: int, seconds: float):
+        histogram = histograms.get(priority)
+        if histogram is None:
+            histogram = histograms[priority] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def next_job(self):
+        '''
+        Pops the most urgent job still queued. Called with the condition held.
+        '''
+        while self.heap:
+            priority, _, _, job, function, args, kwargs = heapq.heappop(self.heap)
+            if not job.queued:
+                continue
+            job.queued = False
+            job.started = time.monotonic()
+            self.depths[priority] -= 1
+            self.observe(self.waits, priority, job.started - job.submitted)
+            return job, function, args, kwargs
+        return None
+
+    def work(self):
+        while True:
+            with self.condition:
+                while True:
+                    task = self.next_job()
+                    if task is not None:
+                        break
+                    if self.closed:
+                        self.condition.notify_all()
+                        return
+                    self.condition.wait()
+            job, function, args, kwargs = task
+            if not job.set_running_or_notify_cancel():
+                with self.condition:
+                    self.count(job.priority, 'cancelled')
+                continue
+            try:
+                job.set_result(function(*args, **kwargs))
+                outcome = 'completed'
+            except BaseException as e:
+                job.set_exception(e)
+                outcome = 'failed'
+            with self.condition:
+                self.observe(self.runs, job.priority, time.monotonic() - job.started)
+                self.count(job.priority, outcome)
+
+    def expire(self):
+        '''
+        Fails the jobs still queued at their deadline, even while every worker is busy.
+        '''
+        while True:
+            expired = []
+            with self.condition:
+                now = time.monotonic()
+                while self.deadlines and (self.deadlines[0][0] <= now or not self.deadlines[0][2].queued):
+                    _, _, job = heapq.heappop(self.deadlines)
+                    if job.queued and job.set_running_or_notify_cancel():
+                        job.queued = False
+                        self.depths[job.priority] -= 1
+                        self.count(job.priority, 'expired')
+                        expired.append(job)
+                if not expired:
+                    if self.closed and not self.heap:
+                        return
+                    self.condition.wait(self.deadlines[0][0] - now if self.deadlines else None)
+            # Outside the lock, done callbacks may submit more jobs
+            for job in expired:
+                job.set_exception(TimeoutError(f'Job not started by its deadline, {now - job.submitted:.3f}s after it was submitted'))
+
+    def depth(self):
+        '''
+        {priority name: jobs queued}
+        '''
+        with self.condition:
+            return {PRIORITY_NAMES.get(priority, str(priority)): depth for priority, depth in sorted(self.depths.items())}
+
+    def summary(self):
+        '''
+        {priority name: {"queued", "peak_queued", "submitted", "completed", "failed", "cancelled", "expired",
+        "wait": {"count", "mean", "p50", "p95", "p99"}, "run": {...}}}, quantiles estimated from the buckets.
+        '''
+        result = {}
+        with self.condition:
+            for priority in sorted(self.depths):
+                entry = {'queued': self.depths[priority], 'peak_queued': self.peaks[priority]}
+                for name in ('submitted',) + OUTCOMES:
+                    entry[name] = self.counters.get((priority, name), 0)
+                for name, histograms in (('wait', self.waits), ('run', self.runs)):
+                    histogram = histograms.get(priority)
+                    entry[name] = None if histogram is None else {
+                        'count': histogram.count,
+                        'mean': histogram.sum / histogram.count,
+                        'p50': histogram.quantile(0.50),
+                        'p95': histogram.quantile(0.95),
+                        'p99': histogram.quantile(0.99),
+                    }
+                result[PRIORITY_NAMES.get(priority, str(priority))] = entry
+        return result
+
+    def to_prometheus(self):
+        '''
+        The queue depth, job counters and wait/run histograms in the Prometheus text exposition format, to serve next
+        to bild_metrics.Metrics.to_prometheus().
+        '''
+        lines = ['# HELP bild_scheduler_queue_depth Jobs waiting for a worker.', '# TYPE bild_scheduler_queue_depth gauge']
+        with self.condition:
+            priorities = sorted(self.depths)
+            for priority in priorities:
+                lines.append(f'bild_scheduler_queue_depth{{priority="{PRIORITY_NAMES.get(priority, priority)}"}} {self.depths[priority]}')
+            lines += ['# HELP bild_scheduler_jobs_total Jobs submitted and how they ended.', '# TYPE bild_scheduler_jobs_total counter']
+            for priority in priorities:
+                for name in ('submitted',) + OUTCOMES:
+                    value = self.counters.get((priority, name), 0)
+                    lines.append(f'bild_scheduler_jobs_total{{priority="{PRIORITY_NAMES.get(priority, priority)}",outcome="{name}"}} {value}')
+            for metric, description, histograms in (
+                    ('bild_scheduler_wait_seconds', 'Time jobs waited in the queue before starting.', self.waits),
+                    ('bild_scheduler_run_seconds', 'Time jobs ran.', self.runs)):
+                lines += [f'# HELP {metric} {description}', f'# TYPE {metric} histogram']
+                for priority, histogram in sorted(histograms.items()):
+                    labels = f'priority="{PRIORITY_NAMES.get(priority, priority)}"'
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def close(self, wait: bool = True, cancel: bool = False):
+        '''
+        Stops accepting jobs, once the queued ones are done. \n
+        cancel = cancel the jobs still queued instead of running them
+        '''
+        if cancel:
+            self.cancel()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
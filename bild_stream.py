@@ -0,0 +1,97 @@
+import codecs
+import json
+
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = WHITESPACE + ',:]}'
+
+
+class JSONArrayStream:
+    '''
+    Incrementally parses a {"data": [...], ...} response body as it comes off the socket, yielding each item of the
+    data array as soon as it is complete. Only the item being parsed and one chunk are held in memory, whatever the
+    size of the response. \n
+    chunks = iterable of bytes (e.g. response.iter_content(65536)) \n
+    key = name of the top-level array to stream \n
+    The other top-level fields (message, lastEvaluatedKey, ...) are collected in extras once iteration is done.
+    '''
+    def __init__(self, chunks, key: str = 'data'):
+        self.chunks = iter(chunks)
+        self.key = key
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.extras = {}
+
+    def read(self):
+        '''
+        Appends the next chunk to the buffer, dropping what has already been parsed. Returns False at the end of the body.
+        '''
+        if self.eof:
+            return False
+        try:
+            chunk = next(self.chunks)
+            self.buffer = self.buffer[self.pos:] + self.text.decode(chunk)
+        except StopIteration:
+            self.eof = True
+            self.buffer = self.buffer[self.pos:] + self.text.decode(b'', final=True)
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.read():
+                return
+
+    def expect(self, characters: str):
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer) or self.buffer[self.pos] not in characters:
+            found = self.buffer[self.pos:self.pos + 20] or 'end of body'
+            raise ValueError(f'Malformed JSON response: expected one of {characters!r}, found {found!r}')
+        self.pos += 1
+        return self.buffer[self.pos - 1]
+
+    def value(self):
+        '''
+        Decodes the next complete JSON value, reading more chunks until it is whole. A value is only accepted once the
+        delimiter after it has arrived, so a number split across chunks (3|.25) isn't cut short.
+        '''
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if (end < len(self.buffer) and self.buffer[end] in DELIMITERS) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read()
+
+    def __iter__(self):
+        self.expect('{')
+        self.skip_whitespace()
+        if self.buffer[self.pos:self.pos + 1] == '}':
+            return
+        while True:
+            name = self.value()
+            self.expect(':')
+            self.skip_whitespace()
+            if name == self.key and self.buffer[self.pos:self.pos + 1] == '[':
+                self.pos += 1
+                self.skip_whitespace()
+                if self.buffer[self.pos:self.pos + 1] == ']':
+                    self.pos += 1
+                else:
+                    while True:
+                        yield self.value()
+                        if self.expect(',]') == ']':
+                            break
+            else:
+                self.extras[name] = self.value()
+            if self.expect(',}') == '}':
+                return
@@ -0,0 +1,138 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bild_bulk import flatten_files
+from bild_mirror import first, default_branch
+
+
+class BildSync:
+    '''
+    Incremental sync of a Bild account into a local bild_mirror.BildMirror. \n
+    The first run lists every file of every project's default branch. Later runs only fetch what changed since the
+    previous one, using two change feeds whose high-water marks are kept in the mirror:
+    files released after the last run (files/released) and commits newer than the last one seen in each project.
+    Users and project access are reloaded on every run, they only cost one call. \n
+    workers = changed files refreshed in parallel \n
+    metadata = also mirror the complete metadata of every changed file \n
+    Files that fail to refresh are retried on the next run, so a failed call never loses a change.
+    '''
+    def __init__(self, client, mirror, workers: int = 8, metadata: bool = True):
+        self.client = client.raw()
+        self.mirror = mirror
+        self.workers = workers
+        self.metadata = metadata
+
+    def run(self):
+        '''
+        Brings the mirror up to date and returns a report of what was touched.
+        '''
+        started = int(time.time() * 1000)
+        report = {'full': False, 'projects': 0, 'users': 0, 'commits': 0, 'released': 0, 'files': 0, 'failed': []}
+        report['users'] = self.mirror.load_users(self.client)
+        projects = self.client.get_all_projects()['data']
+        with self.mirror:
+            for project in projects:
+                self.mirror.upsert_project(project)
+        report['projects'] = len(projects)
+
+        released_after = self.mirror.get_state('released_after')
+        changed = {tuple(key) for key in self.mirror.get_state('pending', [])}
+        if released_after is None:
+            report['full'] = True
+            changed |= self.list_all_files(projects)
+        else:
+            changed |= self.released_since(released_after, report)
+        committed, marks = self.committed_since(projects, report, initial=released_after is None)
+        changed |= committed
+
+        # The commit marks only move in the same transaction as pending: a run failing after walking some projects
+        # leaves them where they were, so the next run walks those commits again
+        failed = self.refresh(changed, report)
+        with self.mirror:
+            self.mirror.set_state('released_after', started)
+            self.mirror.set_state('pending', [list(key) for key in failed])
+            for project_id, newest in marks.items():
+                self.mirror.set_state(f'commit:{project_id}', newest)
+        report['failed'] = sorted(failed)
+        return report
+
+    def list_all_files(self, projects: list):
+        changed = set()
+        for project in projects:
+            project_id = first(project, 'id', 'projectID')
+            branch_id = default_branch(project)
+            files = self.client.get_all_files(project_id)['data']
+            with self.mirror:
+                for file in flatten_files(files):
+                    self.mirror.upsert_file(project_id, branch_id, file)
+                    changed.add((project_id, branch_id, first(file, 'fileID', 'id')))
+        return changed
+
+    def released_since(self, after: int, report: dict):
+        changed = set()
+        released = self.client.get_released_files_after_time(after)['data']
+        report['released'] = len(released)
+        for file in released:
+            changed.add((first(file, 'projectID', 'projectId'), first(file, 'branchID', 'branchId'), first(file, 'fileID', 'id')))
+        return changed
+
+    def committed_since(self, projects: list, report: dict, initial: bool = False):
+        '''
+        Walks each project's commits newest first, stopping at the newest commit seen by the previous run.
+        On the first run, and for a project created since, only the high-water mark is recorded: listing the project's
+        files already covers every commit. A project without commits gets an empty mark, so it isn't listed again.
+        Returns the changed files and {project_id: newest commit}, the marks run() saves once the files are refreshed.
+        '''
+        changed, marks = set(), {}
+        for project in projects:
+            project_id = first(project, 'id', 'projectID')
+            seen = self.mirror.get_state(f'commit:{project_id}')
+            listed = initial or seen is None
+            if listed and not initial:
+                changed |= self.list_all_files([project])
+            newest = ''
+            for commit in self.client.iter_commits_of_project(project_id, page_size=1 if listed else 100):
+                commit_id = first(commit, 'id', 'commitID')
+                if not newest:
+                    newest = commit_id
+                if listed or commit_id == seen:
+                    break
+                report['commits'] += 1
+                branch_id = first(commit, 'branchID', 'branchId')
+                details = self.client.get_commit_details(project_id, branch_id, commit_id)['data']
+                for file in details.get('files', []):
+                    changed.add((project_id, branch_id, first(file, 'fileID', 'id')))
+            marks[project_id] = newest or seen or ''
+        return changed, marks
+
+    def fetch(self, key: tuple):
+        project_id, branch_id, file_id = key
+        version = self.client.get_latest_file_version(project_id, branch_id, file_id)['data']
+        metadata = self.client.get_metadata_from_file(project_id, branch_id, file_id) if self.metadata else None
+        return version, metadata
+
+    def refresh(self, changed: set, report: dict):
+        '''
+        Fetches the latest version (and metadata) of every changed file in parallel and writes them to the mirror.
+        Returns the files that failed.
+        '''
+        failed = set()
+        changed = sorted(key for key in changed if all(key))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [(key, executor.submit(self.fetch, key)) for key in changed]
+            for key, future in futures:
+                try:
+                    version, metadata = future.result()
+                except Exception:
+                    failed.add(key)
+                    continue
+                project_id, branch_id, file_id = key
+                with self.mirror:
+                    latest = first(version, 'fileVersionID', 'versionID', 'id')
+                    self.mirror.upsert_file(project_id, branch_id, dict(version, fileID=file_id, latestVersionID=latest))
+                    self.mirror.upsert_version(project_id, branch_id, file_id, version)
+                    if metadata is not None:
+                        self.mirror.upsert_metadata(project_id, branch_id, file_id, metadata)
+                report['files'] += 1
+        return failed
+
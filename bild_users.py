@@ -0,0 +1,140 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+
+def grants_of(projects):
+    '''
+    Reads project grants given as {project_id: access} or as [{"id": ..., "projectAccess"/"accessType": ...}].
+    '''
+    if isinstance(projects, dict):
+        return dict(projects)
+    return {project['id']: project.get('projectAccess') or project.get('accessType') for project in projects or []}
+
+
+def normalize(user):
+    '''
+    Reads a user to provision given as {"email", "role", "projects"} or as an (email, role, projects) tuple. The role
+    is None when not given.
+    '''
+    if isinstance(user, dict):
+        email, role, projects = user['email'], user.get('role'), user.get('projects')
+    else:
+        email, role, projects = (tuple(user) + (None, None))[:3]
+    return email.strip(), role or None, grants_of(projects)
+
+
+class UserProvisioning:
+    '''
+    Adds many users with different roles and project grants in as few PUT /users/add calls as possible. \n
+    users = list of {"email", "role", "projects"} dicts or (email, role, projects) tuples, projects being
+    {project_id: access} or [{"id", "projectAccess"}] \n
+    Users sharing a role and grants go in the same request, split to at most chunk_size emails and max_bytes of
+    JSON per request, and requests are sent workers at a time. New users without a role are added as Members. \n
+    skip_existing = compare with get_all_users first: users already holding every grant are skipped, and existing
+    users missing some are only sent those. The API can't change the role of an existing user, so an existing user
+    asked for another role is reported as a conflict and nothing is sent for them. \n
+    Call plan() to see the requests without sending anything, or run() to send them and get the report:
+    {"added": n, "updated": n, "skipped": n, "conflict": n, "failed": n, "requests": n,
+    "users": {email: {"outcome", "error"}}}
+    '''
+    def __init__(self, client, users: list, workers: int = 4, chunk_size: int = 100, max_bytes: int = 64 * 1024,
+                 skip_existing: bool = True):
+        self.client = client.raw()
+        self.users = users
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.skip_existing = skip_existing
+        self.report = {'added': 0, 'updated': 0, 'skipped': 0, 'conflict': 0, 'failed': 0, 'requests': 0, 'users': {}}
+
+    def outcome(self, email: str, outcome: str, error: str = None):
+        self.report[outcome] += 1
+        self.report['users'][email] = {'outcome': outcome, 'error': error}
+
+    def wanted(self, settled: dict):
+        '''
+        Merges the users by email (case-insensitive) into {email: (email, role, grants)}. Users listed again with
+        another role or access are settled as failed.
+        '''
+        wanted, conflicts = {}, set()
+        for user in self.users:
+            email, role, grants = normalize(user)
+            key = email.lower()
+            if key in wanted:
+                first_email, first_role, first_grants = wanted[key]
+                clashing = [project for project in grants if first_grants.get(project, grants[project]) != grants[project]]
+                if (role and first_role and role != first_role) or clashing:
+                    conflicts.add(key)
+                grants = dict(first_grants, **grants)
+                email, role = first_email, first_role or role
+            wanted[key] = (email, role, grants)
+        for key in conflicts:
+            settled[wanted.pop(key)[0]] = ('failed', 'Listed more than once with different roles or project access')
+        return wanted
+
+    def existing(self):
+        '''
+        {email: (role, grants)} of the users already in the account.
+        '''
+        users = self.client.get_all_users()['data']
+        return {str(user.get('email', '')).lower(): (user.get('role'), grants_of(user.get('projects'))) for user in users}
+
+    def plan(self):
+        '''
+        Returns (requests, settled): the requests run() would send, each a ({"emails", "role", "projects"} payload,
+        [(email, "added" or "updated"), ...]) pair, and {email: (outcome, error)} for the users sent nothing.
+        '''
+        existing = self.existing() if self.skip_existing else {}
+        groups, settled = {}, {}
+        for key, (email, role, grants) in self.wanted(settled).items():
+            if key in existing:
+                current_role, current_grants = existing[key]
+                if role and current_role and role.lower() != current_role.lower():
+                    settled[email] = ('conflict', f'Already in the account as {current_role}, the API has no endpoint '
+                                                  f'to change the role of an existing user')
+                    continue
+                role = current_role or role
+                grants = {project: access for project, access in grants.items() if current_grants.get(project) != access}
+                if not grants:
+                    settled[email] = ('skipped', None)
+                    continue
+            role = role or 'Member'
+            outcome = 'updated' if key in existing else 'added'
+            group = (role, tuple(sorted(grants.items())))
+            groups.setdefault(group, []).append((email, outcome))
+
+        requests = []
+        for (role, grants), members in groups.items():
+            projects = [{"id": project, "projectAccess": access} for project, access in grants]
+            empty = len(json.dumps({"emails": [], "role": role, "projects": projects}))
+            chunk, size = [], empty
+            for email, outcome in members:
+                # Each email adds its quoted JSON string and a separating comma
+                cost = len(json.dumps(email)) + 2
+                if chunk and (len(chunk) >= self.chunk_size or size + cost > self.max_bytes):
+                    requests.append(({"emails": [member for member, _ in chunk], "role": role, "projects": projects}, chunk))
+                    chunk, size = [], empty
+                chunk.append((email, outcome))
+                size += cost
+            if chunk:
+                requests.append(({"emails": [member for member, _ in chunk], "role": role, "projects": projects}, chunk))
+        return requests, settled
+
+    def send(self, request: tuple):
+        payload, members = request
+        try:
+            self.client.add_users_to_bild(payload['emails'], payload['role'], payload['projects'])
+            return members, None
+        except Exception as e:
+            return members, str(e)
+
+    def run(self):
+        requests, settled = self.plan()
+        for email, (outcome, error) in settled.items():
+            self.outcome(email, outcome, error)
+        self.report['requests'] = len(requests)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for members, error in executor.map(self.send, requests):
+                for email, outcome in members:
+                    self.outcome(email, 'failed' if error else outcome, error)
+        return self.report
@@ -1,18 +1,36 @@
-
 import os
 import requests
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from requests import exceptions
+from requests.adapters import HTTPAdapter
+from bild_retry import RetryPolicy
+
+
+def query(params: dict, values: dict):
+    '''
+    Merges the typed query parameters that were given into params.
+    '''
+    values = {key: value for key, value in values.items() if value is not None}
+    return dict(params or {}, **values) if values else params
 
 
 class Bild:
     '''
     ## Bild API client
 
-    Either set 'BILD_API_KEY' in environment variables or pass a token to the constructor: 
+    Either set 'BILD_API_KEY' in environment variables or pass a token to the constructor:
     token = <your_token>
+
+    Throttling and transient failures are handled on every request: \n
+    retry = bild_retry.RetryPolicy deciding what is retried and the backoff (RetryPolicy(max_retries=0) disables it) \n
+    rate_limiter = bild_retry.TokenBucket capping requests per second \n
+    adaptive = bild_retry.AdaptiveLimiter capping requests in flight, lowered automatically when the server throttles
     '''
-    def __init__(self, token: str = 'env'):
+    def __init__(self, token: str = 'env', pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 keep_alive: bool = True, timeout: float = None, baseurl: str = 'https://api.getbild.com',
+                 retry: RetryPolicy = None, rate_limiter = None, adaptive = None):
 
         # Error messages
         self.auth_error = 'Authentication failed. Ensure you have a valid API key, that you have the correct permissions, and that you have passed it to the constructor.'
@@ -26,34 +44,68 @@ class Bild:
             self.token = token
         if self.token is None:
             raise Exception(self.token_error)
-        else:   
+        else:
             self.headers = {"Authorization": f"Bearer {self.token}"}
-        
-        self.baseurl = 'https://api.getbild.com'
+
+        self.baseurl = baseurl
         self.content_type = 'application/json;charset=UTF-8'
-        self.branch = ''
+        self.timeout = timeout
         self.project = ''
-        self.fileVersion = ''
-        self.file = ''
+        self.branch = ''
         self.commit = ''
+        self.file = ''
+        self.fileVersion = ''
+        self.feedbackItem = ''
+        self.package = ''
         self.eco = ''
         self.approval = ''
 
-    def set_branch(self, branch_id: str):
-        self.branch = branch_id
+        # Pooled transport shared by every method
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        # Throttling and retries
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.adaptive = adaptive
+
+    def close(self):
+        '''
+        Closes the pooled session and every connection it holds open.
+        '''
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def set_project(self, project_id: str):
         self.project = project_id
 
-    def set_file_version(self, file_version_id: str):
-        self.fileVersion = file_version_id
+    def set_branch(self, branch_id: str):
+        self.branch = branch_id
 
-    def set_file(self, file_id: str):
-        self.file = file_id
-    
     def set_commit(self, commit_id: str):
         self.commit = commit_id
 
+    def set_file(self, file_id: str):
+        self.file = file_id
+
+    def set_file_version(self, file_version_id: str):
+        self.fileVersion = file_version_id
+
+    def set_feedback_item(self, feedback_item_id: str):
+        self.feedbackItem = feedback_item_id
+
+    def set_package(self, package_id: str):
+        self.package = package_id
+
     def set_eco(self, eco_id: str):
         self.eco = eco_id
 
@@ -66,390 +118,426 @@ class Bild:
         '''
         if type(response) == str:
             raise Exception(response)
-        else:
-            return response.json()
-
-    def get_all_users_in_bild_account(self):
+        if not response.ok:
+            if response.status_code in (401, 403):
+                raise Exception(self.auth_error)
+            if response.status_code == 404:
+                raise Exception(self.path_error)
+            raise Exception(f'Bild API error {response.status_code}: {response.text}')
+        return response.json()
+
+    def request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Sends a request to the Bild API through the pooled session and returns the checked response. Each attempt waits
+        for the rate limiters, and failed attempts are retried as the retry policy decides.
+        '''
+        attempt = 0
+        while True:
+            response, error = None, None
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.adaptive is not None:
+                self.adaptive.acquire()
+            try:
+                response = self.session.request(method, f"{self.baseurl}{suffix}", headers=self.headers, params=params, json=data, timeout=self.timeout)
+            except (exceptions.ConnectionError, exceptions.Timeout) as e:
+                error = e
+            finally:
+                if self.adaptive is not None:
+                    self.adaptive.release(throttled=response is not None and response.status_code == 429)
+            if not self.retry.should_retry(method, attempt, response, error):
+                break
+            if response is not None:
+                response.close()
+            time.sleep(self.retry.delay(attempt, response))
+            attempt += 1
+        if error is not None:
+            raise error
+        return self.check_response(response)
+
+    def page_items(self, page: dict):
+        '''
+        Splits a page of a paginated endpoint into its items and the lastEvaluatedKey of the next page (None on the last page).
+        '''
+        key = page.get('lastEvaluatedKey')
+        if isinstance(key, dict):
+            key = json.dumps(key)
+        return page.get('data') or [], key or None
+
+    def paginate(self, suffix: str, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Lazily streams the items of a pageSize/lastEvaluatedKey endpoint, one page at a time, optionally fetching the next page in the background.
+        '''
+        params = dict(params or {}, pageSize=page_size)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = self.request('GET', suffix, params=params)
+            while True:
+                items, key = self.page_items(page)
+                if key is not None:
+                    next_params = dict(params, lastEvaluatedKey=key)
+                    upcoming = executor.submit(self.request, 'GET', suffix, next_params) if executor else None
+                yield from items
+                if key is None:
+                    return
+                page = upcoming.result() if upcoming else self.request('GET', suffix, params=next_params)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_all_users_in_bild_account(self, params: dict = None):
         '''
         This endpoint returns the list of all user accounts in your Bild account, along with their IDs, names, emails, roles, and the projects they have access to.
         '''
+        suffix = f'/users'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'users'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_projects_in_bild_account(self):
+    def get_all_projects_in_bild_account(self, params: dict = None):
         '''
         This endpoint returns all projects that the user has access to. If the user is an admin or has access to all projects in your Bild account, it returns them all. Each item contains the project's ID, name, users who are part of the project along with their IDs, names, and access types, as well as the default branch of the project.
         '''
+        suffix = f'/projects'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_users_in_project(self, projectID: str):
+    def get_all_users_in_project(self, projectID: str = None, params: dict = None):
         '''
         This endpoint returns all users who are part of the project. Each item contains the user's ID, name, email, and access type.
         '''
+        suffix = f'/projects/{projectID or self.project}/users'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/users'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_branches_of_project(self, projectID: str):
+    def get_all_branches_of_project(self, projectID: str = None, params: dict = None):
         '''
         This endpoint returns all branches of the given project, including their IDs and names.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_commits_of_project(self, projectID: str):
+    def get_commits_of_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all commits of the project, providing a history of all file update activities across branches with pagination. For the first page, provide the pageSize parameter in the query parameters. For subsequent pages, provide the lastEvaluatedKey received as a response from the previous call.
         '''
+        suffix = f'/projects/{projectID or self.project}/commits'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/commits'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_commits_of_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_commits_of_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/commits'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_commits_of_branch(self, projectID: str, branchID: str):
+    def get_commits_of_branch(self, projectID: str = None, branchID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all commits of the branch, providing a history of all file update activities within the branch with pagination. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/commits'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/commits'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_commits_of_branch(self, projectID: str = None, branchID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_commits_of_branch, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/commits'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_commit_details(self, projectID: str, branchID: str, commitID: str):
+    def get_commit_details(self, projectID: str = None, branchID: str = None, commitID: str = None, params: dict = None):
         '''
         This endpoint returns details of the commit for the given commitID, along with all the files involved in that commit. Each file will include its ID, name, part number, and revision number at the time of the commit.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/commits/{commitID or self.commit}'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/commits/{commitID}'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_released_files_after_time(self):
+    def get_released_files_after_time(self, params: dict = None):
         '''
         This endpoint returns all files that were released after the given time. If a file is released multiple times, it will only return the latest instance for that file. The time is expected in Unix timestamp (Epoch), including milliseconds.
         '''
+        suffix = f'/files/released'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'files/released'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_files_default_branch(self, projectID: str):
+    def get_all_files_default_branch(self, projectID: str = None, params: dict = None):
         '''
         This endpoint returns all the latest versions of files from the project's default branch. Each entry will include fields such as name, id, type, path, latestVersionID etc. Response can be a flat list of files or a file-folder tree structure. By default, it'll be a file-folder tree structure.
         '''
+        suffix = f'/projects/{projectID or self.project}/files'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/files'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_files_for_branch(self, projectID: str, branchID: str):
+    def get_all_files_for_branch(self, projectID: str = None, branchID: str = None, params: dict = None):
         '''
         This endpoint returns all the latest versions of files for the given branch ID. Each entry will include fields such as name, fileID, path, and latestVersionID. Response can be queried as a flat list of files or a file-folder tree structure. By default, it'll be a file-folder tree structure.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_versions_of_file(self, projectID: str, branchID: str, fileID: str):
+    def get_all_versions_of_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
         '''
         This endpoint returns all file versions for the given fileID. Each version entry will contain basic file details such as name, id, and path, along with metadata. Please note that, metadata will be just "File Properties" data. For more detailed metadata, use /projects/{projectID}/branches/{branchID}/files/{fileID}/metadata and other metadata APIs.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/versions'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/versions'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_latest_version_of_file(self, projectID: str, branchID: str, fileID: str):
+    def get_latest_version_of_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
         '''
         This endpoint retrieves details of the latest file version.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/latest'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/latest'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_latest_released_version_of_file(self, projectID: str, branchID: str, fileID: str):
+    def get_latest_released_version_of_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
         '''
         This endpoint retrieves details of the latest released file.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/released'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/released'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_file_version(self, projectID: str, branchID: str, fileID: str, fileVersionID: str):
+    def get_file_version(self, projectID: str = None, branchID: str = None, fileID: str = None, fileVersionID: str = None, params: dict = None):
         '''
         This endpoint retrieves file version details for the given fileVersionID.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/versions/{fileVersionID or self.fileVersion}'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/versions/{fileVersionID}'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_public_shared_files_links_bild_account(self):
+    def get_public_shared_files_links_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all public shared file links in your Bild account in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. The shared link contains details such as name, type, and the public URL.
         '''
+        suffix = f'/sharedLinks'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'sharedLinks'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_public_shared_files_links_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_public_shared_files_links_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/sharedLinks'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_public_shared_files_links(self, projectID: str):
+    def get_public_shared_files_links(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all public shared file links in your project in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. The shared link contains details such as name, type, and the public URL.
         '''
+        suffix = f'/projects/{projectID or self.project}/sharedLinks'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/sharedLinks'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_public_shared_files_links(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_public_shared_files_links, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/sharedLinks'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_public_shared_files_links_in_branch(self, projectID: str, branchID: str):
+    def get_public_shared_files_links_in_branch(self, projectID: str = None, branchID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all public shared file links in your branch in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. The shared link contains details such as name, type, and the public URL.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/sharedLinks'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/sharedLinks'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_public_shared_files_links_in_branch(self, projectID: str = None, branchID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_public_shared_files_links_in_branch, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/sharedLinks'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_all_custom_metadata_fields(self):
+    def get_all_custom_metadata_fields(self, params: dict = None):
         '''
         This endpoint returns all metadata fields, including Bild's default fields and custom fields created by users.
         '''
+        suffix = f'/metadataFields'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'metadataFields'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_complete_metadata_for_file(self, projectID: str, branchID: str, fileID: str):
+    def get_complete_metadata_for_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
         '''
         This endpoint returns metadata details for the file version associated with the given fileID. Metadata includes all fields and values across all available configs/profiles. By default, users will get metadata for the latest versions of the file.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/metadata'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/metadata'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_complete_metadata_for_file_version(self, projectID: str, branchID: str, fileID: str, fileVersionID: str):
+    def get_complete_metadata_for_file_version(self, projectID: str = None, branchID: str = None, fileID: str = None, fileVersionID: str = None, params: dict = None):
         '''
         This endpoint returns metadata details for the fileVersionID. Metadata includes all fields and values across all available configs/profiles.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/versions/{fileVersionID or self.fileVersion}/metadata'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/versions/{fileVersionID}/metadata'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_feedback_items_in_project(self, projectID: str):
+    def get_feedback_items_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all feedback items in the project with pagination. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each feedback item contains details such as title, description, status, due date, tags, assignees, comments, attachments, etc.
         '''
+        suffix = f'/projects/{projectID or self.project}/feedbackItems'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/feedbackItems'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_feedback_items_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_feedback_items_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/feedbackItems'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_feedback_items_for_file(self, projectID: str, branchID: str, fileID: str):
+    def get_feedback_items_for_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
         '''
         This endpoint returns all feedback items for a file. Each feedback item contains details such as title, description, status, due date, tags, assignees, comments, attachments, etc.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/feedbackItems'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/feedbackItems'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_feedback_item_details_by_id(self, projectID: str):
+    def get_feedback_item_details_by_id(self, projectID: str = None, feedbackItemID: str = None, params: dict = None):
         '''
         This endpoint returns feedback item details for the given feedback item ID. Each feedback item contains details such as title, description, status, due date, tags, assignees, comments, attachments, etc.
         '''
+        suffix = f'/projects/{projectID or self.project}/feedbackItems/{feedbackItemID or self.feedbackItem}'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/feedbackItems/{feedbackItemID}'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_packages_from_bild_account(self):
+    def get_packages_from_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all packages in your Bild account. The results are paginated. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each package contains basic details such as name, creator name, created date, number of files, etc.
         '''
+        suffix = f'/packages'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'packages'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_packages_from_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_packages_from_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/packages'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_packages_in_project(self, projectID: str):
+    def get_packages_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all packages in the project in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each package contains basic details such as name, creator name, created date, number of files, etc.
         '''
+        suffix = f'/projects/{projectID or self.project}/packages'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/packages'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_packages_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_packages_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/packages'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_detailed_package_info_by_id(self, projectID: str):
+    def get_detailed_package_info_by_id(self, projectID: str = None, packageID: str = None, params: dict = None):
         '''
         This endpoint retrieves details of all package information, including all files in the package. Each package contains details such as name, creator name, created date, a list of files, and a download URL for the package.
         '''
+        suffix = f'/projects/{projectID or self.project}/packages/{packageID or self.package}'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/packages/{packageID}'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_ecos_in_bild_account(self):
+    def get_ecos_in_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all Engineering Change Orders (ECOs) in your company's Bild account. The API supports paginated queries of ECOs. Users can pass pageSize and lastEvaluatedKey. PageSize determines the number of records per page, while lastEvaluatedKey serves as an offset key similar to database pagination. In the first API call, you'll receive the lastEvaluatedKey, which can be used in the next API call.
         '''
+        suffix = f'/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'ecos'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_ecos_in_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_in_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_ecos_in_project(self, projectID: str):
+    def get_ecos_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all Engineering Change Orders (ECOs) in the given project. Similar to the above, the API supports pagination with pageSize and lastEvaluatedKey, along with filtering the responses based on the status of the ECO.
         '''
+        suffix = f'/projects/{projectID or self.project}/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/ecos'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_ecos_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_ecos_of_branch_project(self, projectID: str, branchID: str):
+    def get_ecos_of_branch_project(self, projectID: str = None, branchID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all Engineering Change Orders (ECOs) in the given branch of the project. Similar to the above, the API supports pagination with pageSize and lastEvaluatedKey, along with filtering the responses based on the status of the ECO.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/ecos'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_ecos_of_branch_project(self, projectID: str = None, branchID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_of_branch_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_ecos_of_file_in_branch(self, projectID: str, branchID: str, fileID: str):
+    def get_ecos_of_file_in_branch(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all Engineering Change Orders (ECOs) in the given file of the branch in the project. Similar to the above, the API supports pagination with pageSize and lastEvaluatedKey, along with filtering the responses based on the status of the ECO.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/ecos'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_ecos_of_file_in_branch(self, projectID: str = None, branchID: str = None, fileID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_of_file_in_branch, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_details_of_eco(self, projectID: str, branchID: str, fileID: str, ecoID: str):
+    def get_details_of_eco(self, projectID: str = None, branchID: str = None, fileID: str = None, ecoID: str = None, params: dict = None):
         '''
         This endpoint returns details of an Engineering Change Order (ECO), along with all the file versions involved in that ECO. It also provides the list of all approvals that are part of that ECO.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/ecos/{ecoID or self.eco}'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/ecos/{ecoID}'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_all_part_files_and_sub_assemblies(self, projectID: str, branchID: str, fileID: str):
+    def get_all_part_files_and_sub_assemblies(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
         '''
         This endpoint returns a list of all part files and sub-assemblies of an assembly file. It provides the full closure of the file, i.e., the list of all part files and sub-assemblies of an assembly file. These closures are configuration-specific. This endpoint is useful for obtaining the full closure of the file when the user intends to release/cancel the ECO for assembly file along with all its part files and sub-assemblies.
         '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/closure'
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/branches/{branchID}/files/{fileID}/closure'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
-
-    def get_approval_requests_bild_account(self):
+    def get_approval_requests_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all approval requests in your Bild account. By default, it returns the active approvals, i.e. Approvals those are PENDING in status. Pagination is supported using pageSize and lastEvaluatedKey, similar to the above APIs.
         '''
+        suffix = f'/approvals'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'approvals'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_approval_requests_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_approval_requests_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/approvals'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_approval_requests_in_project(self, projectID: str):
+    def get_approval_requests_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
         '''
         This endpoint returns all approval requests in the project in paginated format. By default, it returns the active approvals, i.e. Approvals those are PENDING in status. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each approval request contains basic details such as name, creator name, created date, file name, etc., along with the list of active reviewers.
         '''
+        suffix = f'/projects/{projectID or self.project}/approvals'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return self.request('GET', suffix, params=params)
 
-        suffix = 'projects/{projectID}/approvals'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
+    def iter_approval_requests_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_approval_requests_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/approvals'
+        return self.paginate(suffix, page_size, prefetch, params)
 
-    def get_details_of_approval_request(self, projectID: str, approvalID: str):
+    def get_details_of_approval_request(self, projectID: str = None, approvalID: str = None, params: dict = None):
         '''
         This endpoint returns details of an approval request along with active reviewers.
         '''
-
-        suffix = 'projects/{projectID}/approvals/{approvalID}'
-        url = f'self.baseurl/{suffix}'
-        response = requests.request('GET', url, headers=self.headers)
-        return self.check_response(response)
-    
\ No newline at end of file
+        suffix = f'/projects/{projectID or self.project}/approvals/{approvalID or self.approval}'
+        return self.request('GET', suffix, params=params)
@@ -0,0 +1,403 @@
+import asyncio
+
+from compiler.bild import Bild, query
+
+
+class AsyncBild(Bild):
+    '''
+    ## Async Bild API client
+
+    The endpoints of compiler/bild.py as coroutines, and their iter_ methods as async generators:
+    users = await bild.get_all_users_in_bild_account() \n
+    Requests run in worker threads on the pooled session. bild_async.AsyncBild builds on this class with concurrency
+    limits and request coalescing.
+    '''
+    async def request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Sends a request in a worker thread and returns the checked response.
+        '''
+        return await asyncio.to_thread(Bild.request, self, method, suffix, params, data)
+
+    async def paginate(self, suffix: str, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Async counterpart of Bild.paginate: an async generator streaming the items of a paginated endpoint, so every iter_*
+        method can be consumed with async for. With prefetch, the next page is requested while the current one is consumed.
+        '''
+        params = dict(params or {}, pageSize=page_size)
+        upcoming = None
+        try:
+            page = await self.request('GET', suffix, params=params)
+            while True:
+                items, key = self.page_items(page)
+                if key is not None:
+                    next_params = dict(params, lastEvaluatedKey=key)
+                    if prefetch:
+                        upcoming = asyncio.ensure_future(self.request('GET', suffix, params=next_params))
+                for item in items:
+                    yield item
+                if key is None:
+                    return
+                if upcoming:
+                    page, upcoming = await upcoming, None
+                else:
+                    page = await self.request('GET', suffix, params=next_params)
+        finally:
+            if upcoming:
+                upcoming.cancel()
+
+    async def get_all_users_in_bild_account(self, params: dict = None):
+        '''
+        This endpoint returns the list of all user accounts in your Bild account, along with their IDs, names, emails, roles, and the projects they have access to.
+        '''
+        suffix = f'/users'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_projects_in_bild_account(self, params: dict = None):
+        '''
+        This endpoint returns all projects that the user has access to. If the user is an admin or has access to all projects in your Bild account, it returns them all. Each item contains the project's ID, name, users who are part of the project along with their IDs, names, and access types, as well as the default branch of the project.
+        '''
+        suffix = f'/projects'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_users_in_project(self, projectID: str = None, params: dict = None):
+        '''
+        This endpoint returns all users who are part of the project. Each item contains the user's ID, name, email, and access type.
+        '''
+        suffix = f'/projects/{projectID or self.project}/users'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_branches_of_project(self, projectID: str = None, params: dict = None):
+        '''
+        This endpoint returns all branches of the given project, including their IDs and names.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_commits_of_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all commits of the project, providing a history of all file update activities across branches with pagination. For the first page, provide the pageSize parameter in the query parameters. For subsequent pages, provide the lastEvaluatedKey received as a response from the previous call.
+        '''
+        suffix = f'/projects/{projectID or self.project}/commits'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_commits_of_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_commits_of_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/commits'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_commits_of_branch(self, projectID: str = None, branchID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all commits of the branch, providing a history of all file update activities within the branch with pagination. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/commits'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_commits_of_branch(self, projectID: str = None, branchID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_commits_of_branch, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/commits'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_commit_details(self, projectID: str = None, branchID: str = None, commitID: str = None, params: dict = None):
+        '''
+        This endpoint returns details of the commit for the given commitID, along with all the files involved in that commit. Each file will include its ID, name, part number, and revision number at the time of the commit.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/commits/{commitID or self.commit}'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_released_files_after_time(self, params: dict = None):
+        '''
+        This endpoint returns all files that were released after the given time. If a file is released multiple times, it will only return the latest instance for that file. The time is expected in Unix timestamp (Epoch), including milliseconds.
+        '''
+        suffix = f'/files/released'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_files_default_branch(self, projectID: str = None, params: dict = None):
+        '''
+        This endpoint returns all the latest versions of files from the project's default branch. Each entry will include fields such as name, id, type, path, latestVersionID etc. Response can be a flat list of files or a file-folder tree structure. By default, it'll be a file-folder tree structure.
+        '''
+        suffix = f'/projects/{projectID or self.project}/files'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_files_for_branch(self, projectID: str = None, branchID: str = None, params: dict = None):
+        '''
+        This endpoint returns all the latest versions of files for the given branch ID. Each entry will include fields such as name, fileID, path, and latestVersionID. Response can be queried as a flat list of files or a file-folder tree structure. By default, it'll be a file-folder tree structure.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_versions_of_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
+        '''
+        This endpoint returns all file versions for the given fileID. Each version entry will contain basic file details such as name, id, and path, along with metadata. Please note that, metadata will be just "File Properties" data. For more detailed metadata, use /projects/{projectID}/branches/{branchID}/files/{fileID}/metadata and other metadata APIs.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/versions'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_latest_version_of_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
+        '''
+        This endpoint retrieves details of the latest file version.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/latest'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_latest_released_version_of_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
+        '''
+        This endpoint retrieves details of the latest released file.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/released'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_file_version(self, projectID: str = None, branchID: str = None, fileID: str = None, fileVersionID: str = None, params: dict = None):
+        '''
+        This endpoint retrieves file version details for the given fileVersionID.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/versions/{fileVersionID or self.fileVersion}'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_public_shared_files_links_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all public shared file links in your Bild account in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. The shared link contains details such as name, type, and the public URL.
+        '''
+        suffix = f'/sharedLinks'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_public_shared_files_links_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_public_shared_files_links_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/sharedLinks'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_public_shared_files_links(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all public shared file links in your project in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. The shared link contains details such as name, type, and the public URL.
+        '''
+        suffix = f'/projects/{projectID or self.project}/sharedLinks'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_public_shared_files_links(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_public_shared_files_links, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/sharedLinks'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_public_shared_files_links_in_branch(self, projectID: str = None, branchID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all public shared file links in your branch in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. The shared link contains details such as name, type, and the public URL.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/sharedLinks'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_public_shared_files_links_in_branch(self, projectID: str = None, branchID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_public_shared_files_links_in_branch, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/sharedLinks'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_all_custom_metadata_fields(self, params: dict = None):
+        '''
+        This endpoint returns all metadata fields, including Bild's default fields and custom fields created by users.
+        '''
+        suffix = f'/metadataFields'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_complete_metadata_for_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
+        '''
+        This endpoint returns metadata details for the file version associated with the given fileID. Metadata includes all fields and values across all available configs/profiles. By default, users will get metadata for the latest versions of the file.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/metadata'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_complete_metadata_for_file_version(self, projectID: str = None, branchID: str = None, fileID: str = None, fileVersionID: str = None, params: dict = None):
+        '''
+        This endpoint returns metadata details for the fileVersionID. Metadata includes all fields and values across all available configs/profiles.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/versions/{fileVersionID or self.fileVersion}/metadata'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_feedback_items_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all feedback items in the project with pagination. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each feedback item contains details such as title, description, status, due date, tags, assignees, comments, attachments, etc.
+        '''
+        suffix = f'/projects/{projectID or self.project}/feedbackItems'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_feedback_items_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_feedback_items_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/feedbackItems'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_feedback_items_for_file(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
+        '''
+        This endpoint returns all feedback items for a file. Each feedback item contains details such as title, description, status, due date, tags, assignees, comments, attachments, etc.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/feedbackItems'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_feedback_item_details_by_id(self, projectID: str = None, feedbackItemID: str = None, params: dict = None):
+        '''
+        This endpoint returns feedback item details for the given feedback item ID. Each feedback item contains details such as title, description, status, due date, tags, assignees, comments, attachments, etc.
+        '''
+        suffix = f'/projects/{projectID or self.project}/feedbackItems/{feedbackItemID or self.feedbackItem}'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_packages_from_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all packages in your Bild account. The results are paginated. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each package contains basic details such as name, creator name, created date, number of files, etc.
+        '''
+        suffix = f'/packages'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_packages_from_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_packages_from_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/packages'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_packages_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all packages in the project in paginated format. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each package contains basic details such as name, creator name, created date, number of files, etc.
+        '''
+        suffix = f'/projects/{projectID or self.project}/packages'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_packages_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_packages_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/packages'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_detailed_package_info_by_id(self, projectID: str = None, packageID: str = None, params: dict = None):
+        '''
+        This endpoint retrieves details of all package information, including all files in the package. Each package contains details such as name, creator name, created date, a list of files, and a download URL for the package.
+        '''
+        suffix = f'/projects/{projectID or self.project}/packages/{packageID or self.package}'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_ecos_in_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all Engineering Change Orders (ECOs) in your company's Bild account. The API supports paginated queries of ECOs. Users can pass pageSize and lastEvaluatedKey. PageSize determines the number of records per page, while lastEvaluatedKey serves as an offset key similar to database pagination. In the first API call, you'll receive the lastEvaluatedKey, which can be used in the next API call.
+        '''
+        suffix = f'/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_ecos_in_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_in_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_ecos_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all Engineering Change Orders (ECOs) in the given project. Similar to the above, the API supports pagination with pageSize and lastEvaluatedKey, along with filtering the responses based on the status of the ECO.
+        '''
+        suffix = f'/projects/{projectID or self.project}/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_ecos_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_ecos_of_branch_project(self, projectID: str = None, branchID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all Engineering Change Orders (ECOs) in the given branch of the project. Similar to the above, the API supports pagination with pageSize and lastEvaluatedKey, along with filtering the responses based on the status of the ECO.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_ecos_of_branch_project(self, projectID: str = None, branchID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_of_branch_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_ecos_of_file_in_branch(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all Engineering Change Orders (ECOs) in the given file of the branch in the project. Similar to the above, the API supports pagination with pageSize and lastEvaluatedKey, along with filtering the responses based on the status of the ECO.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/ecos'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_ecos_of_file_in_branch(self, projectID: str = None, branchID: str = None, fileID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_ecos_of_file_in_branch, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/ecos'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_details_of_eco(self, projectID: str = None, branchID: str = None, fileID: str = None, ecoID: str = None, params: dict = None):
+        '''
+        This endpoint returns details of an Engineering Change Order (ECO), along with all the file versions involved in that ECO. It also provides the list of all approvals that are part of that ECO.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/ecos/{ecoID or self.eco}'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_all_part_files_and_sub_assemblies(self, projectID: str = None, branchID: str = None, fileID: str = None, params: dict = None):
+        '''
+        This endpoint returns a list of all part files and sub-assemblies of an assembly file. It provides the full closure of the file, i.e., the list of all part files and sub-assemblies of an assembly file. These closures are configuration-specific. This endpoint is useful for obtaining the full closure of the file when the user intends to release/cancel the ECO for assembly file along with all its part files and sub-assemblies.
+        '''
+        suffix = f'/projects/{projectID or self.project}/branches/{branchID or self.branch}/files/{fileID or self.file}/closure'
+        return await self.request('GET', suffix, params=params)
+
+    async def get_approval_requests_bild_account(self, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all approval requests in your Bild account. By default, it returns the active approvals, i.e. Approvals those are PENDING in status. Pagination is supported using pageSize and lastEvaluatedKey, similar to the above APIs.
+        '''
+        suffix = f'/approvals'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_approval_requests_bild_account(self, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_approval_requests_bild_account, page by page. See paginate().
+        '''
+        suffix = f'/approvals'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_approval_requests_in_project(self, projectID: str = None, params: dict = None, *, pageSize: int = None, lastEvaluatedKey: str = None):
+        '''
+        This endpoint returns all approval requests in the project in paginated format. By default, it returns the active approvals, i.e. Approvals those are PENDING in status. For the first page, simply pass the pageSize in the query parameters. For subsequent pages, pass the lastEvaluatedKey received as a response from the previous call. Each approval request contains basic details such as name, creator name, created date, file name, etc., along with the list of active reviewers.
+        '''
+        suffix = f'/projects/{projectID or self.project}/approvals'
+        params = query(params, {'pageSize': pageSize, 'lastEvaluatedKey': lastEvaluatedKey})
+        return await self.request('GET', suffix, params=params)
+
+    def iter_approval_requests_in_project(self, projectID: str = None, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Streams every item of get_approval_requests_in_project, page by page. See paginate().
+        '''
+        suffix = f'/projects/{projectID or self.project}/approvals'
+        return self.paginate(suffix, page_size, prefetch, params)
+
+    async def get_details_of_approval_request(self, projectID: str = None, approvalID: str = None, params: dict = None):
+        '''
+        This endpoint returns details of an approval request along with active reviewers.
+        '''
+        suffix = f'/projects/{projectID or self.project}/approvals/{approvalID or self.approval}'
+        return await self.request('GET', suffix, params=params)
@@ -1,69 +1,252 @@
+'''
+Generates the Bild client from the endpoint spec, offline and deterministically:
+python compiler/buildFunction.py [spec] \n
+spec = compiler/data.json (the scraped endpoint list) or an OpenAPI 3 / Swagger 2 JSON document \n
+Writes compiler/bild.py (sync client) and compiler/bild_async.py (the same endpoints as coroutines).
+'''
 import json
+import keyword
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
-
-with open('compiler/data.json', 'r', encoding='utf-8') as file:
-    data = json.load(file)
-    file.close()
-
-def chat(prompt: str) -> str:
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "system", "content": 'You are used to help come up with straight forward  and easy to remember function names for python functions. You will be given a name and you have to come up with a simple snake case name. only respond with the name of the function. no other text.'},
-                  {"role": "user", "content": prompt}
-                  ] 
-    )
-    return response.choices[0].message.content
-
-def get_template(info: list) -> str:
-    name = chat(info['name'])
-    parameters = ''
-    if 'projectID' in info['url']:
-        parameters += f', projectID: str = self.project'
-    if 'branchID' in info['url']:
-        parameters += f', branchID: str = self.branch'
-    if 'commitID' in info['url']:
-        parameters += f', commitID: str = self.commit'
-    if 'fileID' in info['url']:
-        parameters += f', fileID: str = self.file'
-    if 'fileVersionID' in info['url']:
-        parameters += f', fileVersionID: str = self.fileVersion'
-    if 'ecoID' in info['url']:
-        parameters += f', ecoID: str = self.eco'
-    if 'approvalID' in info['url']:
-        parameters += f', approvalID: str = self.approval'
-    template = f"""
-    def {name}(self{parameters}):
-        ###
-        {info['description']}
-        ###
-
-        suffix = f#{str(info['url']).split('getbild.com/')[1]}#
-        url = f#self.baseurl/<suffix>#
-        response = requests.request(#{info['request_type']}#, url, headers=self.headers)
-        return self.check_response(response)
-    """
-    return template
+import re
+import sys
+import time
+from urllib.parse import urlsplit
 
-init_class = """
-import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Method names of the data.json endpoints, pinned so regenerating never renames a published method.
+# Endpoints not listed here are named from their title by snake_name().
+NAMES = {
+    'Get A List Of All Users In Your Bild Account': 'get_all_users_in_bild_account',
+    'Get A List Of All Projects In Your Bild Account': 'get_all_projects_in_bild_account',
+    'Get A List Of All Users In Your Project': 'get_all_users_in_project',
+    'Get All Branches Of The Project': 'get_all_branches_of_project',
+    'Get Commits Of The Project': 'get_commits_of_project',
+    'Get Commits Of The Branch': 'get_commits_of_branch',
+    'Get Details Of The Commit': 'get_commit_details',
+    'Get Released Files After Given Time': 'get_released_files_after_time',
+    "Get All Files Of The Project'S Default Branch": 'get_all_files_default_branch',
+    'Get All Files For A Branch': 'get_all_files_for_branch',
+    'Get All Versions Of File': 'get_all_versions_of_file',
+    'Get Latest Version Of File': 'get_latest_version_of_file',
+    'Get Latest Released Version Of File': 'get_latest_released_version_of_file',
+    'Get The File Version': 'get_file_version',
+    'Get A List Of Public Shared Files Links In Your Bild Account': 'get_public_shared_files_links_bild_account',
+    'Get A List Of Public Shared Files Links In Your Project': 'get_public_shared_files_links',
+    'Get A List Of Public Shared Files Links In Your Branch': 'get_public_shared_files_links_in_branch',
+    'Get A List Of All Custom Metadata Fields': 'get_all_custom_metadata_fields',
+    'Get Complete Metadata For File': 'get_complete_metadata_for_file',
+    'Get Complete Metadata For The File Version': 'get_complete_metadata_for_file_version',
+    'Get A List Of Feedback Items In Project': 'get_feedback_items_in_project',
+    'Get A List Of Feedback Items For A File': 'get_feedback_items_for_file',
+    'Get Feedback Item Details For Given Feedback Item Id': 'get_feedback_item_details_by_id',
+    'Get A List Of Packages In Your Bild Account': 'get_packages_from_bild_account',
+    'Get A List Of Packages In Project': 'get_packages_in_project',
+    'Get Detailed Package Info For The Given Id': 'get_detailed_package_info_by_id',
+    'Get A List Of ECOs In Your Bild Account': 'get_ecos_in_bild_account',
+    'Get A List Of ECOs In The Project': 'get_ecos_in_project',
+    'Get ECOs Of Particular Branch Of The Project': 'get_ecos_of_branch_project',
+    'Get ECOs Of Particular File Of The Branch In The Project': 'get_ecos_of_file_in_branch',
+    'Get Details Of An ECO': 'get_details_of_eco',
+    'Get All Part Files & Sub-Assemblies Of An Assembly File': 'get_all_part_files_and_sub_assemblies',
+    'Get A List Of Approval Requests In Your Bild Account': 'get_approval_requests_bild_account',
+    'Get A List Of Approval Requests In Project': 'get_approval_requests_in_project',
+    'Get Details Of An Approval Request': 'get_details_of_approval_request',
+}
+
+STOPWORDS = {'a', 'an', 'the', 'of', 'your', 'list', 'given', 'particular'}
+
+TYPES = {'integer': 'int', 'number': 'float', 'boolean': 'bool', 'string': 'str', 'array': 'list', 'object': 'dict'}
+
+METHODS = ('get', 'post', 'put', 'patch', 'delete')
+
+
+def snake_name(title: str):
+    '''
+    Names a method from an endpoint title ("Get A List Of Packages In Project" -> get_packages_in_project)
+    or from an operationId (listTags -> list_tags).
+    '''
+    words = re.findall(r'[a-z0-9]+', re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', title).lower())
+    if ' ' in title.strip():
+        words = [word for word in words if word not in STOPWORDS]
+    name = '_'.join(words) or 'endpoint'
+    return f'{name}_' if keyword.iskeyword(name) or name[0].isdigit() else name
+
+
+def identifier(name: str):
+    name = re.sub(r'\W', '_', name)
+    return f'{name}_' if keyword.iskeyword(name) or name[0].isdigit() else name
+
+
+def path_params(path: str):
+    return re.findall(r'{(\w+)}', path)
+
+
+def default_attribute(param: str):
+    '''
+    Client attribute holding the default of a path parameter (projectID -> self.project), set with set_<name>().
+    '''
+    return re.sub(r'I[dD]$', '', param) or param
+
+
+def is_paginated(endpoint: dict):
+    return 'lastEvaluatedKey' in endpoint['description'] or 'lastEvaluatedKey' in endpoint['query']
+
+
+def from_data(document: dict):
+    '''
+    Reads the scraped data.json format: {"get_urls": [{"name", "request_type", "url", "description"}, ...], ...}
+    with the optional "query" ({name: type}) and "request_body" parse_pages.py extracts.
+    Paginated endpoints get typed pageSize/lastEvaluatedKey parameters.
+    '''
+    endpoints = []
+    for entries in document.values():
+        for entry in entries:
+            endpoint = {
+                'title': entry['name'],
+                'method': entry['request_type'].upper(),
+                'path': urlsplit(entry['url']).path,
+                'description': entry.get('description', ''),
+                'query': dict(entry.get('query', {})),
+                'body': entry.get('body', bool(entry.get('request_body')) or entry['request_type'].upper() not in ('GET', 'DELETE')),
+            }
+            if 'lastEvaluatedKey' in endpoint['description']:
+                endpoint['query'] = dict({'pageSize': 'int', 'lastEvaluatedKey': 'str'}, **endpoint['query'])
+            endpoints.append(endpoint)
+    return endpoints
+
+
+def from_openapi(document: dict):
+    '''
+    Reads the operations of an OpenAPI 3 or Swagger 2 document, with their typed query parameters and request body.
+    '''
+    def resolve(item):
+        while '$ref' in item:
+            node = document
+            for part in item['$ref'].lstrip('#/').split('/'):
+                node = node[part]
+            item = node
+        return item
+
+    endpoints = []
+    for path, operations in document.get('paths', {}).items():
+        shared = operations.get('parameters', [])
+        for method in METHODS:
+            operation = operations.get(method)
+            if operation is None:
+                continue
+            query, body = {}, 'requestBody' in operation
+            for parameter in map(resolve, shared + operation.get('parameters', [])):
+                schema = resolve(parameter.get('schema', parameter))
+                if parameter.get('in') == 'query':
+                    query[parameter['name']] = TYPES.get(schema.get('type'), 'str')
+                elif parameter.get('in') in ('body', 'formData'):
+                    body = True
+            endpoints.append({
+                'title': operation.get('operationId') or operation.get('summary') or f'{method} {path}',
+                'method': method.upper(),
+                'path': path,
+                'description': operation.get('description') or operation.get('summary', ''),
+                'query': query,
+                'body': body,
+            })
+    return endpoints
+
+
+def load_spec(path: str):
+    with open(path, 'r', encoding='utf-8') as file:
+        document = json.load(file)
+    if 'openapi' in document or 'swagger' in document:
+        return from_openapi(document)
+    return from_data(document)
+
+
+def signature(endpoint: dict, extra: str = ''):
+    parameters = ''.join(f', {identifier(param)}: str = None' for param in path_params(endpoint['path']))
+    parameters += ', params: dict = None'
+    if endpoint['body']:
+        parameters += ', data: dict = None'
+    parameters += extra
+    return parameters
+
+
+def url_template(path: str):
+    '''
+    Compiles a path into an f-string, each parameter falling back to the client's default (set_project(), ...).
+    '''
+    return re.sub(r'{(\w+)}', lambda match: f'{{{identifier(match[1])} or self.{default_attribute(match[1])}}}', path)
+
+
+def docstring(text: str):
+    text = text.strip().replace('\\', '\\\\').replace("'''", '"""') or 'No description.'
+    return f"""        '''
+        {text}
+        '''"""
+
+
+def get_template(endpoint: dict, name: str, asynchronous: bool = False):
+    '''
+    Renders the methods of one endpoint: the request itself, and an iter_ method streaming every page when the endpoint
+    is paginated.
+    '''
+    query = endpoint['query']
+    extra = ''.join(f', {identifier(param)}: {kind} = None' for param, kind in query.items())
+    lines = [f"        suffix = f'{url_template(endpoint['path'])}'"]
+    if query:
+        values = ', '.join(f'{param!r}: {identifier(param)}' for param in query)
+        lines.append(f'        params = query(params, {{{values}}})')
+    arguments = "params=params, data=data" if endpoint['body'] else "params=params"
+    call = f"self.request('{endpoint['method']}', suffix, {arguments})"
+    lines.append(f'        return await {call}' if asynchronous else f'        return {call}')
+    methods = [
+        f"    {'async def' if asynchronous else 'def'} {name}(self{signature(endpoint, f', *{extra}' if extra else '')}):\n"
+        f"{docstring(endpoint['description'])}\n" + '\n'.join(lines) + '\n'
+    ]
+    if is_paginated(endpoint) and endpoint['method'] == 'GET':
+        parameters = ''.join(f', {identifier(param)}: str = None' for param in path_params(endpoint['path']))
+        methods.append(
+            f"    def iter_{name.removeprefix('get_')}(self{parameters}, page_size: int = 100, prefetch: bool = False, params: dict = None):\n"
+            f"{docstring(f'Streams every item of {name}, page by page. See paginate().')}\n"
+            f"        suffix = f'{url_template(endpoint['path'])}'\n"
+            f"        return self.paginate(suffix, page_size, prefetch, params)\n"
+        )
+    return '\n'.join(methods)
+
+
+init_class = """import os
 import requests
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from requests import exceptions
+from requests.adapters import HTTPAdapter
+from bild_retry import RetryPolicy
+
+
+def query(params: dict, values: dict):
+    '''
+    Merges the typed query parameters that were given into params.
+    '''
+    values = {key: value for key, value in values.items() if value is not None}
+    return dict(params or {}, **values) if values else params
 
 
 class Bild:
     '''
     ## Bild API client
 
-    Either set 'BILD_API_KEY' in environment variables or pass a token to the constructor: 
+    Either set 'BILD_API_KEY' in environment variables or pass a token to the constructor:
     token = <your_token>
+
+    Throttling and transient failures are handled on every request: \\n
+    retry = bild_retry.RetryPolicy deciding what is retried and the backoff (RetryPolicy(max_retries=0) disables it) \\n
+    rate_limiter = bild_retry.TokenBucket capping requests per second \\n
+    adaptive = bild_retry.AdaptiveLimiter capping requests in flight, lowered automatically when the server throttles
     '''
-    def __init__(self, token: str = 'env'):
+    def __init__(self, token: str = 'env', pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                 keep_alive: bool = True, timeout: float = None, baseurl: str = 'https://api.getbild.com',
+                 retry: RetryPolicy = None, rate_limiter = None, adaptive = None):
 
         # Error messages
         self.auth_error = 'Authentication failed. Ensure you have a valid API key, that you have the correct permissions, and that you have passed it to the constructor.'
@@ -77,56 +260,197 @@ class Bild:
             self.token = token
         if self.token is None:
             raise Exception(self.token_error)
-        else:   
+        else:
             self.headers = {"Authorization": f"Bearer {self.token}"}
-        
-        self.baseurl = 'https://api.getbild.com'
-        self.content_type = 'application/json;charset=UTF-8'
-        self.branch = ''
-        self.project = ''
-        self.fileVersion = ''
-        self.file = ''
-        self.commit = ''
-        self.eco = ''
-        self.approval = ''
-
-    def set_branch(self, branch_id: str):
-        self.branch = branch_id
 
-    def set_project(self, project_id: str):
-        self.project = project_id
+        self.baseurl = baseurl
+        self.content_type = 'application/json;charset=UTF-8'
+        self.timeout = timeout
+#DEFAULTS#
 
-    def set_file_version(self, file_version_id: str):
-        self.fileVersion = file_version_id
+        # Pooled transport shared by every method
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
 
-    def set_file(self, file_id: str):
-        self.file = file_id
-    
-    def set_commit(self, commit_id: str):
-        self.commit = commit_id
+        # Throttling and retries
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.adaptive = adaptive
 
-    def set_eco(self, eco_id: str):
-        self.eco = eco_id
+    def close(self):
+        '''
+        Closes the pooled session and every connection it holds open.
+        '''
+        self.session.close()
 
-    def set_approval(self, approval_id: str):
-        self.approval = approval_id
+    def __enter__(self):
+        return self
 
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+#SETTERS#
     def check_response(self, response):
         '''
         Checks to see if the response has en error or is valid. Raises specific errors based on the response.
         '''
         if type(response) == str:
             raise Exception(response)
-        else:
-            return response.json()
+        if not response.ok:
+            if response.status_code in (401, 403):
+                raise Exception(self.auth_error)
+            if response.status_code == 404:
+                raise Exception(self.path_error)
+            raise Exception(f'Bild API error {response.status_code}: {response.text}')
+        return response.json()
+
+    def request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Sends a request to the Bild API through the pooled session and returns the checked response. Each attempt waits
+        for the rate limiters, and failed attempts are retried as the retry policy decides.
+        '''
+        attempt = 0
+        while True:
+            response, error = None, None
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.adaptive is not None:
+                self.adaptive.acquire()
+            try:
+                response = self.session.request(method, f"{self.baseurl}{suffix}", headers=self.headers, params=params, json=data, timeout=self.timeout)
+            except (exceptions.ConnectionError, exceptions.Timeout) as e:
+                error = e
+            finally:
+                if self.adaptive is not None:
+                    self.adaptive.release(throttled=response is not None and response.status_code == 429)
+            if not self.retry.should_retry(method, attempt, response, error):
+                break
+            if response is not None:
+                response.close()
+            time.sleep(self.retry.delay(attempt, response))
+            attempt += 1
+        if error is not None:
+            raise error
+        return self.check_response(response)
+
+    def page_items(self, page: dict):
+        '''
+        Splits a page of a paginated endpoint into its items and the lastEvaluatedKey of the next page (None on the last page).
+        '''
+        key = page.get('lastEvaluatedKey')
+        if isinstance(key, dict):
+            key = json.dumps(key)
+        return page.get('data') or [], key or None
+
+    def paginate(self, suffix: str, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Lazily streams the items of a pageSize/lastEvaluatedKey endpoint, one page at a time, optionally fetching the next page in the background.
+        '''
+        params = dict(params or {}, pageSize=page_size)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = self.request('GET', suffix, params=params)
+            while True:
+                items, key = self.page_items(page)
+                if key is not None:
+                    next_params = dict(params, lastEvaluatedKey=key)
+                    upcoming = executor.submit(self.request, 'GET', suffix, next_params) if executor else None
+                yield from items
+                if key is None:
+                    return
+                page = upcoming.result() if upcoming else self.request('GET', suffix, params=next_params)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 """
 
-functions = []
-for item in data['get_urls']:
-    functions.append(str(get_template(item)).replace('#', "'").replace('<', '{').replace('>', '}'))
+async_class = """import asyncio
+
+from compiler.bild import Bild, query
+
+
+class AsyncBild(Bild):
+    '''
+    ## Async Bild API client
+
+    The endpoints of compiler/bild.py as coroutines, and their iter_ methods as async generators:
+    users = await bild.get_all_users_in_bild_account() \\n
+    Requests run in worker threads on the pooled session. bild_async.AsyncBild builds on this class with concurrency
+    limits and request coalescing.
+    '''
+    async def request(self, method: str, suffix: str, params: dict = None, data: dict = None):
+        '''
+        Sends a request in a worker thread and returns the checked response.
+        '''
+        return await asyncio.to_thread(Bild.request, self, method, suffix, params, data)
+
+    async def paginate(self, suffix: str, page_size: int = 100, prefetch: bool = False, params: dict = None):
+        '''
+        Async counterpart of Bild.paginate: an async generator streaming the items of a paginated endpoint, so every iter_*
+        method can be consumed with async for. With prefetch, the next page is requested while the current one is consumed.
+        '''
+        params = dict(params or {}, pageSize=page_size)
+        upcoming = None
+        try:
+            page = await self.request('GET', suffix, params=params)
+            while True:
+                items, key = self.page_items(page)
+                if key is not None:
+                    next_params = dict(params, lastEvaluatedKey=key)
+                    if prefetch:
+                        upcoming = asyncio.ensure_future(self.request('GET', suffix, params=next_params))
+                for item in items:
+                    yield item
+                if key is None:
+                    return
+                if upcoming:
+                    page, upcoming = await upcoming, None
+                else:
+                    page = await self.request('GET', suffix, params=next_params)
+        finally:
+            if upcoming:
+                upcoming.cancel()
+"""
+
+
+def generate(spec: str = os.path.join(HERE, 'data.json'), output_dir: str = HERE):
+    '''
+    Renders the sync and async clients of a spec into output_dir and returns their paths.
+    '''
+    endpoints = load_spec(spec)
+    names, attributes = set(), []
+    for endpoint in endpoints:
+        name = NAMES.get(endpoint['title']) or snake_name(endpoint['title'])
+        # Titles that collapse to the same name are told apart by their position in the spec
+        endpoint['name'] = name if name not in names else f'{name}_{len(names)}'
+        names.add(endpoint['name'])
+        for param in path_params(endpoint['path']):
+            if default_attribute(param) not in attributes:
+                attributes.append(default_attribute(param))
+
+    defaults = '\n'.join(f"        self.{attribute} = ''" for attribute in attributes)
+    setters = ''.join(
+        f"\n    def set_{snake_name(attribute)}(self, {snake_name(attribute)}_id: str):\n        self.{attribute} = {snake_name(attribute)}_id\n"
+        for attribute in attributes
+    )
+    sync = init_class.replace('#DEFAULTS#', defaults).replace('#SETTERS#', setters)
+    sync += ''.join('\n' + get_template(endpoint, endpoint['name']) for endpoint in endpoints)
+    asynchronous = async_class + ''.join('\n' + get_template(endpoint, endpoint['name'], asynchronous=True) for endpoint in endpoints)
 
-with open('compiler/bild.py', 'w', encoding='utf-8') as file:
-    file.write(init_class + '\n'.join(functions))
-    file.close()
+    paths = []
+    for filename, source in (('bild.py', sync), ('bild_async.py', asynchronous)):
+        compile(source, filename, 'exec')
+        path = os.path.join(output_dir, filename)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        paths.append(path)
+    return paths
 
 
+if __name__ == '__main__':
+    start = time.perf_counter()
+    paths = generate(*sys.argv[1:2])
+    print(f"Generated {', '.join(paths)} in {time.perf_counter() - start:.3f}s")
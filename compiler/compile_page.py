@@ -1,153 +1,206 @@
+'''
+Scrapes the endpoint catalog of the Bild API docs into compiler/data.json:
+python compiler/compile_page.py --workers 4 \n
+The sidebar is walked once to collect the URL of every endpoint page (saved to linksv2.txt, pass --links to reuse a
+saved list instead), then the pages are loaded in parallel by a pool of headless Chrome drivers. Every wait is an
+explicit wait for the element needed, never a fixed sleep. Each page's source is hashed: pages unchanged since the last
+run reuse their previous entry, changed ones are snapshotted to compiler/pages/ and parsed again by parse_pages.py
+(which can also rebuild the catalog from the snapshots alone, without Chrome). data.json and the hashes are written
+atomically, an interrupted run never leaves them half written.
+'''
+import argparse
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-import time
-import pprint
-from bs4 import BeautifulSoup
-import os
-import json
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from compiler.parse_pages import name_p_style, top_banner_style, parse_endpoint, write_atomic, write_catalog
 
-dropdowns = 'sl-tree'
-dropdowns_class = 'foo__PxTree-module__sltree'
-dropdown = 'sl-tree-item'
-dropdown_class = 'foo__PxTreeItem-module__sltreeitem  null'
 base_url = 'https://bildexternalapi.portledocs.com/#/docs/apireference'
+specific_page = 'foo__PxTreeItem-module__titleContainer'
+
+# True once the endpoint page has rendered its name and method/URL banner
+PAGE_READY = '''
+return Array.from(document.querySelectorAll('p')).some(p => p.style.cssText.includes(arguments[0])) &&
+       Array.from(document.querySelectorAll('div')).some(div => div.style.cssText.includes(arguments[1]) && div.innerText.includes('http'));
+'''
+
+
+def chrome_options(headless: bool = True):
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1600,1200')
+    return options
 
-def select_dropdowns():
-    chrome_options = Options()
-    #chrome_options.add_argument('--headless')  # Run in headless mode (no GUI)
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.get(base_url)
-    time.sleep(4)
-
-    main_dropdown = 'foo__ApiSiderbarList-module__tagTitle'
-    specific_page = 'foo__PxTreeItem-module__titleContainer'
-    dashboard = 'dashboardWrapper'
-    #USE THESE
-    name_p_style = 'font-size: var(--px-font-size-large); font-style: normal; font-weight: 600; line-height: normal; text-transform: capitalize; color: rgb(60, 57, 55);'
-    top_banner_style = 'width: 100%; display: flex; flex-direction: row; align-items: center; padding: 6px 5px; border-radius: 8px; gap: 12px; position: sticky; top: -24px; z-index: 0; font-size: var(--px-font-size-xsmall); background: var(--px-color-neutral-100); border: 1px solid var(--px-color-neutral-200);'
-    description_p_class = 'PxEditorLexicalTheme__paragraph'
-    request_body_style = 'width: 100%; display: flex; gap: 5px; flex-direction: column;'
-
-    # Find all divs with the specified class and click them
-    divs_to_click = driver.find_elements(By.CLASS_NAME, specific_page)
-    last_banner = ''
-    with open('compiler/data.json', 'w', encoding='utf-8') as file:
-        file.write('"get_urls":[\n')
-        file.close()
-    for div in divs_to_click:
-        div.click()
-        time.sleep(.5)  # Optional: wait a bit between clicks if needed
-        
-        # Use JavaScript to find the element with the specific style
+
+class DriverPool:
+    '''
+    Pool of Chrome drivers shared by the scraping workers. Drivers are started on first use, at most size of them,
+    and all of them are quit by close() (or on leaving the with block), even when a page fails.
+    '''
+    def __init__(self, size: int = 4, headless: bool = True):
+        self.size = size
+        self.headless = headless
+        self.idle = queue.Queue()
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
         try:
-            dashboard_div = driver.execute_script(
-                "return Array.from(document.querySelectorAll('p')).find(p => p.style.cssText.includes(arguments[0]));",
-                name_p_style
-            )
-            if dashboard_div:
-                dashboard_text = dashboard_div.text
-                top_banner_div = driver.execute_script(
-                    "return Array.from(document.querySelectorAll('div')).find(div => div.style.cssText.includes(arguments[0]));",
-                    top_banner_style
-                )
-                if top_banner_div != last_banner:
-                    top_banner_text = top_banner_div.text.replace('\n', '##').replace('Change Base URL Selection', '')
-                    description_div = driver.find_element(By.CLASS_NAME, description_p_class)
-                    description_text = description_div.text
-                    if top_banner_text.split('##')[0] == 'GET':
-                        try:
-                            request_body_div = driver.execute_script(
-                                "return Array.from(document.querySelectorAll('div')).find(div => div.style.cssText.includes(arguments[0]));",
-                                request_body_style
-                            )
-                            request_body_text = request_body_div.text
-                            print(request_body_text)
-                        except:
-                            request_body_text = ''
-                        
-                        # Create a dictionary for the JSON object
-                        data = {
-                            "name": dashboard_text,
-                            "request_type": top_banner_text.split('##')[0],
-                            "url": top_banner_text.split('##')[1],
-                            "description": description_text,
-                        }
-                        
-                        # Append the JSON object to the data.json file, gotta keep it persistant in case of silly goofy situations :)
-                        with open('compiler/data.json', 'a', encoding='utf-8') as file:
-                            
-                            json.dump(data, file)
-                            file.write(',\n') 
-                    last_banner = top_banner_div
-                else:
-                    print('already done')
-            else:
-                print('Element with specified style not found')
-        except Exception as e:
-            print(f'Error: {e}')
-    
-    with open('compiler/data.json', 'a', encoding='utf-8') as file:
-        file.write(']')
-        file.close()
-    pprint.pprint(data)
-
-    driver.quit()
-
-def find_dropdowns():
-    chrome_options = Options()
-    #chrome_options.add_argument('--headless')  # Run in headless mode (no GUI)
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.get(base_url)
-    time.sleep(5)
-    
-    # Get the page source and parse it
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, 'html.parser')
-    
-    # Find the div with class 'px-theme-light' and print the text of all divs inside it
-    px_theme_light_div = soup.find('div', class_='px-theme-light')
-    if px_theme_light_div:
-        for div in px_theme_light_div.find_all('div'):
-            text = div.get_text(strip=True)
-            div_class = div.get('class', [''])[0]  # Get the first class or an empty string if no class
-            print(f"Text: {text}, Class: {div_class}")
-            with open('compiler/dropdowns.txt', 'a', encoding='utf-8') as file:
-                file.write(f"Text: {text}\nClass: {div_class}\n\n")
-                file.close()
-
-    driver.quit()
-
-def check_request():
-    with open('compiler/links.txt', 'r', encoding='utf-8') as file:
-        urls = file.readlines()
-        file.close()
-    for url in urls:
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in headless mode (no GUI)
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-
-        # Initialize the Chrome driver
-        driver = webdriver.Chrome(options=chrome_options)
+            driver = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                start = len(self.drivers) < self.size
+                if start:
+                    driver = webdriver.Chrome(options=chrome_options(self.headless))
+                    self.drivers.append(driver)
+            if not start:
+                driver = self.idle.get()
+        try:
+            yield driver
+        finally:
+            self.idle.put(driver)
+
+    def close(self):
+        with self.lock:
+            for driver in self.drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            self.drivers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def discover_links(pool: DriverPool, timeout: float = 20):
+    '''
+    Clicks through every sidebar item once, waiting for the route to change instead of sleeping, and returns the URL
+    of each endpoint page.
+    '''
+    links = []
+    with pool.driver() as driver:
+        driver.get(base_url)
+        items = WebDriverWait(driver, timeout).until(EC.presence_of_all_elements_located((By.CLASS_NAME, specific_page)))
+        for item in items:
+            previous = driver.current_url
+            WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(item)).click()
+            try:
+                WebDriverWait(driver, timeout).until(EC.url_changes(previous))
+            except TimeoutException:
+                continue
+            if 'path=' in driver.current_url and driver.current_url not in links:
+                links.append(driver.current_url)
+    return links
+
+
+def scrape_page(pool: DriverPool, url: str, timeout: float = 20):
+    '''
+    Loads one endpoint page and returns its source once the name and banner have rendered.
+    '''
+    with pool.driver() as driver:
+        # The docs route on the URL hash, leave the previous page first so its content can't pass for this one's
+        driver.get('about:blank')
         driver.get(url)
-        request_page = driver.page_source
-        soup = BeautifulSoup(request_page, 'html.parser')
-        with open('compiler/request_info.txt', 'a', encoding='utf-8') as file:
-            file.write(soup.prettify())
-            file.write('\n\n\n')
-        file.close()
+        WebDriverWait(driver, timeout).until(lambda driver: driver.execute_script(PAGE_READY, name_p_style, top_banner_style))
+        return driver.page_source
+
+
+def compile_catalog(links: list, pool: DriverPool, workers: int = 4, timeout: float = 20,
+                    hashes_path: str = os.path.join(HERE, 'page_hashes.json'), pages_dir: str = os.path.join(HERE, 'pages')):
+    '''
+    Scrapes every endpoint page in parallel and returns the endpoints in sidebar order. Pages whose source hashes the
+    same as on the last run reuse their previous entry, the others are snapshotted to pages_dir and parsed.
+    '''
+    try:
+        with open(hashes_path, 'r', encoding='utf-8') as file:
+            previous = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        previous = {}
+    os.makedirs(pages_dir, exist_ok=True)
+    report = {'pages': len(links), 'unchanged': 0, 'parsed': 0, 'failed': []}
+
+    def work(url: str):
+        try:
+            html = scrape_page(pool, url, timeout)
+        except Exception as e:
+            return url, None, None, e
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        seen = previous.get(url)
+        if seen and seen['hash'] == digest:
+            return url, digest, seen['endpoint'], None
+        write_atomic(os.path.join(pages_dir, f'{digest[:16]}.html'), html)
+        return url, digest, parse_endpoint(html), None
+
+    hashes, endpoints = {}, []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for url, digest, endpoint, error in executor.map(work, links):
+            if error is not None:
+                report['failed'].append(url)
+                # Keep what the last run knew about a page that failed this time
+                if url in previous:
+                    hashes[url] = previous[url]
+                    endpoint = previous[url]['endpoint']
+            else:
+                report['unchanged' if previous.get(url, {}).get('hash') == digest else 'parsed'] += 1
+                hashes[url] = {'hash': digest, 'endpoint': endpoint}
+            if endpoint is not None:
+                endpoints.append(endpoint)
+    write_atomic(hashes_path, json.dumps(hashes, indent=1))
+    return endpoints, report
+
+
+def find_dropdowns(pool: DriverPool, timeout: float = 20):
+    '''
+    Dumps the text and class of every div of the docs shell into dropdowns.txt, to find the selectors above.
+    '''
+    with pool.driver() as driver:
+        driver.get(base_url)
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CLASS_NAME, 'px-theme-light')))
+        soup = BeautifulSoup(driver.page_source, 'html.parser')
+    lines = []
+    for div in soup.find('div', class_='px-theme-light').find_all('div'):
+        lines.append(f"Text: {div.get_text(strip=True)}\nClass: {div.get('class', [''])[0]}\n\n")
+    write_atomic(os.path.join(HERE, 'dropdowns.txt'), ''.join(lines))
 
 
 if __name__ == "__main__":
-    #check_request()
-    select_dropdowns()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4, help='pages scraped in parallel, one headless Chrome each')
+    parser.add_argument('--links', help='file of endpoint page URLs to scrape instead of walking the sidebar')
+    parser.add_argument('--timeout', type=float, default=20, help='seconds to wait for a page to render')
+    parser.add_argument('--show', action='store_true', help='run Chrome with a window')
+    args = parser.parse_args()
+
+    with DriverPool(args.workers, headless=not args.show) as pool:
+        if args.links:
+            with open(args.links, 'r', encoding='utf-8') as file:
+                links = [line.strip() for line in file if line.strip()]
+        else:
+            links = discover_links(pool, args.timeout)
+            write_atomic(os.path.join(HERE, 'linksv2.txt'), '\n'.join(links) + '\n')
+        endpoints, report = compile_catalog(links, pool, args.workers, args.timeout)
+    write_catalog(endpoints)
+    print(f"{len(endpoints)} endpoints from {report['pages']} pages: {report['parsed']} parsed, {report['unchanged']} unchanged, {len(report['failed'])} failed")
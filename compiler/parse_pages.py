@@ -0,0 +1,327 @@
+'''
+Extracts the endpoint catalog from saved snapshots of the API docs, without a browser:
+python compiler/parse_pages.py --workers 8 \n
+Reads the page sources compile_page.py snapshotted to compiler/pages/ (in sidebar order when page_hashes.json is
+there), parses them in parallel across processes and writes compiler/data.json. The fastest installed parser is used:
+selectolax, then lxml, then BeautifulSoup, then the standard library's html.parser, which always works.
+'''
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+name_p_style = 'font-size: var(--px-font-size-large); font-style: normal; font-weight: 600; line-height: normal; text-transform: capitalize; color: rgb(60, 57, 55);'
+top_banner_style = 'width: 100%; display: flex; flex-direction: row; align-items: center; padding: 6px 5px; border-radius: 8px; gap: 12px; position: sticky; top: -24px; z-index: 0; font-size: var(--px-font-size-xsmall); background: var(--px-color-neutral-100); border: 1px solid var(--px-color-neutral-200);'
+description_p_class = 'PxEditorLexicalTheme__paragraph'
+request_body_style = 'width: 100%; display: flex; gap: 5px; flex-direction: column;'
+
+METHODS = {'GET', 'PUT', 'POST', 'PATCH', 'DELETE', 'DEL'}
+PARAMETER_SECTION = re.compile(r'^(path|query)\s+param(eter)?s?$', re.IGNORECASE)
+SECTION = re.compile(r'^((path|query|header)\s+param(eter)?s?|request\s+body|body|responses?|response\s+body)$', re.IGNORECASE)
+TYPES = {'string': 'str', 'integer': 'int', 'number': 'float', 'boolean': 'bool', 'array': 'list', 'object': 'dict'}
+VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+def squeeze(style: str):
+    return re.sub(r'\s', '', style or '')
+
+
+class Node:
+    __slots__ = ('tag', 'attrs', 'children')
+
+    def __init__(self, tag: str, attrs: dict):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+
+
+class TreeBuilder(HTMLParser):
+    '''
+    Minimal DOM for the standard library fallback: elements with their attributes, children and text.
+    '''
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('document', {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, dict(attrs))
+        self.stack[-1].children.append(node)
+        if tag not in VOID:
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def stdlib_parser():
+    def load(html):
+        builder = TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        return builder.root
+
+    def elements(node):
+        for child in node.children:
+            if isinstance(child, Node):
+                if child.tag not in ('script', 'style'):
+                    yield child
+                    yield from elements(child)
+
+    def lines(node):
+        texts = []
+
+        def walk(node):
+            for child in node.children:
+                if isinstance(child, Node):
+                    if child.tag not in ('script', 'style'):
+                        walk(child)
+                elif child.strip():
+                    texts.append(child.strip())
+        walk(node)
+        return texts
+
+    def find(document, tag=None, style=None, cls=None):
+        for element in elements(document):
+            if tag and element.tag != tag:
+                continue
+            if style and squeeze(style) not in squeeze(element.attrs.get('style')):
+                continue
+            if cls and cls not in (element.attrs.get('class') or '').split():
+                continue
+            return element
+        return None
+
+    return load, find, lines
+
+
+def bs4_parser():
+    from bs4 import BeautifulSoup
+
+    def load(html):
+        document = BeautifulSoup(html, 'html.parser')
+        for element in document(['script', 'style']):
+            element.decompose()
+        return document
+
+    def find(document, tag=None, style=None, cls=None):
+        def match(element):
+            return ((not tag or element.name == tag) and (not style or squeeze(style) in squeeze(element.get('style')))
+                    and (not cls or cls in element.get('class', [])))
+        return document.find(match)
+
+    def lines(element):
+        return [text.strip() for text in element.find_all(string=True) if text.strip()]
+
+    return load, find, lines
+
+
+def lxml_parser():
+    import lxml.etree
+    import lxml.html
+
+    def load(html):
+        document = lxml.html.fromstring(html)
+        lxml.etree.strip_elements(document, 'script', 'style', with_tail=False)
+        return document
+
+    def find(document, tag=None, style=None, cls=None):
+        for element in document.iter(tag or lxml.etree.Element):
+            if style and squeeze(style) not in squeeze(element.get('style')):
+                continue
+            if cls and cls not in (element.get('class') or '').split():
+                continue
+            return element
+        return None
+
+    def lines(element):
+        return [text.strip() for text in element.itertext() if text.strip()]
+
+    return load, find, lines
+
+
+def selectolax_parser():
+    from selectolax.parser import HTMLParser as FastParser
+
+    def load(html):
+        document = FastParser(html)
+        document.strip_tags(['script', 'style'])
+        return document
+
+    def find(document, tag=None, style=None, cls=None):
+        for element in document.css(tag or '*'):
+            attributes = element.attributes
+            if style and squeeze(style) not in squeeze(attributes.get('style')):
+                continue
+            if cls and cls not in (attributes.get('class') or '').split():
+                continue
+            return element
+        return None
+
+    def lines(element):
+        return [text.strip() for text in element.text(separator='\n').split('\n') if text.strip()]
+
+    return load, find, lines
+
+
+PARSERS = {'selectolax': selectolax_parser, 'lxml': lxml_parser, 'bs4': bs4_parser, 'html.parser': stdlib_parser}
+PACKAGES = {'bs4': 'beautifulsoup4'}
+
+
+def get_parser(name: str = 'auto'):
+    '''
+    Returns the (load, find, lines) functions of a parser, the fastest installed one for 'auto'.
+    '''
+    if name != 'auto':
+        try:
+            return PARSERS[name]()
+        except ImportError:
+            raise Exception(f'The {name} parser is not installed: pip install {PACKAGES.get(name, name)}')
+    for factory in PARSERS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+
+
+def capitalize(text: str):
+    '''
+    Mirrors the docs' text-transform: capitalize, which names in data.json (and the generator's NAMES) were read with.
+    '''
+    return re.sub(r"(^|[^A-Za-z0-9])([a-z])", lambda match: match[1] + match[2].upper(), ' '.join(text.split()))
+
+
+def parameters(lines: list):
+    '''
+    Reads "Path Params"/"Query Params" sections of the page text, where each parameter is its name followed by its type.
+    Returns the query parameters as {name: type}.
+    '''
+    query, section = {}, None
+    for index, line in enumerate(lines):
+        if SECTION.match(line):
+            section = line.split()[0].lower() if PARAMETER_SECTION.match(line) else None
+            continue
+        if section != 'query' or not re.fullmatch(r'[A-Za-z_][\w.\[\]-]*', line):
+            continue
+        following = lines[index + 1].lower() if index + 1 < len(lines) else ''
+        kind = TYPES.get(following.split()[0] if following else '')
+        if kind and line.lower() not in TYPES:
+            query[line] = kind
+    return query
+
+
+def parse_endpoint(html: str, parser=None):
+    '''
+    Extracts {"name", "request_type", "url", "description", "query", "request_body"} from the source of an endpoint
+    page, or None if it isn't one. query and request_body are only present when the page documents them.
+    '''
+    load, find, lines = parser or get_parser()
+    document = load(html)
+    name = find(document, 'p', style=name_p_style)
+    banner = find(document, 'div', style=top_banner_style)
+    if name is None or banner is None:
+        return None
+    parts = [part for part in lines(banner) if part != 'Change Base URL Selection']
+    method = next((part.upper() for part in parts if part.upper() in METHODS), None)
+    url = next((part for part in parts if part.startswith('http')), None)
+    if method is None or url is None:
+        return None
+    description = find(document, cls=description_p_class)
+    endpoint = {
+        "name": capitalize(' '.join(lines(name))),
+        "request_type": 'DELETE' if method == 'DEL' else method,
+        "url": url,
+        "description": ' '.join(lines(description)) if description is not None else '',
+    }
+    query = parameters(lines(document))
+    if query:
+        endpoint['query'] = query
+    body = find(document, 'div', style=request_body_style)
+    if body is not None and method != 'GET':
+        endpoint['request_body'] = '\n'.join(lines(body))
+    return endpoint
+
+
+def write_atomic(path: str, text: str):
+    '''
+    Writes the whole file or nothing: a crash mid-write never leaves a truncated file behind.
+    '''
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def write_catalog(endpoints: list, path: str = os.path.join(HERE, 'data.json')):
+    '''
+    Writes the catalog grouped by method ({"get_urls": [...], "put_urls": [...]}), one endpoint per line.
+    '''
+    groups = {}
+    for endpoint in endpoints:
+        groups.setdefault(f"{endpoint['request_type'].lower()}_urls", []).append(endpoint)
+    sections = [f'{json.dumps(key)}:[\n' + ',\n'.join(json.dumps(endpoint) for endpoint in group) + '\n]' for key, group in groups.items()]
+    text = '{' + ',\n'.join(sections) + '}'
+    json.loads(text)
+    write_atomic(path, text)
+
+
+def parse_file(path: str, parser: str = 'auto'):
+    with open(path, 'r', encoding='utf-8') as file:
+        return parse_endpoint(file.read(), get_parser(parser))
+
+
+def snapshot_paths(pages_dir: str, hashes_path: str = None):
+    '''
+    The snapshots to parse: the current page of every URL in page_hashes.json, in sidebar order, or else every snapshot.
+    '''
+    if hashes_path and os.path.exists(hashes_path):
+        with open(hashes_path, 'r', encoding='utf-8') as file:
+            hashes = json.load(file)
+        paths = [os.path.join(pages_dir, f"{page['hash'][:16]}.html") for page in hashes.values() if page.get('hash')]
+        return [path for path in paths if os.path.exists(path)]
+    return sorted(glob.glob(os.path.join(pages_dir, '*.html')))
+
+
+def compile_snapshots(paths: list, workers: int = None, parser: str = 'auto'):
+    '''
+    Parses snapshots in parallel across processes and returns the endpoints found, in order and without duplicates.
+    '''
+    endpoints, seen = [], set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        for endpoint in executor.map(parse_file, paths, [parser] * len(paths), chunksize=chunksize):
+            if endpoint is None or (endpoint['request_type'], endpoint['url']) in seen:
+                continue
+            seen.add((endpoint['request_type'], endpoint['url']))
+            endpoints.append(endpoint)
+    return endpoints
+
+
+if __name__ == '__main__':
+    arguments = argparse.ArgumentParser()
+    arguments.add_argument('--pages', default=os.path.join(HERE, 'pages'), help='folder of saved page sources')
+    arguments.add_argument('--hashes', default=os.path.join(HERE, 'page_hashes.json'), help='page_hashes.json giving the order')
+    arguments.add_argument('--output', default=os.path.join(HERE, 'data.json'))
+    arguments.add_argument('--workers', type=int, default=None, help='processes, one per core by default')
+    arguments.add_argument('--parser', default='auto', choices=['auto', *PARSERS])
+    args = arguments.parse_args()
+
+    start = time.perf_counter()
+    paths = snapshot_paths(args.pages, args.hashes)
+    endpoints = compile_snapshots(paths, args.workers, args.parser)
+    write_catalog(endpoints, args.output)
+    print(f'{len(endpoints)} endpoints from {len(paths)} snapshots in {time.perf_counter() - start:.2f}s')
@@ -8,7 +8,7 @@ dotenv.load_dotenv()
 
 class TestBild(unittest.TestCase):
 
-    @patch('bild.requests.get')
+    @patch('bild.requests.Session.request')
     def test_get_all_users(self, mock_get):
         # Arrange
         mock_response = MagicMock()
@@ -33,9 +33,9 @@ class TestBild(unittest.TestCase):
 
         # Assert
         self.assertEqual(result, expected_data)
-        mock_get.assert_called_once_with('https://api.getbild.com/users', headers={"Authorization": "Bearer test_token"})
+        mock_get.assert_called_once_with('GET', 'https://api.getbild.com/users', headers={"Authorization": "Bearer test_token"}, params=None, json=None, timeout=None)
 
-    @patch('bild.requests.get')
+    @patch('bild.requests.Session.request')
     def test_get_all_projects(self, mock_get):
         # Arrange
         mock_response = MagicMock()
@@ -65,9 +65,9 @@ class TestBild(unittest.TestCase):
 
         # Assert
         self.assertEqual(result, expected_data)
-        mock_get.assert_called_once_with('https://api.getbild.com/projects', headers={"Authorization": "Bearer test_token"})
+        mock_get.assert_called_once_with('GET', 'https://api.getbild.com/projects', headers={"Authorization": "Bearer test_token"}, params=None, json=None, timeout=None)
 
-    @patch('bild.requests.get')
+    @patch('bild.requests.Session.request')
     def test_get_all_files(self, mock_get):
         # Arrange
         mock_response = MagicMock()
@@ -91,7 +91,63 @@ class TestBild(unittest.TestCase):
 
         # Assert
         self.assertEqual(result, expected_data)
-        mock_get.assert_called_once_with('https://api.getbild.com/projects/1/files', headers={"Authorization": "Bearer test_token"})
+        mock_get.assert_called_once_with('GET', 'https://api.getbild.com/projects/1/files', headers={"Authorization": "Bearer test_token"}, params=None, json=None, timeout=None)
+
+    def test_session_pool_configuration(self):
+        bild = Bild(token='test_token', pool_connections=3, pool_maxsize=20, pool_block=True)
+        adapter = bild.session.get_adapter('https://api.getbild.com')
+
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(bild.session.headers['Connection'], 'keep-alive')
+
+        bild = Bild(token='test_token', keep_alive=False)
+        self.assertEqual(bild.session.headers['Connection'], 'close')
+
+    @patch('bild.requests.Session.close')
+    def test_context_manager_closes_session(self, mock_close):
+        with Bild(token='test_token') as bild:
+            self.assertIsInstance(bild, Bild)
+            bild.session
+        mock_close.assert_called_once()
+
+        # A client that never sent a request has no session to close
+        mock_close.reset_mock()
+        with Bild(token='test_token'):
+            pass
+        mock_close.assert_not_called()
+
+    @patch('bild.requests.Session.request')
+    def test_iter_commits_of_branch(self, mock_request):
+        # Arrange
+        pages = {
+            None: {"data": [{"id": "c1"}, {"id": "c2"}], "lastEvaluatedKey": "k1"},
+            "k1": {"data": [{"id": "c3"}], "lastEvaluatedKey": {"id": "c3"}},
+            '{"id": "c3"}': {"data": [{"id": "c4"}]},
+        }
+
+        def page(method, url, params=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = pages[params.get('lastEvaluatedKey')]
+            return response
+
+        mock_request.side_effect = page
+
+        # Act
+        bild = Bild(token='test_token')
+        bild.set_project('p1')
+        bild.set_branch('b1')
+        for prefetch in (False, True):
+            mock_request.reset_mock()
+            commits = bild.iter_commits_of_branch(page_size=2, prefetch=prefetch, params={'status': 'all'})
+
+            # Assert
+            self.assertEqual([c['id'] for c in commits], ['c1', 'c2', 'c3', 'c4'])
+            self.assertEqual(mock_request.call_count, 3)
+            first = mock_request.call_args_list[0]
+            self.assertEqual(first.args[1], 'https://api.getbild.com/projects/p1/branches/b1/commits')
+            self.assertEqual(first.kwargs['params'], {'status': 'all', 'pageSize': 2})
 
     # Add more test methods for other functions
 
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from bild_async import AsyncBild
+from bild_mock import MockDataset, MockServer
+from bild_permissions import PermissionsMatrix
+
+
+class TestAsyncBild(unittest.IsolatedAsyncioTestCase):
+
+    @patch('bild.requests.Session.request')
+    async def test_endpoints_are_coroutines(self, mock_request):
+        # Arrange
+        mock_response = MagicMock()
+        expected_data = {"data": [{"id": "1", "name": "Project A"}], "message": "Success"}
+        mock_response.json.return_value = expected_data
+        mock_request.return_value = mock_response
+
+        # Act
+        async with AsyncBild(token='test_token') as bild:
+            bild.set_project('p1')
+            bild.set_branch('b1')
+            projects = await bild.get_all_projects()
+            files = await bild.get_all_files()
+            branches = await bild.get_all_branches_of_project('p1')
+
+        # Assert
+        self.assertEqual(projects, expected_data)
+        self.assertEqual(files, expected_data)
+        self.assertEqual(branches, expected_data)
+        urls = [call.args[1] for call in mock_request.call_args_list]
+        self.assertEqual(urls, [
+            'https://api.getbild.com/projects',
+            'https://api.getbild.com/projects/p1/files',
+            'https://api.getbild.com/projects/p1/branches',
+        ])
+
+    @patch('bild.requests.Session.request')
+    async def test_concurrency_limits(self, mock_request):
+        in_flight = {'all': 0, 'metadata': 0}
+        peak = {'all': 0, 'metadata': 0}
+        lock = threading.Lock()
+
+        def slow_request(method, url, **kwargs):
+            keys = ['all', 'metadata'] if url.endswith('/metadata') else ['all']
+            with lock:
+                for key in keys:
+                    in_flight[key] += 1
+                    peak[key] = max(peak[key], in_flight[key])
+            time.sleep(0.02)
+            with lock:
+                for key in keys:
+                    in_flight[key] -= 1
+            response = MagicMock()
+            response.json.return_value = {"data": []}
+            return response
+
+        mock_request.side_effect = slow_request
+
+        async with AsyncBild(token='test_token', concurrency=4, endpoint_limits={'/projects/*/metadata': 2}) as bild:
+            await asyncio.gather(
+                *[bild.get_metadata_from_file('p', 'b', f'f{i}') for i in range(8)],
+                *[bild.get_all_files(f'p{i}') for i in range(8)],
+            )
+
+        self.assertEqual(mock_request.call_count, 16)
+        self.assertLessEqual(peak['all'], 4)
+        self.assertLessEqual(peak['metadata'], 2)
+
+    @patch('bild.requests.Session.request')
+    async def test_iter_is_async_generator(self, mock_request):
+        pages = {
+            None: {"data": [{"id": "e1"}], "lastEvaluatedKey": "k1"},
+            "k1": {"data": [{"id": "e2"}]},
+        }
+
+        def page(method, url, params=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = pages[params.get('lastEvaluatedKey')]
+            return response
+
+        mock_request.side_effect = page
+
+        async with AsyncBild(token='test_token') as bild:
+            ecos = [eco['id'] async for eco in bild.iter_ecos_in_project('p1', page_size=1, prefetch=True)]
+
+        self.assertEqual(ecos, ['e1', 'e2'])
+        self.assertEqual(mock_request.call_args_list[0].args[1], 'https://api.getbild.com/projects/p1/ecos')
+
+    @patch('bild.requests.Session.request')
+    async def test_identical_calls_are_coalesced(self, mock_request):
+        def slow_request(method, url, **kwargs):
+            time.sleep(0.05)
+            response = MagicMock()
+            response.json.return_value = {"data": [{"id": "b1"}]}
+            return response
+
+        mock_request.side_effect = slow_request
+
+        async with AsyncBild(token='test_token') as bild:
+            results = await asyncio.gather(*[bild.get_all_branches_of_project('p1') for _ in range(5)], bild.get_all_branches_of_project('p2'))
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(results[0], {"data": [{"id": "b1"}]})
+        self.assertEqual(bild.single_flight.stats, {'calls': 2, 'shared': 4})
+
+    async def test_inherited_helpers(self):
+        with MockServer(MockDataset(projects=2, files=5, users=600)) as server:
+            async with AsyncBild(token='mock', baseurl=server.url) as bild:
+                users = [user['id'] async for user in bild.stream_all_users()]
+                self.assertEqual(len(users), 600)
+                self.assertEqual(users, [user['id'] for user in (await bild.get_all_users())['data']])
+
+                matrix = await bild.permissions_matrix()
+                self.assertIsInstance(matrix, PermissionsMatrix)
+                self.assertEqual(matrix, bild.blocking().permissions_matrix())
+
+                for name in ('bulk_file_metadata', 'closure_graph', 'provision_users', 'batch_export', 'scheduler'):
+                    with self.assertRaises(Exception) as error:
+                        getattr(bild, name)()
+                    self.assertIn('blocking()', str(error.exception))
+                export = bild.blocking().bulk_file_metadata('p0', 'p0-b0')
+                await asyncio.to_thread(list, export)
+                self.assertEqual(export.report['succeeded'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from bild import Bild
+
+
+TREE = {
+    "data": [
+        {"id": "f1", "name": "part1.sldprt", "path": "/part1.sldprt", "type": "file"},
+        {"id": "d1", "name": "assemblies", "type": "folder", "children": [
+            {"id": "f2", "name": "asm.sldasm", "path": "/assemblies/asm.sldasm", "type": "file"},
+            {"id": "f3", "name": "broken.sldprt", "path": "/assemblies/broken.sldprt", "type": "file"},
+            {"id": "f1", "name": "part1.sldprt", "path": "/part1.sldprt", "type": "file"},
+        ]},
+    ]
+}
+
+
+def fake_api(method, url, **kwargs):
+    if url.endswith('/files/f3/metadata'):
+        raise ConnectionError('connection reset')
+    response = MagicMock()
+    if url.endswith('/branches/b1/files'):
+        response.json.return_value = TREE
+    else:
+        response.json.return_value = {"data": {"partNumber": url.split('/')[-2]}}
+    return response
+
+
+class TestBulkFileMetadata(unittest.TestCase):
+
+    @patch('bild.requests.Session.request', side_effect=fake_api)
+    def test_streams_results_and_reports_failures(self, mock_request):
+        bild = Bild(token='test_token')
+        export = bild.bulk_file_metadata('p1', 'b1', workers=2)
+
+        results = {result['file']['id']: result for result in export}
+
+        self.assertEqual(set(results), {'f1', 'f2', 'f3'})
+        self.assertEqual(results['f2']['metadata'], {"data": {"partNumber": "f2"}})
+        self.assertIn('connection reset', results['f3']['error'])
+        self.assertEqual(export.report['succeeded'], 2)
+        self.assertEqual(export.report['failed'], 1)
+        self.assertEqual(export.report['duplicates'], 1)
+        self.assertIn('f3', export.report['failures'])
+        # One listing call plus one metadata call per unique file
+        self.assertEqual(mock_request.call_count, 4)
+
+    @patch('bild.requests.Session.request', side_effect=fake_api)
+    def test_write_jsonl_and_csv(self, mock_request):
+        bild = Bild(token='test_token')
+        with tempfile.TemporaryDirectory() as folder:
+            jsonl = os.path.join(folder, 'bom.jsonl')
+            report = bild.bulk_file_metadata('p1', 'b1').write(jsonl)
+            with open(jsonl, encoding='utf-8') as file:
+                lines = [json.loads(line) for line in file]
+            self.assertEqual(len(lines), 3)
+            self.assertEqual(report['files'], 3)
+
+            path = os.path.join(folder, 'bom.csv')
+            bild.bulk_file_metadata('p1', 'b1').write(path)
+            with open(path, encoding='utf-8', newline='') as file:
+                rows = {row['file_id']: row for row in csv.DictReader(file)}
+            self.assertEqual(json.loads(rows['f1']['metadata']), {"data": {"partNumber": "f1"}})
+            self.assertEqual(rows['f2']['path'], '/assemblies/asm.sldasm')
+            self.assertTrue(rows['f3']['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
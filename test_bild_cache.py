@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_cache import MemoryCache, SQLiteCache
+
+
+def make_response(status_code=200, text='{"data": [], "message": "Success"}', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    response.json.return_value = {"data": [], "message": "Success"}
+    return response
+
+
+class TestBildCache(unittest.TestCase):
+
+    @patch('bild.requests.Session.request')
+    def test_hits_and_uncached_endpoints(self, mock_request):
+        mock_request.return_value = make_response()
+        bild = Bild(token='test_token', cache=MemoryCache())
+
+        bild.get_all_metadata_fields()
+        bild.get_all_metadata_fields()
+        bild.get_all_files('p1')
+        bild.get_all_files('p1')
+
+        # metadataFields is cached by default, project files are not
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(bild.cache.stats['hits'], 1)
+        self.assertEqual(bild.cache.stats['misses'], 1)
+
+    @patch('bild.requests.Session.request')
+    def test_params_are_part_of_the_key(self, mock_request):
+        mock_request.return_value = make_response()
+        bild = Bild(token='test_token', cache=MemoryCache(), cache_ttls={'/projects/*/commits': 60})
+
+        bild.get_commits_of_project('p1', params={'pageSize': 10})
+        bild.get_commits_of_project('p1', params={'pageSize': 20})
+        bild.get_commits_of_project('p1', params={'pageSize': 10})
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('bild.time.time')
+    @patch('bild.requests.Session.request')
+    def test_expired_entries_are_revalidated(self, mock_request, mock_time):
+        mock_time.return_value = 1000
+        mock_request.return_value = make_response(text='{"data": [1]}', headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+        bild = Bild(token='test_token', cache=MemoryCache(), cache_ttls={'/users': 10})
+        bild.get_all_users()
+
+        mock_time.return_value = 1011
+        mock_request.return_value = make_response(status_code=304, text='')
+        result = bild.get_all_users()
+
+        self.assertEqual(result, {"data": [1]})
+        headers = mock_request.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Wed, 01 Jan 2025 00:00:00 GMT')
+        self.assertEqual(headers['Authorization'], 'Bearer test_token')
+        self.assertEqual(bild.cache.stats['revalidated'], 1)
+
+        # Revalidation refreshed the TTL
+        mock_time.return_value = 1015
+        bild.get_all_users()
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_memory_cache_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        entry = {'body': '{}', 'etag': None, 'last_modified': None, 'expires': 0}
+        cache.set('a', entry)
+        cache.set('b', entry)
+        cache.get('a')
+        cache.set('c', entry)
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats['evictions'], 1)
+
+    def test_sqlite_cache_persists(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'cache.sqlite')
+            entry = {'body': '{"data": []}', 'etag': '"v1"', 'last_modified': None, 'expires': 5.0}
+            cache = SQLiteCache(path, maxsize=2)
+            cache.set('a', entry)
+            cache.set('b', entry)
+            cache.set('c', entry)
+            self.assertEqual(len(cache), 2)
+            cache.close()
+
+            cache = SQLiteCache(path)
+            self.assertEqual(cache.get('c'), entry)
+            cache.close()
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    @patch('bild.requests.Session.request')
+    def test_concurrent_identical_gets_share_one_request(self, mock_request):
+        started = threading.Event()
+
+        def slow_response(method, url, **kwargs):
+            started.set()
+            time.sleep(0.1)
+            return make_response()
+
+        mock_request.side_effect = slow_response
+        bild = Bild(token='test_token')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            leader = executor.submit(bild.get_latest_file_version, 'p1', 'b1', 'f1')
+            started.wait()
+            followers = [executor.submit(bild.get_latest_file_version, 'p1', 'b1', 'f1') for _ in range(7)]
+            other = executor.submit(bild.get_latest_file_version, 'p1', 'b1', 'f2')
+            results = [future.result() for future in [leader, *followers]]
+            other.result()
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(bild.single_flight.stats, {'calls': 2, 'shared': 7})
+
+    @patch('bild.requests.Session.request')
+    def test_errors_are_shared_and_not_remembered(self, mock_request):
+        started = threading.Event()
+
+        def failing(method, url, **kwargs):
+            started.set()
+            time.sleep(0.05)
+            raise ValueError('boom')
+
+        mock_request.side_effect = failing
+        bild = Bild(token='test_token')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(bild.get_all_users)
+            started.wait()
+            second = executor.submit(bild.get_all_users)
+            for future in (first, second):
+                with self.assertRaises(ValueError):
+                    future.result()
+        self.assertEqual(mock_request.call_count, 1)
+
+        mock_request.side_effect = None
+        mock_request.return_value = make_response()
+        bild.get_all_users()
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('bild.requests.Session.request')
+    def test_coalescing_can_be_disabled(self, mock_request):
+        mock_request.return_value = make_response()
+        bild = Bild(token='test_token', coalesce=False)
+        self.assertIsNone(bild.single_flight)
+        bild.get_all_users()
+        self.assertEqual(mock_request.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
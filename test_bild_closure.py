@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from bild import Bild
+
+
+# rover uses chassis and wheel twice, chassis also uses wheel: wheel's closure must only be fetched once
+CLOSURES = {
+    'rover': [
+        {"fileID": "chassis", "name": "chassis.sldasm"},
+        {"fileID": "wheel", "name": "wheel.sldasm"},
+        {"fileID": "frame", "name": "frame.sldprt"},
+        {"fileID": "tire", "name": "tire.sldprt"},
+        {"fileID": "bolt", "name": "bolt.sldprt"},
+        {"fileID": "panel", "name": "panel.sldprt"},
+    ],
+    'chassis': [
+        {"fileID": "frame", "name": "frame.sldprt"},
+        {"fileID": "wheel", "name": "wheel.sldasm"},
+        {"fileID": "tire", "name": "tire.sldprt"},
+        {"fileID": "bolt", "name": "bolt.sldprt"},
+    ],
+    'wheel': [
+        {"fileID": "tire", "name": "tire.sldprt"},
+        {"fileID": "bolt", "name": "bolt.sldprt"},
+    ],
+}
+
+
+def fake_closure(method, url, params=None, **kwargs):
+    response = MagicMock()
+    if url.endswith('/branches/b1/files'):
+        response.json.return_value = {"data": [{"id": "rover", "name": "rover.sldasm"}, {"id": "bolt", "name": "bolt.sldprt"}]}
+    else:
+        response.json.return_value = {"data": CLOSURES[url.split('/')[-2]]}
+    return response
+
+
+class TestClosureGraph(unittest.TestCase):
+
+    @patch('bild.requests.Session.request', side_effect=fake_closure)
+    def test_memoized_expansion_and_queries(self, mock_request):
+        graph = Bild(token='test_token').closure_graph('p1', 'b1', workers=2).expand_branch()
+
+        fetched = sorted(call.args[1].split('/')[-2] for call in mock_request.call_args_list[1:])
+        self.assertEqual(fetched, ['chassis', 'rover', 'wheel'])
+        self.assertEqual(graph.stats['fetched'], 3)
+        self.assertEqual(graph.stats['reused'], 1)
+
+        self.assertEqual({key[0] for key in graph.children('rover')}, {'chassis', 'panel'})
+        self.assertEqual({key[0] for key in graph.children('chassis')}, {'frame', 'wheel'})
+        self.assertEqual({key[0] for key in graph.parts('rover')}, {'frame', 'tire', 'bolt', 'panel'})
+        self.assertEqual({key[0] for key in graph.where_used('bolt', direct=True)}, {'wheel'})
+        self.assertEqual({key[0] for key in graph.where_used('bolt')}, {'wheel', 'chassis', 'rover'})
+
+        # Expanding again reuses every memoized closure
+        graph.expand(['chassis', ('wheel', None, None)])
+        self.assertEqual(graph.stats['fetched'], 3)
+
+    @patch('bild.requests.Session.request', side_effect=fake_closure)
+    def test_version_and_configuration_are_sent(self, mock_request):
+        graph = Bild(token='test_token').closure_graph('p1', 'b1')
+        graph.expand([('wheel', 'v7', 'Default')])
+
+        self.assertEqual(mock_request.call_args.kwargs['params'], {'fileVersionID': 'v7', 'configuration': 'Default'})
+        self.assertEqual(len(graph.closure(('wheel', 'v7', 'Default'))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
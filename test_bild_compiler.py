@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from bild_retry import RetryPolicy
+from compiler.bild import Bild as GeneratedBild
+from compiler.buildFunction import HERE, generate, snake_name, load_spec
+from compiler.parse_pages import PARSERS, compile_snapshots, get_parser, parse_endpoint, snapshot_paths, write_catalog
+
+
+OPENAPI = {
+    "openapi": "3.0.0",
+    "components": {"parameters": {"Project": {"name": "projectId", "in": "path", "required": True, "schema": {"type": "string"}}}},
+    "paths": {
+        "/projects/{projectId}/tags": {
+            "parameters": [{"$ref": "#/components/parameters/Project"}],
+            "get": {
+                "operationId": "listTags",
+                "parameters": [{"name": "limit", "in": "query", "schema": {"type": "integer"}}],
+            },
+            "post": {"summary": "Create Tag", "requestBody": {}},
+        },
+    },
+}
+
+PAGE = '''<html><head><script>var x = "<p>no</p>";</script></head><body>
+<div class="sidebar"><p>GET</p><p>Get a list of packages in project</p></div>
+<p style="font-size: var(--px-font-size-large); font-style: normal; font-weight: 600; line-height: normal; text-transform: capitalize; color: rgb(60, 57, 55);">Get a list of packages in project</p>
+<div style="width: 100%; display: flex; flex-direction: row; align-items: center; padding: 6px 5px; border-radius: 8px; gap: 12px; position: sticky; top: -24px; z-index: 0; font-size: var(--px-font-size-xsmall); background: var(--px-color-neutral-100); border: 1px solid var(--px-color-neutral-200);">
+<span>GET</span><span>https://sandbox-api.getbild.com/projects/{projectID}/packages</span><button>Change Base URL Selection</button></div>
+<p class="PxEditorLexicalTheme__paragraph">This endpoint returns all packages in the project.</p>
+<h3>Path Params</h3><div><b>projectID</b><i>string</i></div>
+<h3>Query Params</h3><div><b>pageSize</b><i>integer</i></div><div><b>status</b><i>string</i><br/>Filter by status</div>
+<h3>Responses</h3><div><b>data</b><i>array</i></div>
+</body></html>'''
+
+
+class TestBildCompiler(unittest.TestCase):
+
+    def test_checked_in_client_is_up_to_date(self):
+        with tempfile.TemporaryDirectory() as folder:
+            start = time.perf_counter()
+            paths = generate(output_dir=folder)
+            self.assertLess(time.perf_counter() - start, 1)
+            for path in paths:
+                with open(path, encoding='utf-8') as generated, open(os.path.join(HERE, os.path.basename(path)), encoding='utf-8') as checked_in:
+                    self.assertEqual(generated.read(), checked_in.read(), f'{os.path.basename(path)} is stale, run python compiler/buildFunction.py')
+
+    def test_openapi_spec(self):
+        with tempfile.TemporaryDirectory() as folder:
+            spec = os.path.join(folder, 'openapi.json')
+            with open(spec, 'w') as file:
+                json.dump(OPENAPI, file)
+            sync, _ = generate(spec, folder)
+            with open(sync) as file:
+                source = file.read()
+        self.assertIn("def list_tags(self, projectId: str = None, params: dict = None, *, limit: int = None):", source)
+        self.assertIn("suffix = f'/projects/{projectId or self.project}/tags'", source)
+        self.assertIn("def create_tag(self, projectId: str = None, params: dict = None, data: dict = None):", source)
+        self.assertIn("return self.request('POST', suffix, params=params, data=data)", source)
+        self.assertEqual(snake_name('Get A List Of ECOs In The Project'), 'get_ecos_in_project')
+
+    @patch('compiler.bild.requests.Session.request')
+    def test_path_and_query_params_are_sent(self, mock_request):
+        mock_request.return_value = MagicMock()
+        bild = GeneratedBild(token='test_token')
+        bild.set_project('p1')
+
+        bild.get_feedback_item_details_by_id(feedbackItemID='fb1')
+        bild.get_commits_of_project(pageSize=10)
+
+        self.assertEqual(mock_request.call_args_list[0].args[1], 'https://api.getbild.com/projects/p1/feedbackItems/fb1')
+        self.assertEqual(mock_request.call_args_list[1].args[1], 'https://api.getbild.com/projects/p1/commits')
+        self.assertEqual(mock_request.call_args_list[1].kwargs['params'], {'pageSize': 10})
+
+    @patch('compiler.bild.requests.Session.request')
+    def test_throttled_requests_are_retried(self, mock_request):
+        throttled = MagicMock(ok=False, status_code=503, headers={})
+        mock_request.side_effect = [throttled, MagicMock(ok=True, status_code=200, json=lambda: {'data': []})]
+        rate_limiter = MagicMock()
+        bild = GeneratedBild(token='test_token', retry=RetryPolicy(backoff=0, jitter=False), rate_limiter=rate_limiter)
+
+        self.assertEqual(bild.get_all_users_in_bild_account(), {'data': []})
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(rate_limiter.acquire.call_count, 2)
+        throttled.close.assert_called_once()
+
+
+class TestParsePages(unittest.TestCase):
+
+    def test_every_installed_parser_extracts_the_endpoint(self):
+        expected = {
+            "name": "Get A List Of Packages In Project",
+            "request_type": "GET",
+            "url": "https://sandbox-api.getbild.com/projects/{projectID}/packages",
+            "description": "This endpoint returns all packages in the project.",
+            "query": {"pageSize": "int", "status": "str"},
+        }
+        for name, factory in PARSERS.items():
+            try:
+                parser = factory()
+            except ImportError:
+                continue
+            with self.subTest(parser=name):
+                self.assertEqual(parse_endpoint(PAGE, parser), expected)
+        self.assertIsNone(parse_endpoint('<html><body><p>Introduction</p></body></html>', get_parser('html.parser')))
+
+    def test_snapshots_to_catalog(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for index in range(3):
+                with open(os.path.join(folder, f'{index}.html'), 'w', encoding='utf-8') as file:
+                    file.write(PAGE if index < 2 else '<html></html>')
+            endpoints = compile_snapshots(snapshot_paths(folder), workers=2, parser='html.parser')
+            self.assertEqual(len(endpoints), 1)
+
+            output = os.path.join(folder, 'data.json')
+            write_catalog(endpoints, output)
+            spec = load_spec(output)
+        self.assertEqual(spec[0]['path'], '/projects/{projectID}/packages')
+        self.assertEqual(spec[0]['query'], {'pageSize': 'int', 'status': 'str'})
+
+
+if __name__ == '__main__':
+    unittest.main()
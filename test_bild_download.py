@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+import tracemalloc
+import unittest
+from bild import Bild
+from bild_download import download_file
+from bild_mock import MockServer
+from bild_retry import RetryPolicy
+
+
+SIZE = 1000003
+
+
+class TestBildDownload(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, 'assembly.step')
+
+    def download(self, server, **kwargs):
+        bild = Bild(token='mock', baseurl=server.url, retry=RetryPolicy(backoff=0, jitter=False))
+        url = f'{server.url}/downloads/assembly.step?size={SIZE}'
+        expected = b''.join(server.download_chunks('assembly.step', 0, SIZE))
+        size = bild.download_file(url, self.path, checksum=hashlib.sha256(expected).hexdigest(), **kwargs)
+        self.assertEqual(size, SIZE)
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), expected)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['assembly.step'])
+
+    def test_interrupted_download_resumes(self):
+        with MockServer(interrupted_downloads=2) as server:
+            self.download(server, chunk_size=4096)
+        self.assertEqual(server.stats['statuses'], {200: 1, 206: 2})
+
+    def test_resumes_a_previous_run(self):
+        with MockServer() as server:
+            with open(f'{self.path}.part', 'wb') as file:
+                file.write(b''.join(server.download_chunks('assembly.step', 0, 1000)))
+            self.download(server)
+        self.assertEqual(server.stats['statuses'], {206: 1})
+
+    def test_parallel_segments(self):
+        with MockServer(interrupted_downloads=2) as server:
+            url = f'{server.url}/downloads/assembly.step?size={SIZE}'
+            expected = b''.join(server.download_chunks('assembly.step', 0, SIZE))
+            size = download_file(Bild(token='mock').session, url, self.path, 4096, hashlib.md5(expected).hexdigest(), 'md5',
+                                 segments=4, min_segment_size=SIZE // 8, retry=RetryPolicy(backoff=0, jitter=False))
+        self.assertEqual(size, SIZE)
+        with open(self.path, 'rb') as file:
+            self.assertEqual(file.read(), expected)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['assembly.step'])
+        # The size probe (cut off), four segments and the one resumed
+        self.assertEqual(server.stats['statuses'], {206: 6})
+
+    def test_checksum_mismatch(self):
+        with MockServer() as server:
+            with self.assertRaises(Exception) as error:
+                Bild(token='mock', baseurl=server.url).download_file(f'{server.url}/downloads/a.stl', self.path, checksum='00')
+        self.assertIn('Checksum mismatch', str(error.exception))
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+    def test_memory_stays_flat(self):
+        with MockServer() as server:
+            bild = Bild(token='mock', baseurl=server.url)
+            tracemalloc.start()
+            bild.download_file(f'{server.url}/downloads/big.step?size={32 * 1024 * 1024}', self.path, chunk_size=65536)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.assertEqual(os.path.getsize(self.path), 32 * 1024 * 1024)
+        self.assertLess(peak, 4 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_export import conversion_result
+from bild_retry import TokenBucket
+
+
+class TestBatchExport(unittest.TestCase):
+
+    def setUp(self):
+        self.polls = {}
+
+        def fake_api(method, url, json=None, **kwargs):
+            # Each conversion is pending on the first poll and ready on the second, f3 always fails
+            file_id = url.split('/')[-2]
+            self.polls[file_id] = self.polls.get(file_id, 0) + 1
+            response = MagicMock()
+            if file_id == 'f3':
+                response.json.return_value = {"data": {"status": "FAILED"}}
+            elif self.polls[file_id] == 1:
+                response.json.return_value = {"data": {"status": "IN_PROGRESS"}}
+            else:
+                response.json.return_value = {"data": {"status": "COMPLETED", "url": f"https://files.example.com/{file_id}.{json['universalFileFormat']}"}}
+            return response
+
+        def fake_download(url, stream=False, **kwargs):
+            response = MagicMock()
+            response.iter_content.return_value = [b'solid ', url.encode()]
+            download = MagicMock()
+            download.__enter__.return_value = response
+            return download
+
+        patcher = patch('bild.requests.Session.request', side_effect=fake_api)
+        self.mock_request = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('bild.requests.Session.get', side_effect=fake_download)
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_run_and_resume(self):
+        jobs = [
+            ('p1', 'b1', 'f1', 'v1', 'stl'),
+            ('p1', 'b1', 'f2', 'v3', 'step'),
+            ('p1', 'b1', 'f3', 'v1', 'stl'),
+            ('p1', 'b1', 'f1', 'v1', 'stl'),
+        ]
+        bild = Bild(token='test_token')
+        with tempfile.TemporaryDirectory() as folder:
+            report = bild.batch_export(jobs, folder, workers=2, rate=0, poll_interval=0).run()
+
+            self.assertEqual(report['done'], 2)
+            self.assertIn('p1/b1/f3/v1/stl', report['failed'])
+            with open(os.path.join(folder, 'f2_v3.step'), 'rb') as file:
+                self.assertEqual(file.read(), b'solid https://files.example.com/f2.step')
+            self.assertFalse(os.path.exists(os.path.join(folder, 'f1_v1.stl.part')))
+            self.assertEqual(self.mock_get.call_count, 2)
+
+            # A second run only retries the failed job
+            report = bild.batch_export(jobs, folder, workers=2, rate=0, poll_interval=0).run()
+            self.assertEqual(report['skipped'], 2)
+            self.assertEqual(report['done'], 0)
+            self.assertEqual(self.mock_get.call_count, 2)
+
+    def test_shares_the_client_rate_limiter(self):
+        rate_limiter = MagicMock()
+        bild = Bild(token='test_token', rate_limiter=rate_limiter)
+        with tempfile.TemporaryDirectory() as folder:
+            export = bild.batch_export([('p1', 'b1', 'f1', 'v1', 'stl'), ('p1', 'b1', 'f2', 'v1', 'stl')], folder,
+                                       rate=1000, poll_interval=0)
+            self.assertIsInstance(export.rate_cap, TokenBucket)
+            export.rate_cap = MagicMock()
+            self.assertEqual(export.run()['done'], 2)
+
+        # Every conversion request took a token from the client's own budget, the cap only counted the submissions
+        self.assertEqual(self.mock_request.call_count, 4)
+        self.assertEqual(rate_limiter.acquire.call_count, 4)
+        self.assertEqual(export.rate_cap.acquire.call_count, 2)
+
+    def test_conversion_result(self):
+        self.assertEqual(conversion_result({"data": {"url": "https://x/y.stl"}}), ('done', 'https://x/y.stl'))
+        self.assertEqual(conversion_result({"data": {"status": "PENDING"}}), ('pending', None))
+        self.assertEqual(conversion_result({"data": {"status": "ERROR"}}), ('failed', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
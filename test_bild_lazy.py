@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from bild import Bild
+from bild_lazy import LazyModule, lazy
+from bild_mock import MockServer
+
+
+HEAVY = ['requests', 'urllib3', 'sqlite3', 'http.server', 'concurrent.futures', 'email.utils', 'bild_models', 'bild_metrics',
+         'dotenv', 'selenium', 'bs4', 'openai']
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_defers_heavy_modules(self):
+        code = ('import json, sys\n'
+                'import bild\n'
+                'before = [name for name in %r if name in sys.modules]\n'
+                'client = bild.Bild(token="test_token")\n'
+                'constructed = "requests" in sys.modules\n'
+                'client.session\n'
+                'print(json.dumps([before, constructed, "requests" in sys.modules]))' % HEAVY)
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        # Bild() doesn't import requests either, its session is created on first use
+        self.assertEqual(json.loads(output), [[], False, True])
+
+    def test_lazy_module(self):
+        self.assertIs(lazy('json'), json)
+        module = LazyModule('colorsys')
+        self.assertEqual(module.rgb_to_hsv(1, 0, 0), (0.0, 1.0, 1))
+        self.assertIn('(loaded)', repr(module))
+
+
+class TestWarmUp(unittest.TestCase):
+
+    @patch('bild.requests.Session.head')
+    @patch.object(Bild, 'open_connection', side_effect=AttributeError('_get_conn'))
+    def test_falls_back_to_head_without_pool_internals(self, mock_open, mock_head):
+        bild = Bild(token='mock', baseurl='http://127.0.0.1:9', timeout=1)
+        self.assertGreater(bild.warm_up(), 0)
+        mock_head.assert_called_once_with('http://127.0.0.1:9', timeout=1)
+        mock_head.return_value.close.assert_called_once()
+
+    def test_first_request_reuses_the_warm_connection(self):
+        with MockServer() as server:
+            bild = Bild(token='mock', baseurl=server.url)
+            self.assertGreater(bild.warm_up(), 0)
+            pools = bild.session.get_adapter(server.url).poolmanager.pools
+            bild.get_all_users()
+            bild.get_all_projects()
+            # The requests went through the pool warmed up, on its one connection
+            self.assertEqual(len(pools), 1)
+            self.assertEqual(pools[next(iter(pools.keys()))].num_connections, 1)
+
+    def test_unreachable_host(self):
+        bild = Bild(token='mock', baseurl='http://127.0.0.1:9', timeout=1)
+        self.assertIsNone(bild.warm_up(quiet=True))
+        with self.assertRaises(Exception):
+            bild.warm_up()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import urllib.request
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_metrics import Hooks, Metrics, endpoint, tracing_hooks
+from bild_mock import MockServer
+from bild_retry import RetryPolicy
+
+
+class TestBildMetrics(unittest.TestCase):
+
+    def test_endpoint_templates(self):
+        self.assertEqual(endpoint('/projects/p1/branches/b1/files/f1/versions/v1/metadata'),
+                         '/projects/{projectID}/branches/{branchID}/files/{fileID}/versions/{fileVersionID}/metadata')
+        self.assertEqual(endpoint('/files/released'), '/files/released')
+        self.assertEqual(endpoint('/users/add'), '/users/add')
+
+    @patch('bild.requests.Session.request')
+    def test_hooks(self, mock_request):
+        throttled, ok = MagicMock(status_code=503, ok=False, headers={}), MagicMock(status_code=200, ok=True)
+        mock_request.side_effect = [throttled, ok]
+        hooks, events = Hooks(), []
+        for event in ('before_request', 'after_request', 'retry', 'error', 'decode'):
+            hooks.on(event, lambda event=event, **info: events.append((event, info.get('attempt'))))
+
+        Bild(token='test_token', hooks=hooks, retry=RetryPolicy(backoff=0, jitter=False)).get_all_users()
+        self.assertEqual(events, [('before_request', 0), ('after_request', 0), ('retry', 0),
+                                  ('before_request', 1), ('after_request', 1), ('decode', None)])
+        with self.assertRaises(Exception):
+            hooks.on('finished', print)
+
+    def test_metrics(self):
+        metrics = Metrics()
+        with MockServer() as server:
+            bild = Bild(token='mock', baseurl=server.url, metrics=metrics, retry=RetryPolicy(max_retries=0))
+            for _ in range(3):
+                bild.get_metadata_from_file('p0', 'p0-b0', 'p0-b0-f1')
+            with self.assertRaises(Exception):
+                bild.get_commit_details('p0', 'p0-b0', 'missing')
+
+        phases = metrics.summary()['GET /projects/{projectID}/branches/{branchID}/files/{fileID}/metadata']
+        self.assertEqual(sorted(phases), ['connect', 'decode', 'download', 'total', 'ttfb'])
+        self.assertEqual(phases['connect']['count'], 1)
+        self.assertEqual(phases['total']['count'], 3)
+
+        text = metrics.to_prometheus()
+        labels = 'method="GET",endpoint="/projects/{projectID}/branches/{branchID}/files/{fileID}/metadata",phase="total"'
+        self.assertIn(f'bild_request_seconds_bucket{{{labels},le="+Inf"}} 3', text)
+        self.assertIn(f'bild_request_seconds_count{{{labels}}} 3', text)
+        self.assertIn('bild_errors_total{method="GET",endpoint="/projects/{projectID}/branches/{branchID}/commits/{commitID}",reason="404"} 1', text)
+
+    def test_serve_is_local_by_default(self):
+        server = Metrics().serve(port=0)
+        try:
+            host, port = server.server_address
+            self.assertEqual(host, '127.0.0.1')
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as response:
+                self.assertEqual(response.status, 200)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @patch('bild.requests.Session.request')
+    def test_tracing_hooks(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=200, ok=True)
+        tracer = MagicMock()
+        Bild(token='test_token', hooks=tracing_hooks(tracer)).get_all_files('p1')
+        self.assertEqual(tracer.start_span.call_args.args[0], 'GET /projects/{projectID}/files')
+        span = tracer.start_span.return_value
+        span.set_attribute.assert_called_with('http.response.status_code', 200)
+        span.end.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+from bild import Bild
+from bild_mock import MockDataset, MockServer, match_route
+from bild_retry import RetryPolicy
+
+
+class TestBildMock(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockServer(MockDataset(projects=2, files=30, commits=45)).start()
+        self.bild = Bild(token='mock', baseurl=self.server.url)
+
+    def tearDown(self):
+        self.bild.close()
+        self.server.stop()
+
+    def test_every_catalog_endpoint_is_served(self):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compiler', 'data.json')) as file:
+            catalog = json.load(file)
+        for endpoints in catalog.values():
+            for endpoint in endpoints:
+                path = '/' + endpoint['url'].split('://', 1)[1].split('/', 1)[1]
+                with self.subTest(path=path):
+                    self.assertIsNotNone(match_route(endpoint['request_type'], path)[1])
+
+    def test_crawl(self):
+        self.assertEqual(len(self.bild.get_all_users()['data']), 20)
+        self.assertEqual([project['id'] for project in self.bild.get_all_projects()['data']], ['p0', 'p1'])
+        self.bild.set_project('p0')
+        self.bild.set_branch('p0-b0')
+        commits = list(self.bild.iter_commits_of_branch(page_size=10))
+        self.assertEqual(len(commits), 45)
+        self.assertEqual(len({commit['id'] for commit in commits}), 45)
+        self.assertEqual(len(self.bild.get_all_files_for_branch()['data']), 3)
+        self.assertEqual(self.bild.get_metadata_from_file(file_id='p0-b0-f3')['data']['partNumber'], 'PN-000003')
+
+        graph = self.bild.closure_graph().expand_branch()
+        self.assertEqual(len(graph.children('p0-b0-f0')), 5)
+        with self.assertRaises(Exception) as error:
+            self.bild.get_commit_details(commit_id='missing')
+        self.assertEqual(str(error.exception), self.bild.path_error)
+        self.assertEqual(self.server.stats['statuses'][404], 1)
+
+    def test_same_seed_same_data(self):
+        self.assertEqual(MockDataset(seed=3).users, MockDataset(seed=3).users)
+        self.assertNotEqual(MockDataset(seed=3).commits, MockDataset(seed=4).commits)
+
+    def test_errors_and_throttling(self):
+        with MockServer(error_rate=1.0) as server:
+            with self.assertRaises(Exception):
+                Bild(token='mock', baseurl=server.url, retry=RetryPolicy(max_retries=0)).get_all_users()
+        with MockServer(rate_limit=5, retry_after=0.05) as server:
+            bild = Bild(token='mock', baseurl=server.url, retry=RetryPolicy(max_retries=20))
+            for _ in range(8):
+                bild.get_all_projects()
+            self.assertGreater(server.stats['statuses'][429], 0)
+            self.assertEqual(server.stats['statuses'][200], 8)
+
+    def test_batch_export(self):
+        with tempfile.TemporaryDirectory() as folder:
+            jobs = [('p0', 'p0-b0', f'p0-b0-f{number}', f'p0-b0-f{number}-v2', 'stl') for number in range(3)]
+            report = self.bild.batch_export(jobs, folder, rate=100, poll_interval=0.01).run()
+            self.assertEqual(report['done'], 3)
+            self.assertEqual(report['bytes'], 3 * self.server.download_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
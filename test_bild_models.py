@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_bulk import flatten_files
+from bild_mirror import BildMirror, first
+from bild_mock import MockDataset, MockServer
+from bild_sync import BildSync
+from bild_models import Commit, File, ModelList, User, endpoint_model
+
+
+USER = {
+    "id": "u1", "name": "Ada", "email": "ada@example.com", "role": "Admin",
+    "projects": [{"id": "p1", "name": "Rover", "accessType": "Editor"}],
+    "lastLogin": 1700000000000,
+}
+
+
+class TestBildModels(unittest.TestCase):
+
+    def test_slotted_fields_and_extras(self):
+        user = User(USER)
+        self.assertFalse(hasattr(user, '__dict__'))
+        self.assertEqual(user.email, 'ada@example.com')
+        self.assertEqual(user.extra, {"lastLogin": 1700000000000})
+        self.assertIsNone(user.accessType)
+        self.assertEqual(user.to_dict(), USER)
+
+    def test_shared_values_are_interned(self):
+        files = [File(item) for item in json.loads('[{"fileID": "f1", "projectID": "p-1"}, {"fileID": "f2", "projectID": "p-1"}]')]
+        self.assertIs(files[0].projectID, files[1].projectID)
+
+    def test_nested_models_are_parsed_on_first_access(self):
+        user = User(USER)
+        self.assertIsInstance(user._projects[0], dict)
+        projects = user.projects
+        self.assertIsInstance(projects, ModelList)
+        self.assertEqual(projects[0].name, 'Rover')
+        self.assertEqual(projects[0].extra, {"accessType": "Editor"})
+        self.assertIs(user.projects, projects)
+
+    def test_timestamps(self):
+        commit = Commit({"id": "c1", "createdAt": 1700000000000, "files": []})
+        self.assertEqual(commit.createdAt, datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc))
+        self.assertEqual(Commit({"createdAt": "2024-01-02T03:04:05Z"}).createdAt.year, 2024)
+        self.assertEqual(commit.to_dict()['createdAt'], 1700000000000)
+        # Dict-style access keeps the raw value, as code written against the raw dicts expects
+        self.assertEqual(commit['createdAt'], 1700000000000)
+        self.assertEqual(Commit({"createdAt": "2024-01-02T03:04:05Z"}).get('createdAt'), "2024-01-02T03:04:05Z")
+
+    def test_dict_style_access(self):
+        tree = [{"type": "folder", "children": [{"fileID": "f1", "name": "a.sldprt", "isAssembly": False}]}]
+        files = list(flatten_files(ModelList(File(node) for node in tree)))
+        self.assertEqual(files[0].name, 'a.sldprt')
+        self.assertEqual(first(files[0], 'id', 'fileID'), 'f1')
+        self.assertIs(files[0].get('isAssembly'), False)
+        self.assertIn('name', files[0])
+        with self.assertRaises(KeyError):
+            files[0]['partNumber']
+
+    def test_endpoint_models(self):
+        self.assertIs(endpoint_model('/files/released'), File)
+        self.assertIs(endpoint_model('/projects/p1/branches/b1/commits/c1'), Commit)
+        self.assertIsNone(endpoint_model('/projects/p1/branches/b1/files/f1/versions/v1/metadata'))
+        self.assertIsNone(endpoint_model('/metadataFields'))
+
+    @patch('bild.requests.Session.request')
+    def test_client_returns_models_when_enabled(self, mock_request):
+        response = MagicMock()
+        response.json.return_value = {"data": [USER], "message": "Success"}
+        mock_request.return_value = response
+
+        result = Bild(token='test_token', models=True).get_all_users()
+        self.assertEqual(result['message'], 'Success')
+        self.assertIsInstance(result['data'][0], User)
+
+        response.json.return_value = {"data": {"id": "c1", "files": [{"fileID": "f1"}]}}
+        commit = Bild(token='test_token', models=True).get_commit_details('p1', 'b1', 'c1')['data']
+        self.assertEqual(commit.files[0].fileID, 'f1')
+
+        response.json.return_value = {"data": [USER]}
+        self.assertIsInstance(Bild(token='test_token').get_all_users()['data'][0], dict)
+
+    def test_helpers_store_plain_dicts_with_models(self):
+        with MockServer(MockDataset(projects=2, files=5)) as server, tempfile.TemporaryDirectory() as folder:
+            bild = Bild(token='mock', baseurl=server.url, models=True)
+            path = os.path.join(folder, 'metadata.jsonl')
+            bild.bulk_file_metadata('p0', 'p0-b0').write(path)
+            with open(path, encoding='utf-8') as file:
+                self.assertEqual(len([json.loads(line) for line in file]), 5)
+
+            mirror = BildMirror(':memory:')
+            report = BildSync(bild, mirror).run()
+            self.assertEqual((report['users'], report['files']), (20, 10))
+            self.assertEqual(mirror.count('users'), 20)
+
+            # The models client still gets models, its raw() copy dicts
+            self.assertIsInstance(bild.get_all_users()['data'][0], User)
+            self.assertIsInstance(bild.raw().get_all_users()['data'][0], dict)
+            self.assertIs(Bild(token='test_token').raw().models, False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from bild import Bild
+from bild_mock import MockDataset, MockServer
+from bild_permissions import PermissionsMatrix
+
+
+class TestPermissionsMatrix(unittest.TestCase):
+
+    def test_sweep_reuses_embedded_access(self):
+        dataset = MockDataset(projects=6, users=30)
+        with MockServer(dataset) as server:
+            bild = Bild(token='mock', baseurl=server.url)
+            matrix = bild.permissions_matrix()
+            self.assertEqual(server.stats['requests'], 2)
+            self.assertEqual(bild.permissions_matrix(verify=True), matrix)
+            self.assertEqual(server.stats['routes']['GET /projects/{projectID}/users'], 6)
+
+        expected = {(user['id'], project['id'], user['accessType']) for project in dataset.projects for user in project['users']}
+        self.assertEqual(set(matrix), expected)
+        user, project, access = sorted(expected)[0]
+        self.assertEqual(matrix.access(user, project), access)
+        self.assertEqual(matrix.projects_of(user)[project], access)
+        self.assertEqual(matrix.users_of(project)[user], access)
+        self.assertIsNone(matrix.access(user, 'p404'))
+        self.assertEqual(sum(matrix.counts().values()), len(expected))
+        self.assertEqual(matrix.emails['u0'], 'user0@example.com')
+
+    def test_diff_and_snapshots(self):
+        old = PermissionsMatrix.from_cells([('u1', 'p1', 'Editor'), ('u1', 'p2', 'Viewer'), ('u2', 'p1', 'Viewer')])
+        new = PermissionsMatrix.from_cells([('u3', 'p3', 'Editor'), ('u2', 'p1', 'Editor'), ('u1', 'p1', 'Editor')])
+        self.assertEqual(old.diff(new), {
+            'added': [('u3', 'p3', 'Editor')],
+            'removed': [('u1', 'p2', 'Viewer')],
+            'changed': [('u2', 'p1', 'Viewer', 'Editor')],
+        })
+        self.assertEqual(new.diff(new), {'added': [], 'removed': [], 'changed': []})
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'access.json')
+            new.save(path)
+            loaded = PermissionsMatrix.load(path)
+        self.assertEqual(loaded, new)
+        self.assertEqual(loaded.keys, new.keys)
+        self.assertEqual(loaded.users_of('p1', 'Editor'), {'u1': 'Editor', 'u2': 'Editor'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from bild_mock import MockServer
+from bild_pool import BildPool
+
+
+class TestBildPool(unittest.TestCase):
+
+    @patch('bild.requests.Session.request')
+    def test_routes_calls_by_tenant(self, mock_request):
+        def fake_api(method, url, headers=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = {"data": [{"token": headers['Authorization']}], "message": "Success"}
+            return response
+        mock_request.side_effect = fake_api
+
+        with BildPool({'acme': 'token_a', 'globex': 'token_b'}, workers=4, rate=100) as pool:
+            futures = {tenant: pool.submit(tenant, 'get_all_users') for tenant in ('acme', 'globex')}
+            files = pool.map('globex', 'get_all_files', ['p1', 'p2'])
+            self.assertEqual(futures['acme'].result()['data'], [{"token": 'Bearer token_a'}])
+            self.assertEqual(futures['globex'].result()['data'], [{"token": 'Bearer token_b'}])
+            self.assertEqual([future.result()['data'][0]['token'] for future in files], ['Bearer token_b'] * 2)
+
+            # One client, connection pool and rate budget per account
+            self.assertIs(pool.client('acme'), pool.client('acme'))
+            self.assertIsNot(pool.client('acme').rate_limiter, pool.client('globex').rate_limiter)
+            with self.assertRaises(Exception):
+                pool.submit('initech', 'get_all_users')
+        self.assertEqual(pool.stats['globex'], {'submitted': 3, 'completed': 3, 'failed': 0, 'cancelled': 0, 'running': 0})
+
+    @patch('bild.requests.Session.request')
+    def test_token_rotation_and_close(self, mock_request):
+        def fake_api(method, url, headers=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = {"data": [{"token": headers['Authorization']}], "message": "Success"}
+            return response
+        mock_request.side_effect = fake_api
+
+        pool = BildPool({'acme': 'token_a', 'globex': 'token_b'}, workers=2)
+        old = pool.client('acme')
+        with patch.object(old, 'close') as old_close:
+            pool.add_tenant('acme', 'token_c')
+        old_close.assert_called_once()
+        self.assertIsNot(pool.client('acme'), old)
+        self.assertEqual(pool.submit('acme', 'get_all_users').result()['data'], [{"token": 'Bearer token_c'}])
+
+        # Without waiting, the sessions are closed all the same
+        clients = [pool.client('acme'), pool.client('globex')]
+        with patch('bild.Bild.close') as close:
+            pool.close(wait=False)
+        self.assertEqual(close.call_count, len(clients))
+
+    def test_fair_scheduling(self):
+        order, started, gate = [], threading.Event(), threading.Event()
+
+        def record(client, tenant):
+            started.set()
+            gate.wait()
+            order.append(tenant)
+
+        pool = BildPool({'big': 'a', 'small': 'b', 'heavy': 'c'}, workers=1, weights={'heavy': 3})
+        first = pool.submit('big', record, 'big')
+        started.wait()
+        backlog = pool.map('big', record, ['big'] * 20)
+        pool.map('small', record, ['small'] * 3)
+        pool.map('heavy', record, ['heavy'] * 6)
+        backlog[-1].cancel()
+        gate.set()
+        pool.close()
+
+        self.assertTrue(first.done())
+        # After the call already running, the tenants take turns: one call of big, one of small, three of heavy
+        self.assertEqual(order[:11], ['big', 'big', 'small', 'heavy', 'heavy', 'heavy', 'big', 'small', 'heavy', 'heavy', 'heavy'])
+        self.assertEqual(order.count('big'), 20)
+        self.assertEqual(pool.stats['big']['cancelled'], 1)
+
+    def test_max_in_flight_and_errors(self):
+        running, peak, lock = {'count': 0}, {'count': 0}, threading.Lock()
+
+        def slow(client, index):
+            with lock:
+                running['count'] += 1
+                peak['count'] = max(peak['count'], running['count'])
+            try:
+                if index == 3:
+                    raise ValueError('bad file')
+                return index
+            finally:
+                with lock:
+                    running['count'] -= 1
+
+        with MockServer() as server:
+            with BildPool({'acme': 'a'}, workers=6, max_in_flight=2, baseurl=server.url) as pool:
+                futures = pool.map('acme', slow, range(30))
+                users = pool.submit('acme', 'get_all_users')
+                self.assertEqual(len(users.result()['data']), 20)
+        self.assertLessEqual(peak['count'], 2)
+        self.assertIsInstance(futures[3].exception(), ValueError)
+        self.assertEqual(pool.stats['acme']['failed'], 1)
+        self.assertEqual(pool.stats['acme']['completed'], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import exceptions
+from bild import Bild
+from bild_retry import RetryPolicy, TokenBucket, AdaptiveLimiter
+
+
+def make_response(status_code=200, headers=None, data=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.headers = headers or {}
+    response.text = 'error'
+    response.json.return_value = data or {"data": [], "message": "Success"}
+    return response
+
+
+@patch('bild.time.sleep')
+class TestRetry(unittest.TestCase):
+
+    @patch('bild.requests.Session.request')
+    def test_retry_after_is_honored(self, mock_request, mock_sleep):
+        mock_request.side_effect = [make_response(429, {'Retry-After': '2'}), make_response(200)]
+
+        result = Bild(token='test_token').get_all_users()
+
+        self.assertEqual(result, {"data": [], "message": "Success"})
+        self.assertEqual(mock_request.call_count, 2)
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch('bild.requests.Session.request')
+    @patch('bild_retry.time.time')
+    def test_retry_after_http_date(self, mock_time, mock_request, mock_sleep):
+        mock_time.return_value = 1735689600.0
+        mock_request.side_effect = [make_response(503, {'Retry-After': 'Wed, 01 Jan 2025 00:00:05 GMT'}), make_response(200)]
+
+        Bild(token='test_token').get_all_users()
+
+        mock_sleep.assert_called_once_with(5.0)
+
+    @patch('bild.requests.Session.request')
+    def test_gives_up_after_max_retries(self, mock_request, mock_sleep):
+        mock_request.return_value = make_response(503)
+
+        bild = Bild(token='test_token', retry=RetryPolicy(max_retries=2, backoff=1, jitter=False))
+        with self.assertRaises(Exception) as context:
+            bild.get_all_projects()
+
+        self.assertIn('503', str(context.exception))
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [1, 2])
+
+    @patch('bild.requests.Session.request')
+    def test_retried_streams_release_their_connection(self, mock_request, mock_sleep):
+        throttled, unavailable, success = make_response(429), make_response(503), make_response(200)
+        mock_request.side_effect = [throttled, unavailable, success]
+
+        bild = Bild(token='test_token', pool_block=True, retry=RetryPolicy(backoff=0, jitter=False))
+        response = bild.send('GET', '/users', stream=True)
+
+        self.assertIs(response, success)
+        self.assertTrue(all(call.kwargs['stream'] for call in mock_request.call_args_list))
+        throttled.close.assert_called_once()
+        unavailable.close.assert_called_once()
+        success.close.assert_not_called()
+
+    @patch('bild.requests.Session.request')
+    def test_non_idempotent_requests_are_not_retried_blindly(self, mock_request, mock_sleep):
+        bild = Bild(token='test_token')
+
+        mock_request.side_effect = [make_response(500)]
+        with self.assertRaises(Exception):
+            bild.add_users_to_bild(['a@example.com'])
+        self.assertEqual(mock_request.call_count, 1)
+
+        mock_request.reset_mock()
+        mock_request.side_effect = exceptions.ReadTimeout('read timed out')
+        with self.assertRaises(exceptions.ReadTimeout):
+            bild.add_users_to_bild(['a@example.com'])
+        self.assertEqual(mock_request.call_count, 1)
+
+        # A 429 was never processed by the server, so even the PUT is retried
+        mock_request.reset_mock()
+        mock_request.side_effect = [make_response(429), make_response(200)]
+        bild.add_users_to_bild(['a@example.com'])
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('bild.requests.Session.request')
+    def test_connection_errors_are_retried(self, mock_request, mock_sleep):
+        mock_request.side_effect = [exceptions.ConnectionError('reset'), make_response(200)]
+
+        Bild(token='test_token').get_all_users()
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('bild.requests.Session.request')
+    def test_error_messages(self, mock_request, mock_sleep):
+        bild = Bild(token='test_token')
+        mock_request.return_value = make_response(401)
+        with self.assertRaises(Exception) as context:
+            bild.get_all_users()
+        self.assertEqual(str(context.exception), bild.auth_error)
+
+        mock_request.return_value = make_response(404)
+        with self.assertRaises(Exception) as context:
+            bild.get_all_users()
+        self.assertEqual(str(context.exception), bild.path_error)
+
+    @patch('bild.requests.Session.request')
+    def test_adaptive_limiter_backs_off_on_throttling(self, mock_request, mock_sleep):
+        mock_request.side_effect = [make_response(429), make_response(429), make_response(200)]
+        adaptive = AdaptiveLimiter(limit=8)
+
+        Bild(token='test_token', adaptive=adaptive).get_all_users()
+
+        self.assertEqual(adaptive.limit, 2)
+        self.assertEqual(adaptive.throttles, 2)
+        self.assertEqual(adaptive.in_flight, 0)
+
+
+class TestLimiters(unittest.TestCase):
+
+    @patch('bild_retry.time.sleep')
+    @patch('bild_retry.time.monotonic')
+    def test_token_bucket_waits_for_tokens(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=2, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+
+        def advance(seconds):
+            mock_monotonic.return_value += seconds
+        mock_sleep.side_effect = advance
+        bucket.acquire()
+
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_adaptive_limiter_increases_after_successes(self):
+        adaptive = AdaptiveLimiter(limit=2, max_limit=3)
+        for _ in range(10):
+            adaptive.acquire()
+            adaptive.release()
+        self.assertEqual(adaptive.limit, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import unittest
+from bild import Bild
+from bild_mock import MockDataset, MockServer
+from bild_scheduler import BACKFILL, HIGH, URGENT, Scheduler
+from compiler.bild import Bild as GeneratedBild
+
+
+class TestScheduler(unittest.TestCase):
+
+    def blocked(self, scheduler):
+        '''
+        Occupies the only worker until the returned event is set.
+        '''
+        started, gate = threading.Event(), threading.Event()
+
+        def block(client):
+            started.set()
+            gate.wait()
+        scheduler.submit(block, priority=BACKFILL)
+        started.wait()
+        return gate
+
+    def test_priority_and_cancellation(self):
+        order = []
+
+        def record(client, name):
+            order.append(name)
+
+        with Bild(token='test_token').scheduler(workers=1) as scheduler:
+            gate = self.blocked(scheduler)
+            backfill = scheduler.map(record, [f'page{index}' for index in range(5)], priority=BACKFILL, tag='history')
+            scheduler.submit(record, 'late', priority=HIGH, deadline=60)
+            scheduler.submit(record, 'soon', priority=HIGH, deadline=30)
+            scheduler.submit(record, 'eco', priority=URGENT)
+            backfill[2].cancel()
+            self.assertEqual(scheduler.depth(), {'urgent': 1, 'high': 2, 'backfill': 4})
+            gate.set()
+            backfill[4].result()
+            self.assertEqual(scheduler.cancel(tag='history'), 0)
+
+        self.assertEqual(order, ['eco', 'soon', 'late', 'page0', 'page1', 'page3', 'page4'])
+        self.assertTrue(backfill[2].cancelled())
+        summary = scheduler.summary()
+        self.assertEqual(summary['backfill']['peak_queued'], 5)
+        self.assertEqual((summary['backfill']['completed'], summary['backfill']['cancelled']), (5, 1))
+        self.assertEqual(summary['urgent']['wait']['count'], 1)
+
+    def test_deadlines_and_bulk_cancel(self):
+        scheduler = Bild(token='test_token').scheduler(workers=1)
+        gate = self.blocked(scheduler)
+        expiring = scheduler.submit('get_all_users', priority=URGENT, deadline=0.05)
+        queued = scheduler.map('get_all_files', ['p1', 'p2', 'p3'], priority=BACKFILL, tag='history')
+        # Expired while the only worker is still busy
+        self.assertIsInstance(expiring.exception(timeout=5), TimeoutError)
+        self.assertEqual(scheduler.cancel(tag='history'), 3)
+        self.assertEqual(scheduler.depth(), {'urgent': 0, 'backfill': 0})
+        gate.set()
+        scheduler.close()
+        self.assertTrue(all(job.cancelled() for job in queued))
+        self.assertEqual(scheduler.summary()['urgent']['expired'], 1)
+        with self.assertRaises(Exception):
+            scheduler.submit('get_all_users')
+
+    def test_runs_client_calls_and_exports_metrics(self):
+        with MockServer(MockDataset(projects=4), latency=0.01) as server:
+            with Bild(token='mock', baseurl=server.url).scheduler(workers=2) as scheduler:
+                files = scheduler.map('get_all_files', ['p0', 'p1', 'p2', 'p3'], priority=BACKFILL)
+                users = scheduler.submit('get_all_users', priority=URGENT)
+                self.assertEqual(len(users.result()['data']), 20)
+                self.assertTrue(all(job.result()['data'] for job in files))
+                missing = scheduler.submit('get_all_files', 'p404')
+                self.assertIsNotNone(missing.exception())
+        text = scheduler.to_prometheus()
+        self.assertIn('bild_scheduler_queue_depth{priority="backfill"} 0', text)
+        self.assertIn('bild_scheduler_jobs_total{priority="normal",outcome="failed"} 1', text)
+        self.assertIn('bild_scheduler_wait_seconds_count{priority="urgent"} 1', text)
+        self.assertIn('bild_scheduler_run_seconds_bucket{priority="backfill",le="+Inf"} 4', text)
+
+    def test_generated_client_ecos_jump_backfill(self):
+        with MockServer(MockDataset(projects=3), latency=0.01) as server:
+            with Scheduler(GeneratedBild(token='mock', baseurl=server.url), workers=1) as scheduler:
+                gate = self.blocked(scheduler)
+                history = scheduler.map('get_commits_of_project', ['p0', 'p1', 'p2'], priority=BACKFILL, tag='history')
+                ecos = scheduler.submit('get_ecos_in_project', 'p1', priority=URGENT)
+                gate.set()
+                self.assertTrue(ecos.result()['data'])
+                self.assertTrue(all(job.result()['data'] for job in history))
+        self.assertLess(ecos.started, min(job.started for job in history))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_stream import JSONArrayStream
+
+
+def chunked(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestJSONArrayStream(unittest.TestCase):
+
+    def test_items_split_across_chunks(self):
+        body = {
+            "message": "Success",
+            "data": [{"id": str(i), "name": f"Ünïcode ✓ {i}", "size": 12345678, "tags": ["a", "b"]} for i in range(50)] + [3.25, None, True],
+            "lastEvaluatedKey": {"id": "49"},
+        }
+        raw = json.dumps(body, indent=2, ensure_ascii=False).encode()
+        for size in (1, 3, 7, 64, len(raw)):
+            stream = JSONArrayStream(chunked(raw, size))
+            self.assertEqual(list(stream), body['data'])
+            self.assertEqual(stream.extras, {"message": "Success", "lastEvaluatedKey": {"id": "49"}})
+
+    def test_empty_and_missing_data(self):
+        self.assertEqual(list(JSONArrayStream([b'{"data": [], "message": "ok"}'])), [])
+        self.assertEqual(list(JSONArrayStream([b'{}'])), [])
+        stream = JSONArrayStream([b'{"message": "no data"}'])
+        self.assertEqual(list(stream), [])
+        self.assertEqual(stream.extras, {"message": "no data"})
+
+    def test_truncated_body_raises(self):
+        with self.assertRaises(ValueError):
+            list(JSONArrayStream(chunked(b'{"data": [{"id": "1"}, {"id": "2', 4)))
+
+
+class TestBildStream(unittest.TestCase):
+
+    @patch('bild.requests.Session.request')
+    def test_stream_all_users(self, mock_request):
+        users = [{"id": str(i), "email": f"user{i}@example.com"} for i in range(10)]
+        response = MagicMock()
+        response.iter_content.return_value = chunked(json.dumps({"data": users, "message": "Success"}).encode(), 16)
+        mock_request.return_value = response
+
+        result = list(Bild(token='test_token').stream_all_users(chunk_size=16))
+
+        self.assertEqual(result, users)
+        self.assertTrue(mock_request.call_args.kwargs['stream'])
+        response.iter_content.assert_called_once_with(16)
+        response.__exit__.assert_called_once()
+
+    @patch('bild.requests.Session.request')
+    def test_stream_raises_on_error_status(self, mock_request):
+        response = MagicMock()
+        response.ok = False
+        response.status_code = 401
+        mock_request.return_value = response
+
+        bild = Bild(token='test_token')
+        with self.assertRaises(Exception) as context:
+            list(bild.stream_released_files_after_time(1700000000000))
+        self.assertEqual(str(context.exception), bild.auth_error)
+        self.assertEqual(mock_request.call_args.kwargs['params'], {'time': 1700000000000})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_mirror import BildMirror
+from bild_sync import BildSync
+
+
+class FakeAccount:
+    '''
+    Routes Session.request calls to a tiny in-memory Bild account.
+    '''
+    def __init__(self):
+        self.projects = [{"id": "p1", "name": "Rover", "defaultBranch": "main", "users": [{"id": "u2", "name": "Bo", "accessType": "Viewer"}]}]
+        self.users = [
+            {"id": "u1", "name": "Ada", "email": "ada@example.com", "role": "Admin", "projects": [{"id": "p1", "name": "Rover", "accessType": "Editor"}]},
+            {"id": "u2", "name": "Bo", "email": "bo@example.com", "role": "Member", "projects": []},
+        ]
+        self.files = [{"id": "f1", "name": "wheel.sldprt", "path": "/wheel.sldprt", "type": "file"}]
+        self.commits = [{"id": "c1", "branchID": "main"}]
+        self.other_commits = []
+        self.late_files = [{"id": "f7", "name": "arm.sldprt", "path": "/arm.sldprt", "type": "file"}]
+        self.late_commits = [{"id": f"c{index}", "branchID": "main"} for index in (33, 32, 31)]
+        self.commit_files = {"c1": [{"id": "f1"}]}
+        self.released = []
+        self.calls = []
+
+    def __call__(self, method, url, params=None, **kwargs):
+        path = url.replace('https://api.getbild.com', '')
+        self.calls.append(path)
+        if path == '/users':
+            data = self.users
+        elif path == '/projects':
+            data = self.projects
+        elif path == '/projects/p1/files':
+            data = self.files
+        elif path == '/projects/p2/files':
+            data = []
+        elif path == '/projects/p3/files':
+            data = self.late_files
+        elif path == '/projects/p1/commits':
+            data = self.commits
+        elif path == '/projects/p2/commits':
+            data = self.other_commits
+        elif path == '/projects/p3/commits':
+            data = self.late_commits
+        elif '/branches/main/commits/' in path:
+            data = {"id": path.split('/')[-1], "files": self.commit_files[path.split('/')[-1]]}
+        elif path == '/files/released':
+            data = self.released
+        elif path.endswith('/latestFileVersion'):
+            file_id = path.split('/')[-2]
+            data = {"id": f"{file_id}-v{len(self.commits)}", "name": f"{file_id}.sldprt", "partNumber": f"PN-{file_id}"}
+        elif path.endswith('/metadata'):
+            data = {"material": "aluminium"}
+        else:
+            raise AssertionError(f'Unexpected call {path}')
+        response = MagicMock()
+        response.json.return_value = {"data": data}
+        return response
+
+
+class TestBildSync(unittest.TestCase):
+
+    def setUp(self):
+        self.account = FakeAccount()
+        patcher = patch('bild.requests.Session.request', side_effect=self.account)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mirror = BildMirror(':memory:')
+        self.sync = BildSync(Bild(token='test_token'), self.mirror, workers=2)
+
+    def test_first_run_is_full_then_incremental(self):
+        report = self.sync.run()
+        self.assertTrue(report['full'])
+        self.assertEqual(report['files'], 1)
+        self.assertEqual(self.mirror.count('files'), 1)
+        self.assertEqual(self.mirror.get_state('commit:p1'), 'c1')
+
+        # Nothing changed: no file is fetched again
+        self.account.calls.clear()
+        report = self.sync.run()
+        self.assertFalse(report['full'])
+        self.assertEqual(report['files'], 0)
+        self.assertFalse([call for call in self.account.calls if 'latestFileVersion' in call])
+
+        # A new commit touching f2 and a release of f3 are picked up
+        self.account.commits.insert(0, {"id": "c2", "branchID": "main"})
+        self.account.commit_files["c2"] = [{"id": "f2"}]
+        self.account.released = [{"projectID": "p1", "branchID": "main", "fileID": "f3"}]
+        report = self.sync.run()
+        self.assertEqual(report['commits'], 1)
+        self.assertEqual(report['released'], 1)
+        self.assertEqual(report['files'], 2)
+        self.assertEqual(self.mirror.count('files'), 3)
+        self.assertEqual(self.mirror.count('metadata'), 3)
+        self.assertEqual(self.mirror.get_state('commit:p1'), 'c2')
+
+    def test_queries(self):
+        self.sync.run()
+
+        files = self.mirror.files_by_part_number('PN-f1')
+        self.assertEqual([(f['project_id'], f['branch_id'], f['id']) for f in files], [('p1', 'main', 'f1')])
+        self.assertEqual(self.mirror.file('f1')[0]['latest_version_id'], 'f1-v1')
+        self.assertEqual(self.mirror.metadata_of_file('f1'), {"data": {"material": "aluminium"}})
+        self.assertEqual(len(self.mirror.versions_of_file('f1')), 1)
+
+        editors = self.mirror.project_users('p1', access_type='Editor')
+        self.assertEqual([user['email'] for user in editors], ['ada@example.com'])
+        self.assertEqual(len(self.mirror.project_users('p1')), 2)
+        self.assertEqual(self.mirror.user_projects('BO@example.com'), [{'id': 'p1', 'name': 'Rover', 'access_type': 'Viewer'}])
+
+        plan = self.mirror.query('EXPLAIN QUERY PLAN SELECT * FROM files WHERE part_number = ?', ('x',))
+        self.assertIn('files_part_number', plan[0]['detail'])
+
+    def test_failed_files_are_retried_next_run(self):
+        self.sync.run()
+        self.account.released = [{"projectID": "p1", "branchID": "main", "fileID": "f9"}]
+        with patch.object(self.sync, 'fetch', side_effect=Exception('boom')):
+            report = self.sync.run()
+        self.assertEqual(report['failed'], [('p1', 'main', 'f9')])
+
+        self.account.released = []
+        report = self.sync.run()
+        self.assertEqual(report['files'], 1)
+        self.assertEqual(self.mirror.get_state('pending'), [])
+
+    def test_failed_run_keeps_commit_marks(self):
+        self.account.projects.append({"id": "p2", "name": "Lander", "defaultBranch": "main", "users": []})
+        self.sync.run()
+        self.account.commits.insert(0, {"id": "c2", "branchID": "main"})
+        self.account.commit_files["c2"] = [{"id": "f2"}]
+        self.account.other_commits.insert(0, {"id": "c9", "branchID": "main"})
+        self.account.commit_files["c9"] = [{"id": "f9"}]
+
+        # p1's commits are walked, then p2's fail: p1's mark must not move past a commit whose files weren't synced
+        details = self.sync.client.get_commit_details
+        def flaky(project_id, branch_id, commit_id):
+            if project_id == 'p2':
+                raise Exception('boom')
+            return details(project_id, branch_id, commit_id)
+        with patch.object(self.sync.client, 'get_commit_details', side_effect=flaky):
+            with self.assertRaises(Exception):
+                self.sync.run()
+        self.assertEqual(self.mirror.get_state('commit:p1'), 'c1')
+
+        report = self.sync.run()
+        self.assertEqual(report['commits'], 2)
+        self.assertEqual(self.mirror.get_state('commit:p1'), 'c2')
+        self.assertEqual(self.mirror.get_state('commit:p2'), 'c9')
+        self.assertEqual(len(self.mirror.file('f2')), 1)
+
+    def test_new_project_is_listed_not_walked(self):
+        self.sync.run()
+        self.account.projects.append({"id": "p3", "name": "Probe", "defaultBranch": "main", "users": []})
+        self.account.calls.clear()
+
+        report = self.sync.run()
+        self.assertFalse(report['full'])
+        self.assertEqual(report['commits'], 0)
+        self.assertFalse([call for call in self.account.calls if '/commits/' in call])
+        self.assertEqual(len(self.mirror.file('f7')), 1)
+        self.assertEqual(self.mirror.get_state('commit:p3'), 'c33')
+
+        # From then on the project is incremental like the others
+        self.account.late_commits.insert(0, {"id": "c34", "branchID": "main"})
+        self.account.commit_files["c34"] = [{"id": "f7"}]
+        report = self.sync.run()
+        self.assertEqual(report['commits'], 1)
+        self.assertEqual(self.mirror.get_state('commit:p3'), 'c34')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+from bild import Bild
+from bild_mock import MockDataset, MockServer
+
+
+class TestUserProvisioning(unittest.TestCase):
+
+    def test_groups_chunks_and_skips_existing(self):
+        dataset = MockDataset(projects=2, users=3)
+        admin, updated, unchanged = dataset.users[0], dataset.users[1], dataset.users[2]
+        users = [
+            {"email": f"new{index}@example.com", "role": 'Member', "projects": {'p0': 'Editor'}} for index in range(5)
+        ] + [
+            ('admin@example.com', 'Admin', [{"id": 'p1', "projectAccess": 'Viewer'}]),
+            (updated['email'].upper(), 'Member', [{"id": 'p9', "projectAccess": 'Viewer'}] + updated['projects']),
+            (unchanged['email'], 'Member', unchanged['projects']),
+            ('twice@example.com', 'Member', {'p0': 'Editor'}),
+            ('TWICE@example.com', 'Admin', {'p0': 'Editor'}),
+            ('new0@example.com', 'Member', {'p0': 'Editor'}),
+            {"email": admin['email'], "role": 'Member', "projects": {'p9': 'Viewer'}},
+        ]
+        with MockServer(dataset) as server:
+            bild = Bild(token='mock', baseurl=server.url)
+            report = bild.provision_users(users, chunk_size=2).run()
+
+            self.assertEqual((report['added'], report['updated'], report['skipped'], report['conflict'], report['failed']),
+                             (6, 1, 1, 1, 1))
+            # 5 Members on p0 in chunks of 2, the admin, and the grant the existing user is missing
+            self.assertEqual(report['requests'], 5)
+            self.assertEqual(server.stats['routes']['PUT /users/add'], 5)
+            self.assertEqual(report['users']['twice@example.com']['outcome'], 'failed')
+            self.assertEqual(report['users'][updated['email'].upper()]['outcome'], 'updated')
+            # The role change can't be sent, so the admin is neither demoted nor given the grant
+            self.assertEqual(report['users'][admin['email']]['outcome'], 'conflict')
+            self.assertIn('Admin', report['users'][admin['email']]['error'])
+            users_now = {user['email']: user for user in bild.get_all_users()['data']}
+            self.assertEqual(users_now[admin['email']]['role'], 'Admin')
+            self.assertNotIn('p9', [grant['id'] for grant in users_now[admin['email']]['projects']])
+
+            report = bild.provision_users(users).run()
+            self.assertEqual((report['skipped'], report['conflict'], report['failed'], report['requests']), (8, 1, 1, 0))
+
+            # An existing user given no role keeps theirs and is only sent the missing grant
+            requests, settled = bild.provision_users([{"email": admin['email'], "projects": {'p9': 'Viewer'}}]).plan()
+            self.assertEqual(settled, {})
+            self.assertEqual(requests, [({"emails": [admin['email']], "role": 'Admin', "projects": [{"id": 'p9', "projectAccess": 'Viewer'}]},
+                                         [(admin['email'], 'updated')])])
+
+    @patch('bild.requests.Session.request')
+    def test_payload_limit_and_failures(self, mock_request):
+        def fake_api(method, url, json=None, **kwargs):
+            response = MagicMock()
+            response.json.return_value = {"data": [], "message": "Success"}
+            if method == 'PUT' and 'bad@example.com' in json['emails']:
+                response.ok, response.status_code, response.text = False, 400, 'Invalid email'
+            return response
+        mock_request.side_effect = fake_api
+
+        users = [(f'user{index}@example.com', 'Member', {'p1': 'Viewer'}) for index in range(10)] + [('bad@example.com', 'Admin', {})]
+        provisioning = Bild(token='test_token').provision_users(users, chunk_size=100, max_bytes=150)
+        requests, settled = provisioning.plan()
+        self.assertEqual([len(payload['emails']) for payload, _ in requests], [3, 3, 3, 1, 1])
+        self.assertTrue(all(len(json.dumps(payload)) <= 150 for payload, _ in requests))
+
+        report = provisioning.run()
+        self.assertEqual(report['added'], 10)
+        self.assertEqual(report['users']['bad@example.com'], {'outcome': 'failed', 'error': 'Bild API error 400: Invalid email'})
+
+
+if __name__ == '__main__':
+    unittest.main()